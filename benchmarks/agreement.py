@@ -0,0 +1,114 @@
+"""
+Compare the rules engine (`engine="rules"`) with the model on the fixtures of
+the test suite, and optionally a synthetic corpus: how many outputs agree,
+how often each decision the heuristics replace agrees (possessive tag, scale
+lemma, currency lemma, year entity), the texts that differ and the latency
+per text of both engines.
+
+    python benchmarks/agreement.py
+    python benchmarks/agreement.py --model en_core_web_trf --synthetic 2000
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+from corpus import generate_corpus
+from fixtures import FIXTURES
+
+from mathspell import Normalizer
+from mathspell.helpers import constants as c
+from mathspell.helpers.cases import is_illion_scale, looks_like_year_context
+from mathspell.helpers.selective_ner import token_is_year_candidate
+from mathspell.main import model_version, preprocess_text
+
+def decisions(doc) -> Dict[str, Dict[int, bool]]:
+    """
+    The decisions `analyze_text` takes from annotations, by token position:
+    whether the word before "'s" is a possessor, whether a word after a
+    number is a scale or a currency name, and whether a number is a year.
+    """
+    result = {"possessive": {}, "scale": {}, "currency": {}, "year": {}}
+    for token in doc:
+        i = token.i
+        if token.text == "'s" and i > 0:
+            result["possessive"][i - 1] = doc[i - 1].tag_ in ("PRP", "NNP", "PRON")
+        elif token.is_alpha and i > 0 and doc[i - 1].like_num:
+            result["scale"][i] = is_illion_scale(token)
+        if token.is_alpha and i > 1 and is_illion_scale(doc[i - 1]) and doc[i - 2].like_num:
+            result["currency"][i] = token.lemma_.lower() in c.ALTERNATIVE_CURRENCIES
+        if token_is_year_candidate(token):
+            result["year"][i] = looks_like_year_context(token)
+    return result
+
+def compare(texts: List[str], model: str) -> dict:
+    engines = {"model": Normalizer(model), "rules": Normalizer(engine="rules")}
+    outputs = {name: [normalizer.analyze_text(text) for text in texts] for name, normalizer in engines.items()}
+    counts = {name: {"agree": 0, "total": 0} for name in ("possessive", "scale", "currency", "year")}
+    preprocessed = [preprocess_text(text) for text in texts]
+    docs = {name: list(normalizer.parse_texts(preprocessed)) for name, normalizer in engines.items()}
+    for model_doc, rules_doc in zip(docs["model"], docs["rules"]):
+        if [t.text for t in model_doc] != [t.text for t in rules_doc]:
+            continue
+        model_decisions, rules_decisions = decisions(model_doc), decisions(rules_doc)
+        for name, by_position in model_decisions.items():
+            for position, value in by_position.items():
+                counts[name]["total"] += 1
+                counts[name]["agree"] += rules_decisions[name].get(position) == value
+
+    latency = {}
+    for name, normalizer in engines.items():
+        samples = []
+        for text in texts:
+            started = time.perf_counter()
+            normalizer.analyze_text(text)
+            samples.append(time.perf_counter() - started)
+        latency[name] = {"mean_us": 1e6 * statistics.mean(samples), "p50_us": 1e6 * statistics.median(samples)}
+
+    agree = sum(a == b for a, b in zip(outputs["model"], outputs["rules"]))
+    return {
+        "model": model,
+        "model_version": model_version(model),
+        "texts": len(texts),
+        "output_agreement": agree / len(texts),
+        "decisions": {
+            name: {**count, "agreement": count["agree"] / count["total"] if count["total"] else None}
+            for name, count in counts.items()
+        },
+        "latency": latency,
+        "speedup": latency["model"]["mean_us"] / latency["rules"]["mean_us"],
+        "differences": [
+            {"text": text, "model": a, "rules": b}
+            for text, a, b in zip(texts, outputs["model"], outputs["rules"]) if a != b
+        ],
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the rules engine with the model.")
+    parser.add_argument("--model", default="en_core_web_sm")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="also compare this many synthetic texts of all categories (default: 0)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    texts = [text for fixtures in FIXTURES.values() for text in fixtures]
+    if args.synthetic:
+        texts.extend(generate_corpus(args.synthetic, seed=args.seed))
+    report = compare(texts, args.model)
+
+    print(f"{report['model']} ({report['model_version']}):", file=sys.stderr)
+    print(f"{report['texts']} texts, outputs agree on {100 * report['output_agreement']:.1f}%", file=sys.stderr)
+    for name, count in report["decisions"].items():
+        share = "-" if count["agreement"] is None else f"{100 * count['agreement']:.1f}%"
+        print(f"  {name:<11}{count['agree']:>6} of {count['total']:<6} {share}", file=sys.stderr)
+    print(
+        f"latency per text: model {report['latency']['model']['mean_us']:.0f} us, "
+        f"rules {report['latency']['rules']['mean_us']:.0f} us ({report['speedup']:.1f}x)",
+        file=sys.stderr,
+    )
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Compare `spell_numbers` on a numeric column with spelling the same column
+value by value through `analyze_text`, as done before for tabular data.
+
+    python benchmarks/arrays.py --rows 1000000 --distinct 5000
+    python benchmarks/arrays.py --kind currency --text-rows 2000
+
+The text path is timed on the first --text-rows values and extrapolated.
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from mathspell import analyze_text, spell_numbers, warmup
+from mathspell.arrays import KINDS
+
+def column(kind: str, rows: int, distinct: int, seed: int) -> np.ndarray:
+    """
+    A column of `rows` values drawn from `distinct` values typical of `kind`.
+    """
+    rng = np.random.default_rng(seed)
+    if kind == "year":
+        pool = rng.integers(1900, 2030, distinct)
+    elif kind == "ordinal":
+        pool = rng.integers(1, 500, distinct)
+    elif kind == "percent":
+        pool = np.round(rng.uniform(0, 100, distinct), 1)
+    elif kind == "currency":
+        pool = np.round(rng.uniform(0, 5000, distinct), 2)
+    else:
+        pool = rng.integers(0, 10 ** 6, distinct)
+    return pool[rng.integers(0, distinct, rows)]
+
+def as_text(kind: str, value) -> str:
+    """
+    The value in a sentence that `analyze_text` spells in the given way.
+    """
+    if kind == "year":
+        return f"It happened in {value}."
+    if kind == "ordinal":
+        suffix = "th" if 10 <= value % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(value % 10, "th")
+        return f"It was the {value}{suffix}."
+    if kind == "percent":
+        return f"It rose {value}%."
+    if kind == "currency":
+        return f"It cost ${value}."
+    return f"It was {value}."
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark spell_numbers against the text path.")
+    parser.add_argument("--kind", choices=KINDS, default="cardinal")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=5000, help="distinct values in the column (default: 5000)")
+    parser.add_argument("--text-rows", type=int, default=1000, help="values timed through analyze_text (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    values = column(args.kind, args.rows, args.distinct, args.seed)
+    warmup()
+
+    started = time.perf_counter()
+    spell_numbers(values, kind=args.kind)
+    array_s = time.perf_counter() - started
+
+    sample = values[:args.text_rows].tolist()
+    started = time.perf_counter()
+    for value in sample:
+        analyze_text(as_text(args.kind, value))
+    text_s = (time.perf_counter() - started) / len(sample) * args.rows
+
+    result = {
+        "kind": args.kind,
+        "rows": args.rows,
+        "distinct": int(len(np.unique(values))),
+        "spell_numbers_s": array_s,
+        "text_path_s": text_s,
+        "speedup": text_s / array_s,
+    }
+    print(
+        f"{args.kind}: spell_numbers {array_s:.3f} s, text path ~{text_s:.0f} s (extrapolated) "
+        f"for {args.rows} rows, {result['speedup']:.0f}x",
+        file=sys.stderr,
+    )
+    print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
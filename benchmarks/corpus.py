@@ -0,0 +1,96 @@
+"""
+Synthetic benchmark corpora: sentences of filler words in which a share of
+the words (the number density) is replaced by a number phrase of a chosen
+conversion category.
+"""
+import random
+from typing import Callable, Dict, List, Optional
+
+FILLER = (
+    "the report said that our team would meet again after lunch to review what "
+    "was left of the budget and which of the plans could still go ahead this "
+    "season while the others waited for news from the office"
+).split()
+
+def _currency(rng: random.Random) -> str:
+    symbol = rng.choice("$€£")
+    if rng.random() < 0.3:
+        return f"{symbol}{rng.randint(1, 999) / 10:g} {rng.choice(['million', 'billion'])}"
+    return f"{symbol}{rng.choice([rng.randint(1, 5000), round(rng.uniform(1, 500), 2)])}"
+
+def _quantity(rng: random.Random) -> str:
+    unit = rng.choice(["km", "kg", "m/s", "°C", "miles", "mL", "degrees", "cm"])
+    return f"{rng.randint(1, 500)} {unit}"
+
+def _fraction(rng: random.Random) -> str:
+    a, b = rng.randint(1, 20), rng.randint(2, 20)
+    return rng.choice([f"{a}/{b}", f"{a} + {b}", f"{a} * {b}", f"{a}^{b % 5}", f"({a} - {b}) / 2"])
+
+def _date_time(rng: random.Random) -> str:
+    if rng.random() < 0.5:
+        return f"{rng.randint(1, 12)}/{rng.randint(1, 28)}/{rng.randint(1950, 2030)}"
+    return f"{rng.randint(1, 12)}:{rng.randint(0, 59):02d} {rng.choice(['AM', 'PM'])}"
+
+def _year(rng: random.Random) -> str:
+    return f"in {rng.randint(1800, 2030)}"
+
+def _ordinal(rng: random.Random) -> str:
+    n = rng.randint(1, 120)
+    suffix = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"the {n}{suffix}"
+
+def _percentage(rng: random.Random) -> str:
+    return f"{rng.randint(1, 100)}%"
+
+def _plain(rng: random.Random) -> str:
+    return str(rng.choice([rng.randint(0, 100), rng.randint(100, 10 ** 6), round(rng.uniform(0, 100), 1)]))
+
+CATEGORIES: Dict[str, Callable[[random.Random], str]] = {
+    "currency": _currency,
+    "quantity": _quantity,
+    "fraction": _fraction,
+    "date_time": _date_time,
+    "year": _year,
+    "ordinal": _ordinal,
+    "percentage": _percentage,
+    "number": _plain,
+}
+
+def generate_sentence(rng: random.Random, density: float, mix: Dict[str, float], words: int) -> str:
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    parts = []
+    for _ in range(words):
+        if names and rng.random() < density:
+            parts.append(CATEGORIES[rng.choices(names, weights)[0]](rng))
+        else:
+            parts.append(rng.choice(FILLER))
+    sentence = " ".join(parts)
+    return sentence[0].upper() + sentence[1:] + "."
+
+def generate_corpus(
+    texts: int = 1000,
+    density: float = 0.1,
+    mix: Optional[Dict[str, float]] = None,
+    sentences: int = 3,
+    words: int = 15,
+    seed: int = 0,
+) -> List[str]:
+    """
+    Return `texts` documents of `sentences` sentences of about `words` words,
+    in which a `density` share of the words is a number phrase drawn from the
+    categories in `mix` (category name -> weight, all categories equally by
+    default). The corpus only depends on the arguments.
+    """
+    mix = dict.fromkeys(CATEGORIES, 1.0) if mix is None else mix
+    unknown = set(mix) - set(CATEGORIES)
+    if unknown:
+        raise ValueError(f"unknown categories: {', '.join(sorted(unknown))}")
+    rng = random.Random(seed)
+    return [
+        " ".join(
+            generate_sentence(rng, density, mix, max(1, words + rng.randint(-words // 3, words // 3)))
+            for _ in range(sentences)
+        )
+        for _ in range(texts)
+    ]
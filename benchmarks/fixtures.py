@@ -0,0 +1,63 @@
+"""
+Real-text fixtures by conversion category, taken from the test cases in
+src/mathspell/test_main.py and the examples in the README.
+"""
+
+FIXTURES = {
+    "currency": [
+        "$3.8 million dollars",
+        "$2 billion dollars",
+        "$1.2 million and $3.5 billion dollars",
+        "The revenue was 4.5 million.",
+        "I have $3.8.",
+        "$1.25 billion and $750 million.",
+        "I have $5 and €10.",
+        "She earned £3.5 million and $2 million.",
+    ],
+    "quantity": [
+        "I ran 5km today.",
+        "The temperature dropped to -20 degrees.",
+        "0 degrees Celsius is the freezing point.",
+        "The speed of light is approximately 3.00e8 m/s.",
+        "He weighs 70 kg and 70 kg.",
+        "It is 25°C today. The 3 boxes weigh 15 kg.",
+        "This contains 15 boxes.",
+        "The temperature is expected to be 25 degrees tomorrow.",
+        "The elevator can hold 5 people.",
+    ],
+    "fraction": [
+        "5 + 3",
+        "10 - 7",
+        "6 * 4",
+        "4 + 5 - 2",
+        "(3 + 2) * 4",
+        "1/2",
+        "2^3",
+        "5+-3*2/4",
+        "3^4 / (5-2)",
+        "-5 + (-3)",
+    ],
+    "date_time": [
+        "The meeting is on 12/25/2025.",
+        "Meet me on 12/25/2023 at 3:45 PM please.",
+        "My birthday is on 4th April, 1993.",
+        "I have $5  and €10.\n\nMeet me at 3:45 PM, not 5+3.",
+    ],
+    "year": [
+        "This is the 1st time I earned $5 million dollars in 2020.",
+        "Something happened in 2021.",
+        "The second prize was awarded in 2022 for the 10th time.",
+    ],
+    "ordinal": [
+        "We took the 7th seat.",
+        "This is my 3rd attempt to fix the bug.",
+        "This is the 1st floor, and the elevator can hold 5 people.",
+    ],
+    "plain": [
+        "Hello, world! This text has no numbers.",
+        "version2 update released.",
+        "Error code404 detected.",
+        "The number is 3.14.159",
+        "0",
+    ],
+}
@@ -0,0 +1,29 @@
+"""
+Compare the native English speller with num2words.
+
+    python benchmarks/number_words.py
+"""
+import random
+import timeit
+
+from num2words import num2words
+from mathspell.helpers.number_words import spell_number
+
+def main() -> None:
+    rng = random.Random(0)
+    workloads = {
+        "cardinal int": ([rng.randrange(100000) for _ in range(5000)], "cardinal"),
+        "cardinal big int": ([rng.randrange(10 ** 18) for _ in range(2000)], "cardinal"),
+        "cardinal float": ([round(rng.uniform(0, 10000), 2) for _ in range(5000)], "cardinal"),
+        "ordinal": ([rng.randrange(1, 5000) for _ in range(5000)], "ordinal"),
+        "year": ([rng.randrange(1000, 2101) for _ in range(5000)], "year"),
+    }
+    print(f"{'workload':<18}{'num2words us':>14}{'native us':>12}{'speedup':>10}")
+    for name, (numbers, to) in workloads.items():
+        reference = min(timeit.repeat(lambda: [num2words(n, to=to) for n in numbers], number=1, repeat=3))
+        native = min(timeit.repeat(lambda: [spell_number(n, to) for n in numbers], number=1, repeat=3))
+        per_call = 1e6 / len(numbers)
+        print(f"{name:<18}{reference * per_call:>14.2f}{native * per_call:>12.2f}{reference / native:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
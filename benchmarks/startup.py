@@ -0,0 +1,96 @@
+"""
+Compare process start-up with a bundle against loading the model, each
+measured over several fresh interpreters: importing mathspell, `warmup`, the
+first request after it, and the first request of a process that skips
+`warmup` (which loads everything lazily).
+
+    python benchmarks/startup.py --runs 5
+    python benchmarks/startup.py --bundle /path/to/bundle --output startup.json
+
+Without --bundle, one is built in a temporary directory.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from mathspell.bundle import build_bundle
+
+TEXT = "It cost $5 to ship 3 kg in 2021, the 2nd time this year."
+
+# Run in a fresh interpreter: argv is the model or bundle, and whether to warm up.
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import mathspell
+imported = time.perf_counter()
+mathspell.configure(sys.argv[1])
+if sys.argv[2] == "warmup":
+    mathspell.warmup()
+ready = time.perf_counter()
+mathspell.analyze_text(sys.argv[3])
+first = time.perf_counter()
+mathspell.analyze_text(sys.argv[3])
+second = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - started,
+    "warmup_s": ready - imported,
+    "first_request_s": first - ready,
+    "second_request_s": second - first,
+    "total_s": first - started,
+}))
+"""
+
+def run(model: str, mode: str, runs: int) -> dict:
+    """
+    Return the median of each timing over `runs` fresh processes.
+    """
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", CHILD, model, mode, TEXT], check=True, capture_output=True, text=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare start-up with and without a bundle.")
+    parser.add_argument("--model", default="en_core_web_sm")
+    parser.add_argument("--bundle", help="bundle to use (default: build one for --model)")
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per case (default: 5)")
+    parser.add_argument("-o", "--output", default="-", help="JSON output file, '-' for stdout (default)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        bundle = args.bundle
+        if bundle is None:
+            bundle = f"{directory}/bundle"
+            build_bundle(bundle, args.model)
+        results = {
+            f"{source}/{mode}": run(path, mode, args.runs)
+            for source, path in (("model", args.model), ("bundle", bundle))
+            for mode in ("warmup", "lazy")
+        }
+
+    print(f"{'case':<16}{'import':>9}{'warmup':>9}{'first':>9}{'second':>9}{'total':>9}  (seconds)", file=sys.stderr)
+    for case, result in results.items():
+        print(
+            f"{case:<16}" + "".join(f"{result[key]:>9.3f}" for key in
+                                   ("import_s", "warmup_s", "first_request_s", "second_request_s", "total_s")),
+            file=sys.stderr,
+        )
+    for mode in ("warmup", "lazy"):
+        speedup = results[f"model/{mode}"]["total_s"] / results[f"bundle/{mode}"]["total_s"]
+        print(f"bundle speed-up to first result ({mode}): {speedup:.2f}x", file=sys.stderr)
+
+    data = json.dumps({"model": args.model, "runs": args.runs, "results": results}, indent=2)
+    if args.output == "-":
+        print(data)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(data + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Benchmark `analyze_text` and `analyze_texts` on the real-text fixtures and on
+synthetic corpora of every conversion category, and report throughput,
+latency percentiles, cold-start time and peak memory as JSON.
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --texts 500 --density 0.3 --mix currency=2,year=1 --only synthetic
+    python benchmarks/suite.py --output new.json --compare results.json
+
+A human-readable summary goes to stderr. Peak memory is the process's
+resident high-water mark, so it only grows from one workload to the next;
+use --only to measure a workload on its own.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+from corpus import CATEGORIES, generate_corpus
+from fixtures import FIXTURES
+from mathspell import analyze_text, analyze_texts, configure, warmup
+from mathspell.helpers.stats import latency_summary
+from mathspell.main import package_version
+
+# Run in a fresh interpreter, so that nothing is imported or loaded yet.
+COLD_START = """
+import json, sys, time
+started = time.perf_counter()
+import mathspell
+imported = time.perf_counter()
+mathspell.configure(sys.argv[1])
+mathspell.analyze_text("I have $5 and it is 25°C on 12/25/2025.")
+done = time.perf_counter()
+try:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+except ImportError:
+    peak = None
+print(json.dumps({
+    "import_s": imported - started,
+    "first_call_s": done - imported,
+    "total_s": done - started,
+    "peak_rss_mb": peak,
+}))
+"""
+
+def peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+def cold_start(model: str) -> dict:
+    """
+    Time importing mathspell and a first call in a fresh interpreter.
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", COLD_START, model], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def parse_mix(spec: str) -> Optional[Dict[str, float]]:
+    if not spec:
+        return None
+    mix = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+def workloads(args: argparse.Namespace) -> Dict[str, List[str]]:
+    corpus = dict(texts=args.texts, sentences=args.sentences, words=args.words, seed=args.seed)
+    result = {f"fixtures/{name}": texts for name, texts in FIXTURES.items()}
+    for name in CATEGORIES:
+        result[f"synthetic/{name}"] = generate_corpus(density=args.density, mix={name: 1.0}, **corpus)
+    result["synthetic/mixed"] = generate_corpus(density=args.density, mix=parse_mix(args.mix), **corpus)
+    result["synthetic/no_numbers"] = generate_corpus(density=0.0, **corpus)
+    return {name: texts for name, texts in result.items() if args.only in name}
+
+def measure(texts: List[str], repeat: int, batch_size: int) -> dict:
+    """
+    Run one warm-up pass (which also sets aside texts that fail), then
+    `repeat` passes of `analyze_text` for latencies and of `analyze_texts`
+    for batch throughput.
+    """
+    usable = []
+    for text in texts:
+        try:
+            analyze_text(text)
+        except Exception:
+            continue
+        usable.append(text)
+    chars = sum(len(text) for text in usable)
+
+    latencies = []
+    for _ in range(repeat):
+        for text in usable:
+            started = time.perf_counter()
+            analyze_text(text)
+            latencies.append(time.perf_counter() - started)
+    single = sum(latencies) / repeat
+
+    batch = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        list(analyze_texts(usable, batch_size))
+        batch = min(batch, time.perf_counter() - started)
+
+    return {
+        "texts": len(usable),
+        "chars": chars,
+        "errors": len(texts) - len(usable),
+        "single": {
+            "texts_per_s": len(usable) / single if single else 0.0,
+            "chars_per_s": chars / single if single else 0.0,
+            **latency_summary(latencies),
+        },
+        "batch": {
+            "texts_per_s": len(usable) / batch if batch else 0.0,
+            "chars_per_s": chars / batch if batch else 0.0,
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def compare(results: dict, baseline: dict) -> str:
+    """
+    Format current/baseline ratios of the main metrics per workload.
+    """
+    lines = [f"{'workload':<24}{'single/s':>10}{'p50':>8}{'p99':>8}{'batch/s':>10}"]
+    for name, current in results["workloads"].items():
+        previous = baseline.get("workloads", {}).get(name)
+        if not previous:
+            continue
+        ratios = [
+            current["single"]["texts_per_s"] / max(previous["single"]["texts_per_s"], 1e-9),
+            current["single"]["p50_ms"] / max(previous["single"]["p50_ms"], 1e-9),
+            current["single"]["p99_ms"] / max(previous["single"]["p99_ms"], 1e-9),
+            current["batch"]["texts_per_s"] / max(previous["batch"]["texts_per_s"], 1e-9),
+        ]
+        lines.append(f"{name:<24}" + "".join(f"{ratio:>{w}.2f}x" for ratio, w in zip(ratios, (9, 7, 7, 9))))
+    if results.get("cold_start") and baseline.get("cold_start"):
+        ratio = results["cold_start"]["total_s"] / max(baseline["cold_start"]["total_s"], 1e-9)
+        lines.append(f"{'cold start':<24}{ratio:>9.2f}x")
+    return "\n".join(lines)
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark mathspell by conversion category.")
+    parser.add_argument("--texts", type=int, default=200, help="texts per synthetic corpus (default: 200)")
+    parser.add_argument("--density", type=float, default=0.1, help="share of words that are numbers (default: 0.1)")
+    parser.add_argument("--mix", default="", help="category weights of the mixed corpus, e.g. currency=2,year=1")
+    parser.add_argument("--sentences", type=int, default=3, help="sentences per synthetic text (default: 3)")
+    parser.add_argument("--words", type=int, default=15, help="words per synthetic sentence (default: 15)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="measured passes per workload (default: 3)")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--model", default="en_core_web_sm")
+    parser.add_argument("--only", default="", help="run the workloads whose name contains this")
+    parser.add_argument("--no-cold-start", action="store_true", help="skip the cold-start measurement")
+    parser.add_argument("-o", "--output", default="-", help="JSON output file, '-' for stdout (default)")
+    parser.add_argument("--compare", help="earlier JSON output to compare with")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    results = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "mathspell": package_version("mathspell"),
+            "spacy": package_version("spacy"),
+            "model": args.model,
+            "args": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        },
+        "cold_start": None if args.no_cold_start else cold_start(args.model),
+        "workloads": {},
+    }
+    configure(args.model)
+    warmup()
+    for name, texts in workloads(args).items():
+        result = measure(texts, args.repeat, args.batch_size)
+        results["workloads"][name] = result
+        print(
+            f"{name:<24}{result['single']['texts_per_s']:>9.1f} texts/s {result['single']['chars_per_s']:>10.0f} chars/s"
+            f"  p50 {result['single']['p50_ms']:.2f} ms  p99 {result['single']['p99_ms']:.2f} ms"
+            f"  batch {result['batch']['texts_per_s']:.1f} texts/s",
+            file=sys.stderr,
+        )
+    if results["cold_start"]:
+        print(f"cold start {results['cold_start']['total_s']:.2f} s", file=sys.stderr)
+
+    data = json.dumps(results, indent=2)
+    if args.output == "-":
+        print(data)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(data + "\n")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print(compare(results, json.load(f)), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
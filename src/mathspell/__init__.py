@@ -1,2 +1,19 @@
-from .main import analyze_text
+from .main import (
+    Normalizer,
+    analyze_edits,
+    analyze_stream,
+    analyze_text,
+    analyze_texts,
+    configure,
+    configure_pipeline_pool,
+    get_pipeline_pool,
+    load_pipeline,
+    warmup,
+)
+from .arrays import spell_numbers
+from .helpers.cache import ResultCache
+from .helpers.pool import PipelinePool
+from .incremental import IncrementalDocument
+from .instrumentation import Instrumentation, instrument
+from .parallel import ParallelStats, analyze_parallel
 from .helpers import *
\ No newline at end of file
@@ -0,0 +1,4 @@
+import sys
+from mathspell.cli import main
+
+sys.exit(main())
@@ -0,0 +1,157 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Iterable, List, Optional
+from mathspell.helpers.stats import latency_summary
+from mathspell.main import analyze_text, analyze_texts
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Return the single background thread that runs the pipeline for the async
+    API, so that the event loop never blocks on it.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mathspell")
+    return _executor
+
+async def analyze_text_async(text: str, executor: Optional[Executor] = None) -> str:
+    """
+    Awaitable `analyze_text`, run on `executor` (the shared background thread
+    by default).
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or get_executor(), analyze_text, text)
+
+async def analyze_texts_async(texts: Iterable[str], executor: Optional[Executor] = None) -> List[str]:
+    """
+    Awaitable `analyze_texts`, returning the transformations as a list.
+    """
+    loop = asyncio.get_running_loop()
+    texts = list(texts)
+    return await loop.run_in_executor(executor or get_executor(), lambda: list(analyze_texts(texts)))
+
+class MicroBatcher:
+    """
+    Coalesce concurrent `analyze` calls into `nlp.pipe` batches. A batch is
+    sent when it holds `max_batch_size` texts or `max_wait` seconds after its
+    first text arrived, whichever comes first; texts arriving while a batch
+    runs form the next one. Texts of a batch are grouped by language, each
+    group going through the pipeline of its language. Per-request latencies
+    (queueing included) are kept for the last `history` requests.
+    """
+    def __init__(
+        self,
+        max_batch_size: int = 64,
+        max_wait: float = 0.005,
+        executor: Optional[Executor] = None,
+        history: int = 10000,
+    ):
+        if max_batch_size < 1 or max_wait < 0:
+            raise ValueError("max_batch_size must be positive and max_wait not negative")
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.executor = executor
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+        self._batched = 0
+        self._latencies = deque(maxlen=history)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def analyze(self, text: str, language: Optional[str] = None) -> str:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        started = time.perf_counter()
+        future = loop.create_future()
+        await self._queue.put((text, language, future))
+        try:
+            return await future
+        finally:
+            self.requests += 1
+            self._latencies.append(time.perf_counter() - started)
+
+    async def _next_batch(self) -> list:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            groups = {}
+            for text, language, future in batch:
+                groups.setdefault(language, []).append((text, future))
+            for language, group in groups.items():
+                texts = [text for text, _ in group]
+                try:
+                    results = await loop.run_in_executor(
+                        self.executor or get_executor(),
+                        lambda: list(analyze_texts(texts, len(texts), language=language)),
+                    )
+                except asyncio.CancelledError:
+                    for _, _, future in batch:
+                        future.cancel()
+                    raise
+                except Exception as e:
+                    self.errors += len(group)
+                    for _, future in group:
+                        if not future.done():
+                            future.set_exception(e)
+                else:
+                    for (_, future), result in zip(group, results):
+                        if not future.done():
+                            future.set_result(result)
+            self.batches += 1
+            self._batched += len(batch)
+
+    async def close(self) -> None:
+        """
+        Stop the batching task; pending requests are cancelled.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        while self._queue is not None and not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            future.cancel()
+
+    def metrics(self) -> dict:
+        """
+        Return request and batch counts, the mean batch size and per-request
+        latency percentiles in milliseconds.
+        """
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "errors": self.errors,
+            "mean_batch_size": self._batched / self.batches if self.batches else 0.0,
+            **latency_summary(list(self._latencies)),
+        }
@@ -0,0 +1,74 @@
+from decimal import Decimal
+from typing import Callable, Optional
+from mathspell.helpers import constants as c
+from mathspell.helpers.cases import convert_number_to_words, handle_percentage, interpret_currency
+from mathspell.helpers.languages import get_language_table, use_language
+
+KINDS = ("cardinal", "year", "ordinal", "currency", "percent")
+
+# Floats above this may not hold the integer that was meant.
+_EXACT_FLOAT_LIMIT = 2 ** 53
+
+def spell_ordinal(number) -> Optional[str]:
+    """
+    Spell a non-negative integer as an ordinal ('third'), or return None for
+    other values: negative, fractional, or floats too large to be exact.
+    """
+    if isinstance(number, float):
+        if not (number.is_integer() and number <= _EXACT_FLOAT_LIMIT):
+            return None
+        number = int(number)
+    if number < 0:
+        return None
+    return convert_number_to_words(number, to_ordinal=True)
+
+def number_speller(kind: str = "cardinal", currency: str = "$") -> Callable[[float], Optional[str]]:
+    """
+    Return the function that spells one number the way `analyze_text` spells
+    it in the given context: a plain number, a year, an ordinal ('3rd'), an
+    amount after the currency symbol `currency`, or a percentage. Values
+    without an ordinal spell to None.
+    """
+    if kind == "cardinal":
+        # Python ints and Decimals pass through, so they are spelled exactly.
+        return lambda number: convert_number_to_words(number if type(number) in (int, Decimal) else float(number))
+    if kind == "year":
+        return lambda number: convert_number_to_words(float(number), to_year=True)
+    if kind == "ordinal":
+        return spell_ordinal
+    if kind == "percent":
+        return lambda number: handle_percentage(float(number))
+    if kind == "currency":
+        if currency not in c.CURRENCY_MAP:
+            raise ValueError(f"unknown currency symbol {currency!r}")
+        currency_name = c.CURRENCY_MAP[currency]
+        minor_currency_name = c.MINOR_CURRENCY_MAP.get(currency_name, "cent")
+        return lambda number: interpret_currency(float(number), currency_name, minor_currency_name)
+    raise ValueError(f"unknown kind {kind!r}, expected one of: {', '.join(KINDS)}")
+
+def spell_numbers(values, kind: str = "cardinal", currency: str = "$", language: str = "en"):
+    """
+    Spell out every number of an array-like (a NumPy array, a pandas column,
+    a list) and return an object array of the same shape holding the words,
+    or None for NaN and infinite values (and, for ordinals, values that are
+    not non-negative integers). `kind` and `currency` are as for
+    `number_speller`; `language` is that of the words (see
+    `mathspell.helpers.languages`).
+
+    Each distinct value is spelled once and the words are scattered back,
+    so columns with many repeated values cost little more than their
+    distinct values.
+    """
+    import numpy as np
+
+    speller = number_speller(kind, currency)
+    get_language_table(language)
+    array = np.asarray(values)
+    if array.dtype.kind not in "iuf":
+        array = array.astype(float)
+    distinct, inverse = np.unique(array.ravel(), return_inverse=True)
+    words = np.empty(len(distinct), dtype=object)
+    with use_language(language):
+        for position, (value, finite) in enumerate(zip(distinct.tolist(), np.isfinite(distinct).tolist())):
+            words[position] = speller(value) if finite else None
+    return words[inverse.ravel()].reshape(array.shape)
@@ -0,0 +1,106 @@
+import argparse
+import json
+import os
+import shutil
+from typing import Iterable, Optional, Sequence
+
+BUNDLE_FORMAT = 1
+BUNDLE_META = "mathspell-bundle.json"
+
+def is_bundle(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, BUNDLE_META))
+
+def read_bundle_meta(path: str) -> dict:
+    with open(os.path.join(path, BUNDLE_META), encoding="utf-8") as f:
+        return json.load(f)
+
+def _versions() -> dict:
+    from mathspell.main import package_version
+
+    return {name: package_version(name) for name in ("mathspell", "spacy", "num2words", "pint", "unit_parse")}
+
+def build_bundle(path: str, model: str = "en_core_web_sm") -> dict:
+    """
+    Write everything `analyze_text` builds at start-up into the directory
+    `path`: the spaCy pipeline with the custom tokenizer and the unit index
+    and number-word tables. An existing bundle at `path` is replaced. Return
+    the bundle's metadata.
+    """
+    from mathspell.helpers.number_words import NUMBER_WORDS_TABLES
+    from mathspell.helpers.units import get_unit_index
+    from mathspell.main import load_pipeline
+
+    if os.path.exists(path):
+        if not is_bundle(path) and os.listdir(path):
+            raise FileExistsError(f"{path} exists and is not a mathspell bundle")
+        shutil.rmtree(path)
+    os.makedirs(path)
+
+    nlp = load_pipeline(model)
+    nlp.to_disk(os.path.join(path, "pipeline"))
+    index = get_unit_index()
+    tables = {
+        "units": sorted(index.units),
+        "prefixes": sorted(index.prefixes),
+        "number_words": {to: table.words() for to, table in NUMBER_WORDS_TABLES.items()},
+    }
+    with open(os.path.join(path, "tables.json"), "w", encoding="utf-8") as f:
+        json.dump(tables, f, ensure_ascii=False, separators=(",", ":"))
+
+    meta = {"format": BUNDLE_FORMAT, "model": model, "model_version": nlp.meta.get("version", "unknown"), **_versions()}
+    with open(os.path.join(path, BUNDLE_META), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+def install_tables(path: str) -> bool:
+    """
+    Use the bundle's unit index and number-word tables if it was built with
+    the installed versions of mathspell, spaCy, num2words, pint and
+    unit_parse; otherwise they are built as usual. Return whether they were
+    used.
+    """
+    from mathspell.helpers.number_words import NUMBER_WORDS_TABLES
+    from mathspell.helpers.units import UnitIndex, set_unit_index
+
+    meta = read_bundle_meta(path)
+    versions = _versions()
+    if any(meta.get(name) != version for name, version in versions.items()):
+        return False
+    with open(os.path.join(path, "tables.json"), encoding="utf-8") as f:
+        tables = json.load(f)
+    set_unit_index(UnitIndex.from_names(tables["units"], tables["prefixes"]))
+    for to, words in tables["number_words"].items():
+        if to in NUMBER_WORDS_TABLES:
+            NUMBER_WORDS_TABLES[to].load(words)
+    return True
+
+def load_bundle(path: str, disable: Iterable[str] = (), selective_ner: bool = False):
+    """
+    Load the pipeline of a bundle, custom tokenizer included, and install its
+    tables. `disable` and `selective_ner` work as for `load_pipeline`.
+    """
+    import spacy
+
+    if read_bundle_meta(path).get("format") != BUNDLE_FORMAT:
+        raise ValueError(f"{path} was built by an incompatible mathspell version; rebuild it")
+    install_tables(path)
+    nlp = spacy.load(os.path.join(path, "pipeline"), disable=list(disable))
+    if selective_ner:
+        from mathspell.helpers.selective_ner import enable_selective_ner
+        enable_selective_ner(nlp)
+    return nlp
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="mathspell-bundle",
+        description="Build a bundle of the pipeline and tables that mathspell loads at start-up.",
+    )
+    parser.add_argument("path", help="directory to write the bundle to")
+    parser.add_argument("--model", default="en_core_web_sm", help="spaCy model name or path")
+    args = parser.parse_args(argv)
+    meta = build_bundle(args.path, args.model)
+    print(f"mathspell: wrote bundle of {meta['model']} {meta['model_version']} to {args.path}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
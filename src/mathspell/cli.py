@@ -0,0 +1,185 @@
+import argparse
+import functools
+import json
+import mmap
+import os
+import sys
+import time
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+from mathspell.helpers.cache import ResultCache
+from mathspell.helpers.languages import LANGUAGES
+from mathspell.helpers.stats import percentile
+from mathspell.main import ENGINES, analyze_texts, configure, warmup
+from mathspell.parallel import imap_ordered
+
+DEFAULT_SHARD_SIZE = 8 * 1024 * 1024
+
+# A task is either ("range", path, start, end), a newline-aligned byte range of
+# a file that the worker maps itself, or ("bytes", data) for piped input.
+Task = tuple
+# Converted bytes, records, input bytes and seconds spent on one task.
+Result = Tuple[bytes, int, int, float]
+
+def file_shards(path: str, shard_size: int = DEFAULT_SHARD_SIZE) -> Iterator[Task]:
+    """
+    Split a file into byte ranges of at least `shard_size` bytes that end on a
+    newline, without reading the file into memory.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            end = mm.find(b"\n", min(start + shard_size, size) - 1)
+            end = size if end < 0 else end + 1
+            yield ("range", path, start, end)
+            start = end
+
+def stream_shards(stream: BinaryIO, shard_size: int = DEFAULT_SHARD_SIZE) -> Iterator[Task]:
+    """
+    Read a binary stream in blocks of about `shard_size` bytes that end on a newline.
+    """
+    while True:
+        block = stream.read(shard_size)
+        if not block:
+            return
+        if not block.endswith(b"\n"):
+            block += stream.readline()
+        yield ("bytes", block)
+
+def convert_lines(lines: List[str], fmt: str = "text", field: str = "text", batch_size: int = 256) -> List[str]:
+    """
+    Convert one text per line, or the `field` of each JSONL record. Blank lines
+    are kept, and records without a string `field` are passed through unchanged.
+    """
+    if fmt == "text":
+        return list(analyze_texts(lines, batch_size))
+
+    records = [json.loads(line) if line.strip() else None for line in lines]
+    positions = [
+        i for i, record in enumerate(records)
+        if isinstance(record, dict) and isinstance(record.get(field), str)
+    ]
+    converted = analyze_texts([records[i][field] for i in positions], batch_size)
+    output = list(lines)
+    for i, text in zip(positions, converted):
+        records[i][field] = text
+        output[i] = json.dumps(records[i], ensure_ascii=False)
+    return output
+
+def process_task(task: Task, fmt: str = "text", field: str = "text", batch_size: int = 256) -> Result:
+    """
+    Convert the lines of one task, returning the encoded output and its counts.
+    """
+    started = time.perf_counter()
+    if task[0] == "range":
+        _, path, start, end = task
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = mm[start:end]
+    else:
+        data = task[1]
+    lines = data.decode("utf-8").split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    output = convert_lines(lines, fmt, field, batch_size)
+    body = "".join(line + "\n" for line in output).encode("utf-8")
+    return body, len(lines), len(data), time.perf_counter() - started
+
+def run_tasks(tasks: Iterable[Task], process: Callable[[Task], Result], workers: int) -> Iterator[Result]:
+    """
+    Run tasks in order, in this process or in a pool of `workers` processes
+    that each load the pipeline once.
+    """
+    if workers > 1:
+        return imap_ordered(process, tasks, workers)
+    warmup()
+    return map(process, tasks)
+
+def summary(records: int, size: int, elapsed: float, latencies: List[float]) -> str:
+    """
+    Format a throughput and latency report for the whole run.
+    """
+    elapsed = max(elapsed, 1e-9)
+    return (
+        f"mathspell: {records} records, {size / 1e6:.2f} MB in {elapsed:.2f} s "
+        f"({records / elapsed:.1f} records/s, {size / 1e6 / elapsed:.2f} MB/s); "
+        f"{1000 * sum(latencies) / max(records, 1):.3f} ms per record, "
+        f"shard latency p50 {1000 * percentile(latencies, 0.5):.1f} ms, "
+        f"p99 {1000 * percentile(latencies, 0.99):.1f} ms over {len(latencies)} shards"
+    )
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="mathspell",
+        description="Convert numbers, quantities, dates and symbols in text to their spoken form.",
+    )
+    parser.add_argument("inputs", nargs="*", default=["-"], help="input files, '-' for stdin (default)")
+    parser.add_argument("-o", "--output", default="-", help="output file, '-' for stdout (default)")
+    parser.add_argument("-f", "--format", choices=["text", "jsonl"], default="text",
+                        help="one text per line, or one JSON record per line (default: text)")
+    parser.add_argument("--field", default="text", help="JSONL field holding the text (default: text)")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="worker processes, 0 for one per core (default: 1)")
+    parser.add_argument("--batch-size", type=int, default=256, help="texts per nlp.pipe batch (default: 256)")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE,
+                        help=f"bytes of input per task (default: {DEFAULT_SHARD_SIZE})")
+    parser.add_argument("--model", help="spaCy model name or path (default: the language's model)")
+    parser.add_argument("--disable", default="", help="comma-separated pipeline components to disable")
+    parser.add_argument("--selective-ner", action="store_true", help="run NER only around possible years")
+    parser.add_argument("--fast-path", action="store_true", help="run the model only over sentences with numbers")
+    parser.add_argument("--language", choices=list(LANGUAGES), default="en",
+                        help="language of the text (default: en)")
+    parser.add_argument("--engine", choices=ENGINES, default="model",
+                        help="spaCy model, or heuristics without a model for lower latency (default: model)")
+    parser.add_argument("--cache", help="SQLite file that keeps results across runs (default: none)")
+    parser.add_argument("--cache-size", type=int, default=256, help="cache size limit in MB (default: 256)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not print the summary")
+    args = parser.parse_args(argv)
+    if args.shard_size < 1 or args.batch_size < 1 or args.workers < 0:
+        parser.error("--shard-size and --batch-size must be positive, --workers not negative")
+    return args
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    options = {
+        "model": args.model,
+        "disable": [name for name in args.disable.split(",") if name],
+        "selective_ner": args.selective_ner,
+        "fast_path": args.fast_path,
+        "cache": ResultCache(args.cache, args.cache_size * 1024 * 1024) if args.cache else None,
+        "engine": args.engine,
+        "language": args.language,
+    }
+    configure(**options)
+    workers = args.workers or os.cpu_count() or 1
+    process = functools.partial(process_task, fmt=args.format, field=args.field, batch_size=args.batch_size)
+
+    def tasks() -> Iterator[Task]:
+        for path in args.inputs:
+            if path == "-":
+                yield from stream_shards(sys.stdin.buffer, args.shard_size)
+            else:
+                yield from file_shards(path, args.shard_size)
+
+    started = time.perf_counter()
+    records = size = 0
+    latencies = []
+    target = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        for body, count, nbytes, seconds in run_tasks(tasks(), process, workers):
+            target.write(body)
+            target.flush()
+            records += count
+            size += nbytes
+            latencies.append(seconds)
+    except (OSError, ValueError) as e:
+        print(f"mathspell: error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if target is not sys.stdout.buffer:
+            target.close()
+
+    if not args.quiet:
+        print(summary(records, size, time.perf_counter() - started, latencies), file=sys.stderr)
+    return 0
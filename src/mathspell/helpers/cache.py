@@ -0,0 +1,288 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Mapping, Optional
+
+_MISSING = object()
+
+class LRUCache:
+    """
+    Bounded, thread-safe least-recently-used cache with hit/miss/eviction counters.
+    A `maxsize` of 0 disables caching.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[Hashable], Any]) -> Any:
+        """
+        Return the cached value for `key`, calling `compute(key)` on a miss.
+        Exceptions raised by `compute` are not cached.
+        """
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is not _MISSING:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = compute(key)
+
+        with self._lock:
+            if self.maxsize > 0:
+                self._data[key] = value
+                self._data.move_to_end(key)
+                self._evict()
+        return value
+
+    def resize(self, maxsize: int) -> None:
+        """
+        Change the capacity, evicting the oldest entries if needed.
+        """
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self) -> None:
+        """
+        Drop all entries and reset the counters.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Return the counters, current size and hit rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _evict(self) -> None:
+        while len(self._data) > max(self.maxsize, 0):
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+
+class ResultCache:
+    """
+    Persistent cache of transformations in a local SQLite file, shared by runs
+    and by the processes of a run.
+
+    Entries are keyed by a hash of the text and a `namespace` naming the
+    library and model versions and options that produced them, so upgrading
+    either simply misses. When the stored results grow past `max_bytes`, the
+    least recently used ones are evicted. Writers take turns through SQLite's
+    locking (WAL mode, waiting up to `timeout` seconds); every process opens
+    its own connection, so a cache can be handed to forked or spawned workers.
+    Database errors are counted and treated as misses rather than raised.
+    """
+    # Texts per "IN (...)" lookup, under SQLite's parameter limit.
+    _LOOKUP_SIZE = 500
+    # Hits refresh an entry's last use at most this often (in seconds), so
+    # that reading a warm cache rarely writes.
+    _TOUCH_INTERVAL = 60.0
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, timeout: float = 30.0):
+        self.path = os.fspath(path)
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid = None
+
+    def __getstate__(self) -> dict:
+        return {"path": self.path, "max_bytes": self.max_bytes, "timeout": self.timeout}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ResultCache) and self.__getstate__() == other.__getstate__()
+
+    def __hash__(self) -> int:
+        return hash(self.path)
+
+    @staticmethod
+    def key(namespace: str, text: str) -> bytes:
+        return hashlib.blake2b(f"{namespace}\0{text}".encode("utf-8"), digest_size=16).digest()
+
+    def get_many(self, namespace: str, texts: Iterable[str]) -> Dict[str, str]:
+        """
+        Return the cached transformations of those `texts` that have one.
+        """
+        keys = {self.key(namespace, text): text for text in texts}
+        found = {}
+        now = time.time()
+        with self._lock:
+            try:
+                connection = self._connect()
+                key_list = list(keys)
+                stale = []
+                for start in range(0, len(key_list), self._LOOKUP_SIZE):
+                    chunk = key_list[start:start + self._LOOKUP_SIZE]
+                    rows = connection.execute(
+                        f"SELECT key, value, used FROM results WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                    )
+                    for key, value, used in rows:
+                        found[keys[key]] = value
+                        if used < now - self._TOUCH_INTERVAL:
+                            stale.append((now, key))
+                if stale:
+                    connection.execute("BEGIN IMMEDIATE")
+                    connection.executemany("UPDATE results SET used = ? WHERE key = ?", stale)
+                    connection.execute("COMMIT")
+            except sqlite3.Error:
+                self._rollback()
+                self.errors += 1
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, namespace: str, results: Mapping[str, str]) -> None:
+        """
+        Store transformations by text, evicting old entries if the cache is full.
+        """
+        now = time.time()
+        rows = []
+        for text, value in results.items():
+            key = self.key(namespace, text)
+            rows.append((key, value, len(key) + len(value.encode("utf-8")), now))
+        with self._lock:
+            try:
+                connection = self._connect()
+                connection.execute("BEGIN IMMEDIATE")
+                added = 0
+                for row in rows:
+                    cursor = connection.execute(
+                        "INSERT INTO results (key, value, size, used) VALUES (?, ?, ?, ?) ON CONFLICT (key) DO NOTHING",
+                        row,
+                    )
+                    if cursor.rowcount > 0:
+                        added += row[2]
+                        self.writes += 1
+                total = added + connection.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0]
+                if total > self.max_bytes:
+                    total -= self._evict(connection, total - int(0.9 * self.max_bytes))
+                connection.execute("UPDATE meta SET value = ? WHERE name = 'bytes'", (total,))
+                connection.execute("COMMIT")
+            except sqlite3.Error:
+                self._rollback()
+                self.errors += 1
+
+    def clear(self) -> None:
+        """
+        Drop all entries and reset the counters.
+        """
+        with self._lock:
+            self.hits = self.misses = self.writes = self.evictions = self.errors = 0
+            try:
+                connection = self._connect()
+                connection.execute("BEGIN IMMEDIATE")
+                connection.execute("DELETE FROM results")
+                connection.execute("UPDATE meta SET value = 0 WHERE name = 'bytes'")
+                connection.execute("COMMIT")
+            except sqlite3.Error:
+                self._rollback()
+                self.errors += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Return this process's counters and hit rate, and the number and size
+        in bytes of the entries stored by all processes (zero if the database
+        cannot be read).
+        """
+        with self._lock:
+            try:
+                connection = self._connect()
+                entries = connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+                size = connection.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0]
+            except sqlite3.Error:
+                self._rollback()
+                self.errors += 1
+                entries = size = 0
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "errors": self.errors,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection must not cross a fork, so each process opens its own.
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = None
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key BLOB PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL) WITHOUT ROWID"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+            connection.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            connection.execute("INSERT OR IGNORE INTO meta VALUES ('bytes', 0)")
+            connection.execute("COMMIT")
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def _evict(self, connection: sqlite3.Connection, excess: int) -> int:
+        # Least recently used first, until `excess` bytes are freed.
+        victims = []
+        freed = 0
+        cursor = connection.execute("SELECT key, size FROM results ORDER BY used")
+        for key, size in cursor:
+            if freed >= excess:
+                break
+            victims.append((key,))
+            freed += size
+        cursor.close()
+        connection.executemany("DELETE FROM results WHERE key = ?", victims)
+        self.evictions += len(victims)
+        return freed
+
+    def _rollback(self) -> None:
+        if self._connection is not None and self._connection.in_transaction:
+            try:
+                self._connection.execute("ROLLBACK")
+            except sqlite3.Error:
+                pass
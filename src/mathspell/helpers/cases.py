@@ -1,10 +1,70 @@
 import re
-import spacy
-import datetime
-from typing import Optional
-from num2words import num2words
+from typing import TYPE_CHECKING, List, Optional
 from mathspell.helpers import constants as c 
-from unit_parse import parser as quantity_parser
+from mathspell.helpers.cache import LRUCache
+from mathspell.helpers.edits import Edit, apply_edits, minimal_edit
+from mathspell.helpers.languages import LANGUAGES, currency_words, foreign_language, spell_in
+from mathspell.helpers.number_words import number_to_words
+from mathspell.helpers.quantities import Quantity, parse_quantity
+from mathspell.helpers.units import get_unit_index, load_unit_parse
+
+if TYPE_CHECKING:
+    import spacy
+
+_quantity_parser = None
+
+# Parsed quantities shared by all quantity helpers, keyed by the parsed string.
+QUANTITY_CACHE = LRUCache(maxsize=4096)
+
+def get_quantity_parser():
+    """
+    Return `unit_parse.parser`, importing it (and pint) on first use.
+    """
+    global _quantity_parser
+    if _quantity_parser is None:
+        load_unit_parse()
+        from unit_parse import parser
+        _quantity_parser = parser
+    return _quantity_parser
+
+def unit_parse_quantity(string: str):
+    """
+    Parse a quantity string with `unit_parse`.
+    """
+    return get_quantity_parser()(string)
+
+def parse_quantity_string(string: str):
+    """
+    Parse a quantity string with the built-in engine, or with `unit_parse`
+    if the engine does not know its form or units.
+    """
+    q = parse_quantity(string)
+    return unit_parse_quantity(string) if q is None else q
+
+def quantity_parser(string: str):
+    """
+    Parse a quantity string, memoized in `QUANTITY_CACHE`.
+    """
+    return QUANTITY_CACHE.get_or_compute(string, parse_quantity_string)
+
+def configure_quantity_cache(maxsize: int) -> None:
+    """
+    Set the number of parsed quantities kept in memory (0 disables caching).
+    """
+    QUANTITY_CACHE.resize(maxsize)
+
+def measurable_quantity(string: str):
+    """
+    Parse the string once and return the quantity if it is measurable, else None.
+    Strings without any number or unit are rejected before parsing.
+    """
+    if not get_unit_index().could_be_quantity(string):
+        return None
+    try:
+        q = quantity_parser(string)
+        return q if q and not q.dimensionless else None
+    except AttributeError:
+        return None
 
 def interpret_currency(number: float, currency_name: str, minor_currency_name: str) -> str:
     """
@@ -15,6 +75,14 @@ def interpret_currency(number: float, currency_name: str, minor_currency_name: s
     whole_val = int(whole_str)
     fractional_val = int(fractional_str)
 
+    language = foreign_language()
+    if language is not None:
+        words = f"{convert_number_to_words(whole_val)} {currency_words(language, currency_name, whole_val)}"
+        if fractional_val == 0:
+            return words
+        minor = currency_words(language, currency_name, fractional_val, minor=True)
+        return f"{words} {convert_number_to_words(fractional_val)} {minor}"
+
     if whole_val > 1:
         currency_name += 's'
     if fractional_val > 1:
@@ -52,6 +120,19 @@ def token_is_ordinal(token_text: str, next_token_text: str) -> bool:
     combined = f"{token_text}{next_token_text}"
     return bool(re.match(r"^(-?\d+)(st|nd|rd|th)$", combined, re.IGNORECASE))
     
+def token_is_compound_number_hyphen(token: "spacy.tokens.Token", prev_token, next_token) -> bool:
+    """
+    Check if a '-' joins the parts of a spelled number ('forty-five'), as
+    time rewriting writes minutes, rather than standing for minus.
+    """
+    return (
+        token.text == "-"
+        and prev_token is not None and next_token is not None
+        and not prev_token.whitespace_ and not token.whitespace_
+        and prev_token.lower_ in c.TENS_WORDS
+        and next_token.lower_ in c.UNIT_WORDS
+    )
+
 def convert_numeric_date_simple(date_str: str) -> str:
     """
     Replace date separators like / with spaces.
@@ -59,49 +140,53 @@ def convert_numeric_date_simple(date_str: str) -> str:
     """
     return re.sub(r"[./]", " ", date_str)
 
+_CLOCK_12H = re.compile(r"(?P<hour>1[0-2]|0[1-9]|[1-9]):(?P<minute>[0-5]\d|\d)\s+(?:am|pm)", re.IGNORECASE)
+_CLOCK_24H = re.compile(r"(?P<hour>2[0-3]|[0-1]\d|\d):(?P<minute>[0-5]\d|\d)")
+_AM_PM = re.compile(r"\b(AM|PM)\b", re.IGNORECASE)
+
 def convert_time(time_str: str) -> str:
     """
     Convert a time string (e.g., '3:45 PM') into spoken form (e.g., 'three forty-five PM').
+    Accepts what `strptime` accepts for '%I:%M %p' and '%H:%M'.
     """
     time_str = time_str.strip()
-    am_pm_match = re.search(r"\b(AM|PM)\b", time_str, re.IGNORECASE)
+    am_pm_match = _AM_PM.search(time_str)
     has_am_pm = bool(am_pm_match)
 
-    try:
-        if has_am_pm:
-            dt = datetime.strptime(time_str, "%I:%M %p")
-            hour = dt.hour if dt.hour != 0 else 12
-            if dt.hour > 12:
-               hour = dt.hour - 12
-            am_pm = am_pm_match.group(1).upper()
-        else:
-            dt = datetime.strptime(time_str, "%H:%M")
-            hour = dt.hour
-    except ValueError:
+    clock = (_CLOCK_12H if has_am_pm else _CLOCK_24H).fullmatch(time_str)
+    if not clock:
         return time_str
+    # With AM/PM, the spoken hour is the 12-hour clock value as written.
+    hour = int(clock.group("hour"))
+    minute = int(clock.group("minute"))
 
-    hour_words = num2words(hour)
-    if dt.minute:
-        minute_words = num2words(dt.minute)
+    hour_words = number_to_words(hour)
+    if minute:
+        minute_words = number_to_words(minute)
         time_words = f"{hour_words} {minute_words}"
     else:
         time_words = hour_words
 
     if has_am_pm:
-        time_words += f" {am_pm}"
+        time_words += f" {am_pm_match.group(1).upper()}"
     return time_words
 
+_NUMERIC_DATETIME = re.compile(
+    r"(?P<date>\d{1,2}/\d{1,2}/\d{4})"
+    r"(?P<sep>\s+(?:at\s+)?)"
+    r"(?P<time>\d{1,2}:\d{2}(?:\s*[APMapm]{2})?)(?=\b|$)",
+    re.IGNORECASE
+)
+_NUMERIC_DATE = re.compile(r"(?P<date>\d{1,2}/\d{1,2}/\d{2,4})\b")
+_TIME_SHORTHAND = re.compile(
+    r"\b(?:at\s*)?(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>(AM|PM))\b",
+    re.IGNORECASE
+)
+
 def replace_numeric_datetime(sentence: str) -> str:
     """
     Preprocess datetime patterns like '12/25/2023 at 3:45 PM' to '12 25 2023 at three forty-five PM' to avoid confusion with mathematical signs.
     """
-    pattern = re.compile(
-        r"(?P<date>\d{1,2}/\d{1,2}/\d{4})"
-        r"(?P<sep>\s+(?:at\s+)?)"
-        r"(?P<time>\d{1,2}:\d{2}(?:\s*[APMapm]{2})?)(?=\b|$)",
-        re.IGNORECASE
-    )
-
     def repl(match):
         date_str = match.group("date")
         sep = match.group("sep")
@@ -110,29 +195,22 @@ def replace_numeric_datetime(sentence: str) -> str:
         new_time = convert_time(time_str)
         return f"{new_date}{sep}{new_time}"
 
-    return re.sub(pattern, repl, sentence)
+    return _NUMERIC_DATETIME.sub(repl, sentence)
 
 def replace_numeric_date_only(sentence: str) -> str:
     """
     Replace date-only patterns like '12/25/2023' with '12 25 2023'.
     """
-    pattern = re.compile(r"(?P<date>\d{1,2}/\d{1,2}/\d{2,4})\b")
-
     def repl(match):
         date_str = match.group("date")
         return convert_numeric_date_simple(date_str)
 
-    return re.sub(pattern, repl, sentence)
+    return _NUMERIC_DATE.sub(repl, sentence)
 
 def replace_time_shorthand(sentence: str) -> str:
     """
     Replace time shorthand like 'at 3PM' or '4:30AM' with spoken equivalents.
     """
-    pattern = re.compile(
-        r"\b(?:at\s*)?(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>(AM|PM))\b",
-        re.IGNORECASE
-    )
-
     def repl(match):
         hour = match.group("hour")
         minute = match.group("minute") if match.group("minute") else "00"
@@ -145,18 +223,67 @@ def replace_time_shorthand(sentence: str) -> str:
             return f"at {converted}"
         return converted
 
-    return re.sub(pattern, repl, sentence)
+    return _TIME_SHORTHAND.sub(repl, sentence)
+
+# Every date/time match is made of these characters only and contains a digit.
+_DATETIME_CHARS = frozenset("/:atpmATPM")
+_DIGITS = re.compile(r"\d+")
+_DATETIME_RUN = re.compile(r"[\d\s/:atpmATPM]*")
+
+def _is_datetime_char(char: str) -> bool:
+    return char in _DATETIME_CHARS or char.isspace() or char.isdecimal()
+
+def _rewrite_datetime_region(region: str) -> str:
+    """
+    Apply the three date/time replacements, in order, to one candidate region,
+    skipping the ones whose required characters are missing.
+    """
+    if "/" in region:
+        if ":" in region:
+            region = replace_numeric_datetime(region)
+        region = replace_numeric_date_only(region)
+    if "m" in region or "M" in region:
+        region = replace_time_shorthand(region)
+    return region
 
 def process_time_patterns_ahead_of_tokenization(sentence: str) -> str:
     """
     Orchestrate multiple time/date replacements before tokenizing.
     """
-    s = replace_numeric_datetime(sentence)
-    s = replace_numeric_date_only(s)
-    s = replace_time_shorthand(s)
-    return s
-
-def looks_like_year_context(token: spacy.tokens.Token) -> bool:
+    return apply_edits(sentence, time_pattern_edits(sentence))
+
+def time_pattern_edits(sentence: str) -> List[Edit]:
+    """
+    Return the time/date replacements as edits of the sentence.
+    The text is scanned once for digits; each maximal run of date/time
+    characters around them is rewritten on its own, together with one
+    neighbouring character on each side for word-boundary checks. Matches can
+    never cross such a run, so the result is the same as applying the
+    replacements to the whole text.
+    """
+    edits = []
+    done = 0
+    scanned = 0
+    for digits in _DIGITS.finditer(sentence):
+        if digits.start() < scanned:
+            continue
+        start = digits.start()
+        while start > scanned and _is_datetime_char(sentence[start - 1]):
+            start -= 1
+        end = scanned = _DATETIME_RUN.match(sentence, digits.end()).end()
+
+        context_start = max(start - 1, done)
+        context_end = min(end + 1, len(sentence))
+        region = sentence[context_start:context_end]
+        rewritten = _rewrite_datetime_region(region)
+        if rewritten != region:
+            head = start - context_start
+            tail = context_end - end
+            edits.append(minimal_edit(start, sentence[start:end], rewritten[head:len(rewritten) - tail]))
+            done = end
+    return edits
+
+def looks_like_year_context(token: "spacy.tokens.Token") -> bool:
     """
     Check if a token is marked by SpaCy as a date/time entity.
     """
@@ -178,6 +305,9 @@ def handle_percentage(number: float) -> str:
     """
     Convert numeric percentage into a spoken form.
     """
+    language = foreign_language()
+    if language is not None:
+        return f"{convert_number_to_words(number)} {LANGUAGES[language].percent}"
     if number == 100:
         return "hundred percent"
     elif number.is_integer():
@@ -186,20 +316,16 @@ def handle_percentage(number: float) -> str:
         whole_part = int(number)
         fractional_part = int(round((number - whole_part) * 10 ** len(str(number).split('.')[-1])))
         whole_words = convert_number_to_words(whole_part)
-        fractional_words = num2words(fractional_part)
+        fractional_words = number_to_words(fractional_part)
         number_words = f"{whole_words} point {fractional_words}"
 
     return f"{number_words} percent"
 
 def token_is_a_quantity(string: str) -> bool:
     """
-    Use `unit_parse` to check if the string is a measurable quantity.
+    Check if the string is a measurable quantity.
     """
-    try:
-        q = quantity_parser(string)
-        return bool(q and not q.dimensionless)
-    except AttributeError:
-        return False
+    return measurable_quantity(string) is not None
 
 def units_to_string(units: dict) -> str:
     """
@@ -217,39 +343,38 @@ def units_to_string(units: dict) -> str:
             parts.append(f"per {key} to the power of {-val}")
     return " ".join(parts)
 
-def convert_token_to_quantity(string: str, magnitude_is_exp: bool = False) -> str:
+def quantity_to_words(q, magnitude_is_exp: bool = False) -> str:
     """
-    Convert a quantity string into spoken form (e.g. 'three kilograms').
+    Convert a parsed quantity into spoken form (e.g. 'three kilograms').
     If `magnitude_is_exp` is True, only output the units, ignoring numeric magnitude.
     """
-    q = quantity_parser(string)
     magnitude = q.magnitude
-    units = units_to_string(dict(q.units._units))
+    units = units_to_string(q.units if isinstance(q, Quantity) else dict(q.units._units))
 
     if magnitude_is_exp:
         return units
     return f"{convert_number_to_words(magnitude)} {units}"
 
+def convert_token_to_quantity(string: str, magnitude_is_exp: bool = False) -> str:
+    """
+    Convert a quantity string into spoken form (e.g. 'three kilograms').
+    If `magnitude_is_exp` is True, only output the units, ignoring numeric magnitude.
+    """
+    return quantity_to_words(quantity_parser(string), magnitude_is_exp)
+
 def tokens_are_a_quantity(combined_token_text: str) -> bool:
     """
     Check if the combined text of multiple tokens is a measurable quantity.
     """
-    q = quantity_parser(combined_token_text)
-    return bool(q and not q.dimensionless)
+    return measurable_quantity(combined_token_text) is not None
 
 def convert_tokens_to_quantity(combined_token_text: str, magnitude_is_exp: bool = False) -> str:
     """
     Convert multiple tokens forming a quantity into spoken form.
     """
-    q = quantity_parser(combined_token_text)
-    magnitude = q.magnitude
-    units = units_to_string(dict(q.units._units))
+    return quantity_to_words(quantity_parser(combined_token_text), magnitude_is_exp)
 
-    if magnitude_is_exp:
-        return units
-    return f"{convert_number_to_words(magnitude)} {units}"
-
-def token_has_exponential_notation(token: spacy.tokens.Token) -> bool:
+def token_has_exponential_notation(token: "spacy.tokens.Token") -> bool:
     """
     Check if a token contains exponential notation, e.g., 3.2e+5.
     """
@@ -287,6 +412,21 @@ def operator_is_part_of_quantity(token, prev_token, prev_prev_token, next_token)
 
     return bool(token.text == '/' and token_is_a_quantity(string))
 
+def operator_quantity_to_words(token, prev_token, prev_prev_token, next_token) -> Optional[str]:
+    """
+    Convert a quantity expression around a slash operator (e.g., '3 kg / s') into
+    a spoken form, parsing it once. Returns None if the operator is not part of one.
+    """
+    if token.text != '/' or not prev_prev_token or not next_token:
+        return None
+    if prev_prev_token.like_num:
+        q = measurable_quantity(f"{prev_prev_token.text} {prev_token.text}/{next_token.text}")
+        return None if q is None else quantity_to_words(q)
+    if token_has_exponential_notation(prev_prev_token):
+        q = measurable_quantity(f"1 {prev_token.text}/{next_token.text}")
+        return None if q is None else quantity_to_words(q, True)
+    return None
+
 def convert_operator_part_of_quantity(prev_token, prev_prev_token, next_token) -> str:
     """
     Convert an operator that is part of a quantity expression into a spoken form.
@@ -307,12 +447,15 @@ def interpret_large_scale(number: float, scale: str) -> str:
     result = convert_number_to_words(number)
     return f"{result} {scale}"
 
-def is_illion_scale(token: spacy.tokens.Token) -> bool:
+def is_illion_scale(token: "spacy.tokens.Token") -> bool:
     """
     Check if a token refers to million/billion/trillion or an abbreviation (m, b, tr).
     """
     if re.search(r'illion$', token.lemma_.lower()):
         return True
+    language = foreign_language()
+    if language is not None and token.lower_ in LANGUAGES[language].scales:
+        return True
 
     abbreviation = token.text.lower()
     return abbreviation in {"m", "b", "tr", 'gaz'}
@@ -321,17 +464,27 @@ def is_illion_scale(token: spacy.tokens.Token) -> bool:
 
 def convert_number_to_words(number: float, to_year: bool = False, to_ordinal: bool = False) -> str:
      """
-     Uses num2words to convert float to string.
+     Uses num2words (through precomputed tables and a cache) to convert float to string.
      Handles cases like 'to_year' or 'to_ordinal'
      """
+     language = foreign_language()
+     if language is not None:
+          if to_year and number.is_integer():
+               return spell_in(language, int(number), "year")
+          if to_ordinal:
+               return spell_in(language, int(number), "ordinal")
+          if isinstance(number, float) and number.is_integer():
+               number = int(number)
+          return spell_in(language, number)
+
      if to_year and number.is_integer():
-          return num2words(int(number), to="year")
+          return number_to_words(int(number), to="year")
 
      if to_ordinal:
-          return num2words(int(number), to="ordinal")
+          return number_to_words(int(number), to="ordinal")
 
      # Workaround for num2words issue with negative numbers: https://github.com/savoirfairelinux/num2words/issues/402
-     result = num2words(number)
+     result = number_to_words(number)
      if number < 0 and 'minus' not in result:
           result = f"minus {result}"
      return result
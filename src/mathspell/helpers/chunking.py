@@ -0,0 +1,89 @@
+import re
+from typing import IO, Iterable, Iterator, List, Optional, Union
+
+# Places where a long text can be cut without changing its transformation.
+# `transform_doc` looks at most two tokens around the current one, and none
+# of its rules reaches across a line break (which becomes a whitespace token)
+# or across the end of a sentence whose last word holds no digit, as long as
+# the next chunk starts with a letter. Date and time patterns do reach across
+# line breaks ('12/25/2023\nat 15:45'), so a line break after a digit is not
+# a boundary.
+_BOUNDARY = re.compile(r"(?:(?<!\S)[^\s\d]*[.!?]\s+|(?<=[^\s\d])\s*\n\s*)(?=[^\W\d_])")
+# Fallback for text without sentence or line breaks: a gap after two words
+# made of letters only.
+_WORD_GAP = re.compile(r"(?<!\S)[^\W\d_]+\s+[^\W\d_]+\s+(?=[^\W\d_])")
+_WHITESPACE = re.compile(r"\s+(?=\S)")
+
+Source = Union[str, IO[str], Iterable[str]]
+
+def read_pieces(source: Source, size: int) -> Iterator[str]:
+    """
+    Yield the text of a string, a file-like object or an iterable of strings
+    (such as the lines of an open file) in pieces of at most `size`
+    characters. Strings from an iterable are split after they are read, so
+    each is held in memory whole.
+    """
+    if isinstance(source, str):
+        for start in range(0, len(source), size):
+            yield source[start:start + size]
+    elif hasattr(source, "read"):
+        while True:
+            piece = source.read(size)
+            if not piece:
+                return
+            yield piece
+    else:
+        for text in source:
+            for start in range(0, len(text), size):
+                yield text[start:start + size]
+
+def _last_match_end(pattern: re.Pattern, text: str, start: int, end: int) -> Optional[int]:
+    cut = None
+    for match in pattern.finditer(text, start, end):
+        cut = match.end()
+    return cut
+
+def find_cut(text: str, chunk_size: int, limit: int) -> Optional[int]:
+    """
+    Return the offset of the last safe cut in `text` beyond half a chunk, or
+    None if more text should be read first. Past `limit` characters, the text
+    is cut between plain words, then at any whitespace, then anywhere.
+    """
+    cut = _last_match_end(_BOUNDARY, text, chunk_size // 2, len(text))
+    if cut is not None or len(text) < limit:
+        return cut
+    for pattern in (_WORD_GAP, _WHITESPACE):
+        cut = _last_match_end(pattern, text, 1, limit)
+        if cut is not None:
+            return cut
+    return limit
+
+def split_segments(text: str) -> List[str]:
+    """
+    Split a text at every paragraph and sentence boundary where it is safe to
+    cut. The segments concatenate back to the text.
+    """
+    cuts = [match.end() for match in _BOUNDARY.finditer(text)]
+    return [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)]) if start < end]
+
+def iter_chunks(source: Source, chunk_size: int = 100_000) -> Iterator[str]:
+    """
+    Split a long text into chunks of roughly `chunk_size` characters at
+    paragraph and sentence boundaries, holding at most a few chunks in memory
+    (plus, for an iterable source, the string being read). The chunks
+    concatenate back to the original text.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    limit = 4 * chunk_size
+    buffer = ""
+    for piece in read_pieces(source, chunk_size):
+        buffer += piece
+        while len(buffer) > chunk_size:
+            cut = find_cut(buffer, chunk_size, limit)
+            if cut is None:
+                break
+            yield buffer[:cut]
+            buffer = buffer[cut:]
+    if buffer:
+        yield buffer
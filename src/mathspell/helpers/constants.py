@@ -108,3 +108,10 @@ MINOR_CURRENCY_MAP = {
     'lari': 'tetri',
     'bitcoin': 'satoshi',
 }
+
+# Words joined by a hyphen in spelled compound numbers ('forty-five', 'twenty-first').
+TENS_WORDS = {'twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety'}
+UNIT_WORDS = {
+    'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine',
+    'first', 'second', 'third', 'fourth', 'fifth', 'sixth', 'seventh', 'eighth', 'ninth',
+}
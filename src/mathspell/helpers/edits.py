@@ -0,0 +1,150 @@
+from bisect import bisect_right
+from typing import List, NamedTuple, Optional, Sequence
+
+class Edit(NamedTuple):
+    """
+    Replace `text[start:end]` with `replacement`.
+    """
+    start: int
+    end: int
+    replacement: str
+
+class Normalization(NamedTuple):
+    """
+    Result of `analyze_edits`: the output text, the edits that turn the input
+    into it and, on request, `alignment[k]`, the input offset of output
+    character `k` (with one extra entry for the end of the text). Characters
+    of a replacement map to the start of the span they replace.
+    """
+    text: str
+    edits: List[Edit]
+    alignment: Optional[List[int]] = None
+
+def minimal_edit(start: int, old: str, new: str) -> Edit:
+    """
+    Return the edit turning `old`, found at `start`, into `new`, without the
+    prefix and suffix they share.
+    """
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    return Edit(start + prefix, start + len(old) - suffix, new[prefix:len(new) - suffix])
+
+def apply_edits(text: str, edits: Sequence[Edit]) -> str:
+    """
+    Apply sorted, non-overlapping edits, copying the text between them in bulk.
+    """
+    if not edits:
+        return text
+    parts = []
+    done = 0
+    for start, end, replacement in edits:
+        parts.append(text[done:start])
+        parts.append(replacement)
+        done = end
+    parts.append(text[done:])
+    return "".join(parts)
+
+def space_edits(text: str, edits: Sequence[Edit]) -> List[Edit]:
+    """
+    Pad replacements with a space where they would otherwise run into a
+    neighbouring word or replacement, e.g. '5+3' -> 'five plus three'.
+    """
+    spaced = []
+    for k, (start, end, replacement) in enumerate(edits):
+        if replacement:
+            if spaced and spaced[-1].end == start:
+                left = spaced[-1].replacement[-1:]
+            else:
+                left = text[start - 1:start] if start else ""
+            if left.isalnum() and replacement[0].isalnum():
+                replacement = " " + replacement
+            followed = k + 1 < len(edits) and edits[k + 1].start == end
+            if not followed and replacement[-1].isalnum() and text[end:end + 1].isalnum():
+                replacement += " "
+        spaced.append(Edit(start, end, replacement))
+    return spaced
+
+class OffsetMap:
+    """
+    Map offsets between a text and the result of applying `edits` to it.
+    Offsets inside a replaced span map to the start of the span, or to its
+    end when `end` is set.
+    """
+    def __init__(self, edits: Sequence[Edit]):
+        self.edits = list(edits)
+        self.starts = [edit.start for edit in self.edits]
+        self.new_starts = []
+        self.new_ends = []
+        shift = 0
+        for start, end, replacement in self.edits:
+            self.new_starts.append(start + shift)
+            shift += len(replacement) - (end - start)
+            self.new_ends.append(end + shift)
+
+    def to_original(self, offset: int, end: bool = False) -> int:
+        k = bisect_right(self.new_starts, offset) - 1
+        if k < 0:
+            return offset
+        if offset < self.new_ends[k]:
+            return self.edits[k].end if end and offset > self.new_starts[k] else self.edits[k].start
+        return self.edits[k].end + offset - self.new_ends[k]
+
+    def to_edited(self, offset: int, end: bool = False) -> int:
+        k = bisect_right(self.starts, offset) - 1
+        if k < 0:
+            return offset
+        if offset < self.edits[k].end:
+            return self.new_ends[k] if end and offset > self.starts[k] else self.new_starts[k]
+        return self.new_ends[k] + offset - self.edits[k].end
+
+def compose_edits(original: str, first: Sequence[Edit], second: Sequence[Edit], final: str) -> List[Edit]:
+    """
+    Turn `first` (edits of `original`) followed by `second` (edits of the
+    intermediate text), which produce `final`, into edits of `original`.
+    Spans overlapping in either text are merged.
+    """
+    first_map = OffsetMap(first)
+    second_map = OffsetMap(second)
+    spans = [
+        (edit.start, edit.end, new_start, new_end)
+        for edit, new_start, new_end in zip(first, first_map.new_starts, first_map.new_ends)
+    ]
+    spans += [
+        (first_map.to_original(edit.start), first_map.to_original(edit.end, end=True), edit.start, edit.end)
+        for edit in second
+    ]
+    spans.sort()
+
+    merged = []
+    for span in spans:
+        if merged and (span[0] < merged[-1][1] or span[2] < merged[-1][3]):
+            start, end, middle_start, middle_end = merged[-1]
+            merged[-1] = (start, max(end, span[1]), min(middle_start, span[2]), max(middle_end, span[3]))
+        else:
+            merged.append(span)
+
+    edits = []
+    for start, end, middle_start, middle_end in merged:
+        replacement = final[second_map.to_edited(middle_start):second_map.to_edited(middle_end, end=True)]
+        if replacement != original[start:end]:
+            edits.append(Edit(start, end, replacement))
+    return edits
+
+def alignment_map(edits: Sequence[Edit], length: int) -> List[int]:
+    """
+    Return the input offset of each character of the edited text, plus one
+    entry for its end, given the edits of an input of `length` characters.
+    """
+    alignment = []
+    done = 0
+    for start, end, replacement in edits:
+        alignment.extend(range(done, start))
+        alignment.extend([start] * len(replacement))
+        done = end
+    alignment.extend(range(done, length + 1))
+    return alignment
@@ -0,0 +1,76 @@
+import re
+from typing import Iterable, Iterator, List, Tuple
+from spacy.language import Language
+from spacy.pipeline import Sentencizer
+from spacy.tokens import Doc
+
+# `analyze_text` only reads tagger, lemmatizer and entity output around
+# numbers and for the possessive "'s"; everything else is decided from the
+# tokens alone.
+_NEEDS_MODEL = re.compile(r"\d|'s")
+
+_sentencizer = Sentencizer()
+
+def token_needs_model(token) -> bool:
+    """
+    Check if `analyze_text` reads statistical annotations for this token.
+    """
+    return token.text == "'s" or bool(_NEEDS_MODEL.search(token.text))
+
+def model_windows(doc: Doc) -> List[Tuple[int, int]]:
+    """
+    Return (start, end) token ranges of the runs of consecutive sentences that
+    contain a token needing the model. Sentences are split by punctuation
+    rules, without running any statistical component.
+    """
+    if not _NEEDS_MODEL.search(doc.text):
+        return []
+    needs = [token_needs_model(token) for token in doc]
+    if not any(needs):
+        return []
+
+    sent_starts = _sentencizer.predict([doc])[0]
+    bounds = [i for i, is_start in enumerate(sent_starts) if is_start or i == 0] + [len(doc)]
+    windows = []
+    for start, end in zip(bounds, bounds[1:]):
+        if not any(needs[start:end]):
+            continue
+        if windows and windows[-1][1] == start:
+            windows[-1] = (windows[-1][0], end)
+        else:
+            windows.append((start, end))
+    return windows
+
+def parse_selectively(nlp: Language, texts: Iterable[str], batch_size: int = 256) -> Iterator[Doc]:
+    """
+    Tokenize the texts and run the rest of the pipeline only over the windows
+    returned by `model_windows`, splicing the annotated windows back between
+    the untouched token ranges. Texts without numbers never reach the model.
+    """
+    docs = [nlp.make_doc(text) for text in texts]
+    windows = [model_windows(doc) for doc in docs]
+    window_docs = []
+    for doc, doc_windows in zip(docs, windows):
+        if doc_windows == [(0, len(doc))]:
+            window_docs.append(doc)
+        else:
+            window_docs.extend(doc[start:end].as_doc() for start, end in doc_windows)
+    parsed = iter(nlp.pipe(window_docs, batch_size=batch_size))
+
+    for doc, doc_windows in zip(docs, windows):
+        if not doc_windows:
+            yield doc
+            continue
+        if doc_windows == [(0, len(doc))]:
+            yield next(parsed)
+            continue
+        pieces = []
+        done = 0
+        for start, end in doc_windows:
+            if done < start:
+                pieces.append(doc[done:start].as_doc())
+            pieces.append(next(parsed))
+            done = end
+        if done < len(doc):
+            pieces.append(doc[done:].as_doc())
+        yield Doc.from_docs(pieces, ensure_whitespace=False)
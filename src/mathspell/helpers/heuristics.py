@@ -0,0 +1,149 @@
+import re
+from typing import Optional
+from spacy.language import Language
+from spacy.tokens import Doc, Span
+from mathspell.helpers import constants as c
+
+######################################################################
+# Rule-only annotations. `analyze_text` reads three things from the
+# statistical pipeline: the tag of the word before "'s" (possessives), the
+# lemma of scale words and currency names after a number, and whether a
+# number is a DATE/TIME entity (years). The component below sets those from
+# the tokens alone, so a blank pipeline can stand in for the model where
+# latency matters more than the odd different decision.
+
+PRONOUNS = {"i", "you", "he", "she", "it", "we", "they", "me", "him", "her", "us", "them", "one"}
+
+# Capitalized words at the start of a sentence that are not names.
+SENTENCE_START_WORDS = {
+    "today", "tomorrow", "yesterday", "tonight", "there", "here", "that", "this", "what", "who",
+    "where", "when", "how", "why", "let", "everyone", "everybody", "someone", "somebody",
+    "nobody", "nothing", "everything", "something", "anyone", "anything", "the", "a", "an",
+}
+
+# Words before a number that make it a year, or a label rather than a year.
+YEAR_CUES = {
+    "in", "since", "by", "until", "till", "from", "year", "during", "before", "after", "of",
+    "circa", "around", "early", "late", "mid", "between", "to", "and", "through", "fiscal",
+    "spring", "summer", "autumn", "fall", "winter",
+}
+NOT_YEAR_CUES = {
+    "room", "floor", "page", "pages", "number", "no", "#", "id", "flight", "route", "model",
+    "version", "chapter", "section", "apartment", "suite", "gate", "platform", "line", "bus",
+    "code", "pin", "item", "step", "level", "score", "size", "top", "over", "under", "about",
+    "nearly", "almost", "x", "+", "-", "*", "/", "=", "^", "<", ">",
+}
+MONTHS = {
+    "january", "february", "march", "april", "may", "june", "july", "august", "september",
+    "october", "november", "december", "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep",
+    "sept", "oct", "nov", "dec",
+}
+# Lowercase words ending in 's' after a year ('in 2020 was ...').
+NOT_PLURALS = {"was", "is", "has", "as", "his", "its", "this", "thus", "plus", "less", "across", "us"}
+
+_YEAR = re.compile(r"\d{4}")
+_SENTENCE_END = {".", "!", "?"}
+
+def base_form(word: str) -> Optional[str]:
+    """
+    Return the lemma `analyze_text` needs for a scale word or currency name
+    ('millions' -> 'million', 'Euros' -> 'euro'), or None for other words.
+    """
+    lower = word.lower()
+    for form in (lower, lower[:-1] if lower.endswith("s") else None):
+        if form and (form.endswith("illion") or form in c.ALTERNATIVE_CURRENCIES):
+            return form
+    return None
+
+def starts_sentence(doc: Doc, i: int) -> bool:
+    """
+    Check if the token at `i` follows sentence-final punctuation or a line break.
+    """
+    previous = i - 1
+    while previous >= 0 and doc[previous].is_space:
+        if "\n" in doc[previous].text:
+            return True
+        previous -= 1
+    return previous < 0 or doc[previous].text in _SENTENCE_END
+
+def possessor_tag(doc: Doc, i: int) -> str:
+    """
+    Tag of the word before "'s": PRP for personal pronouns, NNP for
+    capitalized words that are not sentence-initial common words, else ''.
+    """
+    token = doc[i]
+    lower = token.lower_
+    if lower in PRONOUNS:
+        return "PRP"
+    if token.is_alpha and (token.is_title or token.is_upper):
+        if starts_sentence(doc, i) and lower in SENTENCE_START_WORDS:
+            return ""
+        return "NNP"
+    return ""
+
+def is_year(doc: Doc, i: int) -> bool:
+    """
+    Check if a four-digit number reads as a year: not after a currency
+    symbol or a label word ('room 1234'), yes after a year cue ('in 1995')
+    or near a month, and not before a plural noun, a scale word or a
+    currency name ('2000 people', '1500 million').
+    """
+    token = doc[i]
+    if not _YEAR.fullmatch(token.text) or not 1000 <= int(token.text) <= 2100:
+        return False
+    prev_token = doc[i - 1] if i > 0 else None
+    next_token = doc[i + 1] if i + 1 < len(doc) else None
+    if prev_token is not None:
+        if prev_token.text in c.CURRENCY_MAP or prev_token.lower_ in NOT_YEAR_CUES:
+            return False
+        # Dates are spelled out by numbers before preprocessing ('12/25/2025' -> '12 25 2025').
+        if prev_token.lower_ in YEAR_CUES or prev_token.like_num:
+            return True
+    if any(doc[j].lower_.rstrip(".") in MONTHS for j in range(max(i - 3, 0), i)):
+        return True
+    if next_token is not None:
+        lower = next_token.lower_
+        if base_form(lower) is not None:
+            return False
+        if next_token.is_alpha and next_token.is_lower and lower.endswith("s") and len(lower) > 3 \
+                and lower not in NOT_PLURALS:
+            return False
+    return True
+
+class RuleAnnotator:
+    """
+    Set the tag, lemma and entity annotations that `analyze_text` reads,
+    from the tokens alone.
+    """
+    def __call__(self, doc: Doc) -> Doc:
+        entities = []
+        for token in doc:
+            if token.text == "'s" and token.i > 0:
+                tag = possessor_tag(doc, token.i - 1)
+                if tag:
+                    doc[token.i - 1].tag_ = tag
+            elif token.is_alpha:
+                lemma = base_form(token.text)
+                if lemma is not None:
+                    token.lemma_ = lemma
+            elif is_year(doc, token.i):
+                entities.append(Span(doc, token.i, token.i + 1, label="DATE"))
+        doc.set_ents(entities, default="outside")
+        return doc
+
+@Language.factory("mathspell_rules")
+def create_rule_annotator(nlp: Language, name: str) -> RuleAnnotator:
+    return RuleAnnotator()
+
+def load_rules_pipeline(lang: str = "en") -> Language:
+    """
+    A blank pipeline with the custom tokenizer and the rule annotator, for
+    `Normalizer(engine="rules")`. It loads in milliseconds and needs no model.
+    """
+    import spacy
+    from mathspell.helpers.spacy_tokenizer import custom_tokenizer
+
+    nlp = spacy.blank(lang)
+    nlp.tokenizer = custom_tokenizer(nlp)
+    nlp.add_pipe("mathspell_rules")
+    return nlp
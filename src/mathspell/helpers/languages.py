@@ -0,0 +1,179 @@
+import contextlib
+import re
+from contextvars import ContextVar
+from typing import Dict, FrozenSet, Iterator, Optional
+from mathspell.helpers import constants as c
+
+######################################################################
+# Languages other than English. Numbers are spelled by num2words in the
+# language of the pipeline that parsed the text (`Doc.lang_`), which
+# `transform_tokens` makes the current language while it runs; currency
+# names come from num2words' tables and the other words from `LANGUAGES`.
+# English keeps its own code path. Units, exponents and times are still
+# read in English. Ordinals written with digits ('am 3. Mai', '3er', '1º')
+# are not recognized: the number reads as a cardinal and the mark is kept.
+
+class LanguageTable:
+    """
+    What `analyze_text` needs for a language besides num2words: the default
+    spaCy model, operator words (symbols missing here read as in English),
+    the words for 'percent' and for the bar of a fraction, the scale words
+    read like 'million', and whether ',' is the decimal mark.
+    """
+    __slots__ = ("model", "operators", "percent", "over", "scales", "decimal_comma")
+
+    def __init__(
+        self,
+        model: str,
+        operators: Dict[str, str],
+        percent: str,
+        over: str,
+        scales: FrozenSet[str],
+        decimal_comma: bool = True,
+    ):
+        self.model = model
+        self.operators = {**c.OPERATOR_MAP, **operators}
+        self.percent = percent
+        self.over = over
+        self.scales = scales
+        self.decimal_comma = decimal_comma
+
+LANGUAGES: Dict[str, LanguageTable] = {
+    "en": LanguageTable("en_core_web_sm", {}, "percent", "over", frozenset(), decimal_comma=False),
+    "de": LanguageTable(
+        "de_core_news_sm",
+        {"+": "plus", "-": "minus", "*": "mal", "/": "geteilt durch", "=": "gleich", "^": "hoch",
+         "%": "Prozent", "(": "Klammer auf", ")": "Klammer zu"},
+        "Prozent", "durch",
+        frozenset({"million", "millionen", "milliarde", "milliarden", "billion", "billionen"}),
+    ),
+    "fr": LanguageTable(
+        "fr_core_news_sm",
+        {"+": "plus", "-": "moins", "*": "fois", "/": "divisé par", "=": "égal à", "^": "puissance",
+         "%": "pour cent", "(": "parenthèse ouvrante", ")": "parenthèse fermante"},
+        "pour cent", "sur",
+        frozenset({"million", "millions", "milliard", "milliards", "billion", "billions"}),
+    ),
+    "es": LanguageTable(
+        "es_core_news_sm",
+        {"+": "más", "-": "menos", "*": "por", "/": "dividido por", "=": "igual a", "^": "elevado a",
+         "%": "por ciento", "(": "abre paréntesis", ")": "cierra paréntesis"},
+        "por ciento", "entre",
+        frozenset({"millón", "millones", "millardo", "millardos", "billón", "billones"}),
+    ),
+    "it": LanguageTable(
+        "it_core_news_sm",
+        {"+": "più", "-": "meno", "*": "per", "/": "diviso", "=": "uguale a", "^": "elevato a",
+         "%": "per cento", "(": "parentesi aperta", ")": "parentesi chiusa"},
+        "per cento", "fratto",
+        frozenset({"milione", "milioni", "miliardo", "miliardi", "bilione", "bilioni"}),
+    ),
+    "pt": LanguageTable(
+        "pt_core_news_sm",
+        {"+": "mais", "-": "menos", "*": "vezes", "/": "dividido por", "=": "igual a", "^": "elevado a",
+         "%": "por cento", "(": "abre parênteses", ")": "fecha parênteses"},
+        "por cento", "sobre",
+        frozenset({"milhão", "milhões", "bilhão", "bilhões", "trilhão", "trilhões"}),
+    ),
+    "nl": LanguageTable(
+        "nl_core_news_sm",
+        {"+": "plus", "-": "min", "*": "keer", "/": "gedeeld door", "=": "is gelijk aan", "^": "tot de macht",
+         "%": "procent", "(": "haakje openen", ")": "haakje sluiten"},
+        "procent", "gedeeld door",
+        frozenset({"miljoen", "miljoenen", "miljard", "miljarden", "biljoen", "biljoenen"}),
+    ),
+}
+
+# ISO codes of the currencies in `CURRENCY_MAP`, to look up their names in num2words.
+CURRENCY_CODES = {
+    "dollar": "USD", "euro": "EUR", "pound": "GBP", "yen": "JPY", "rupee": "INR", "ruble": "RUB",
+    "won": "KRW", "shekel": "ILS", "baht": "THB", "dong": "VND", "peso": "PHP", "hryvnia": "UAH",
+    "naira": "NGN", "guarani": "PYG", "cedi": "GHS", "colón": "CRC", "tögrög": "MNT", "tenge": "KZT",
+    "lira": "TRY", "manat": "AZN", "lari": "GEL",
+}
+
+_language: ContextVar[str] = ContextVar("mathspell_language", default="en")
+
+def get_language_table(language: str) -> LanguageTable:
+    """
+    Return the table of a supported language, or raise ValueError.
+    """
+    table = LANGUAGES.get(language)
+    if table is None:
+        raise ValueError(f"unsupported language {language!r}, expected one of: {', '.join(LANGUAGES)}")
+    return table
+
+def current_language() -> str:
+    return _language.get()
+
+@contextlib.contextmanager
+def use_language(language: str) -> Iterator[None]:
+    """
+    Make `language` the current language of this thread or task within the block.
+    """
+    token = _language.set(language)
+    try:
+        yield
+    finally:
+        _language.reset(token)
+
+def foreign_language() -> Optional[str]:
+    """
+    The current language if it is a supported language other than English,
+    else None (English, or a pipeline language without a table).
+    """
+    language = _language.get()
+    return None if language == "en" or language not in LANGUAGES else language
+
+def current_table() -> LanguageTable:
+    """
+    The table of the current language; English for languages without one.
+    """
+    return LANGUAGES.get(_language.get()) or LANGUAGES["en"]
+
+_THOUSANDS_DOTS = re.compile(r"\d{1,3}(?:\.\d{3})+")
+
+def number_value(text: str) -> float:
+    """
+    The value of a number token. ',' separates thousands in English and is
+    the decimal mark in languages with `decimal_comma`, where '.' separates
+    thousands only between groups of three digits ('2,5', '1.000,5', but '3.5').
+    """
+    if not current_table().decimal_comma:
+        return float(text.replace(',', ''))
+    if "," in text:
+        return float(text.replace(".", "").replace(",", "."))
+    if _THOUSANDS_DOTS.fullmatch(text):
+        return float(text.replace(".", ""))
+    return float(text)
+
+def spell_in(language: str, number, to: str = "cardinal") -> str:
+    """
+    `num2words(number, lang=language, to=to)`, cached. Years fall back to
+    cardinals in languages without a year form.
+    """
+    from num2words import num2words
+    from mathspell.helpers.number_words import NUMBER_WORDS_CACHE
+
+    def spell(key) -> str:
+        try:
+            return num2words(number, lang=language, to=to)
+        except NotImplementedError:
+            return num2words(number, lang=language)
+
+    return NUMBER_WORDS_CACHE.get_or_compute((language, to, type(number), number), spell)
+
+def currency_words(language: str, currency_name: str, count: int, minor: bool = False) -> str:
+    """
+    The name of `count` units of a currency (or of its minor unit) in the
+    language, from num2words' currency table. Currencies it does not know
+    keep their English name.
+    """
+    from num2words import CONVERTER_CLASSES
+
+    converter = CONVERTER_CLASSES[language]
+    forms = converter.CURRENCY_FORMS.get(CURRENCY_CODES.get(currency_name, ""))
+    if forms is None:
+        name = c.MINOR_CURRENCY_MAP.get(currency_name, "cent") if minor else currency_name
+        return name + "s" if count > 1 else name
+    return converter.pluralize(count, forms[1] if minor else forms[0])
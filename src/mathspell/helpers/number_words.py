@@ -0,0 +1,275 @@
+import math
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from num2words import num2words
+from mathspell.helpers.cache import LRUCache
+
+######################################################################
+# Native English speller. It follows the rules of num2words' English
+# converter (lang_EN / lang_EU / base) so that its output is identical,
+# but works on exact integers and skips num2words' per-call dispatch.
+
+_LOW_WORDS = [
+    "zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
+    "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen",
+    "eighteen", "nineteen", "twenty",
+]
+_TENS_WORDS = {30: "thirty", 40: "forty", 50: "fifty", 60: "sixty", 70: "seventy", 80: "eighty", 90: "ninety"}
+_ORDINAL_WORDS = {
+    "one": "first", "two": "second", "three": "third", "four": "fourth", "five": "fifth",
+    "six": "sixth", "seven": "seventh", "eight": "eighth", "nine": "ninth", "ten": "tenth",
+    "eleven": "eleventh", "twelve": "twelfth",
+}
+
+def _illion_words() -> Dict[int, str]:
+    """
+    Map exponents 6, 9, ..., 303 to 'million', 'billion', ..., 'centillion'.
+    """
+    lows = ["non", "oct", "sept", "sext", "quint", "quadr", "tr", "b", "m"]
+    units = ["", "un", "duo", "tre", "quattuor", "quin", "sex", "sept", "octo", "novem"]
+    tens = ["dec", "vigint", "trigint", "quadragint", "quinquagint", "sexagint", "septuagint", "octogint", "nonagint"]
+    high = ["cent"] + [unit + ten for ten in tens for unit in units][::-1] + lows
+    top = 3 + 3 * len(high)
+    return {exponent: word + "illion" for word, exponent in zip(high, range(top, 3, -3))}
+
+_ILLION_WORDS = _illion_words()
+_MAX_EXPONENT = max(_ILLION_WORDS)
+# num2words raises OverflowError from here on.
+MAX_CARDINAL = 1000 * 10 ** _MAX_EXPONENT
+# Integer-valued floats up to here go through float arithmetic without rounding.
+_MAX_EXACT_FLOAT = 2 ** 53
+
+def _largest_card(n: int) -> Tuple[int, str]:
+    if n <= 20:
+        return n, _LOW_WORDS[n]
+    if n < 30:
+        return 20, "twenty"
+    if n < 100:
+        tens = n - n % 10
+        return tens, _TENS_WORDS[tens]
+    if n < 1000:
+        return 100, "hundred"
+    exponent = (len(str(n)) - 1) // 3 * 3
+    if exponent < 6:
+        return 1000, "thousand"
+    return 10 ** exponent, _ILLION_WORDS[exponent]
+
+def _merge(left: Tuple[str, int], right: Tuple[str, int]) -> Tuple[str, int]:
+    ltext, lnum = left
+    rtext, rnum = right
+    if lnum == 1 and rnum < 100:
+        return right
+    if 100 > lnum > rnum:
+        return f"{ltext}-{rtext}", lnum + rnum
+    if lnum >= 100 > rnum:
+        return f"{ltext} and {rtext}", lnum + rnum
+    if rnum > lnum:
+        return f"{ltext} {rtext}", lnum * rnum
+    return f"{ltext}, {rtext}", lnum + rnum
+
+def _split(n: int) -> Tuple[str, int]:
+    if n <= 20:
+        return _LOW_WORDS[n], n
+    card, word = _largest_card(n)
+    div, mod = divmod(n, card)
+    pair = _merge(("one", 1) if div == 1 else _split(div), (word, card))
+    if mod:
+        pair = _merge(pair, _split(mod))
+    return pair
+
+def _integer_to_cardinal(n: int) -> Optional[str]:
+    if n < 0:
+        words = _integer_to_cardinal(-n)
+        return None if words is None else f"minus {words}"
+    if n >= MAX_CARDINAL:
+        return None
+    return _split(n)[0]
+
+def _float_to_cardinal(value: float) -> Optional[str]:
+    if not math.isfinite(value):
+        return None
+    if value.is_integer():
+        if abs(value) >= _MAX_EXACT_FLOAT:
+            return None
+        return _integer_to_cardinal(int(value))
+
+    # Same arithmetic as num2words' float2tuple, so digits match exactly.
+    pre = int(value)
+    precision = abs(Decimal(str(value)).as_tuple().exponent)
+    post = abs(value - pre) * 10 ** precision
+    if abs(round(post) - post) < 0.01:
+        post = int(round(post))
+    else:
+        post = int(math.floor(post))
+    digits = str(post).rjust(precision, "0")
+    pre_words = _integer_to_cardinal(pre)
+    if pre_words is None:
+        return None
+    return " ".join([pre_words, "point"] + [_LOW_WORDS[int(digit)] for digit in digits[:precision]])
+
+def _decimal_to_cardinal(value: Decimal) -> Optional[str]:
+    if not value.is_finite():
+        return None
+    if value == value.to_integral_value():
+        return _integer_to_cardinal(int(value))
+
+    # Read the digits straight from the decimal, without a float round trip.
+    # Trailing zeros are dropped, as num2words drops them ('1.10' is 'one
+    # point one').
+    sign, digits, exponent = value.as_tuple()
+    fraction = "".join(map(str, digits[exponent:])).rjust(-exponent, "0").rstrip("0")
+    pre_words = _integer_to_cardinal(int(value))
+    if pre_words is None:
+        return None
+    return " ".join([pre_words, "point"] + [_LOW_WORDS[int(digit)] for digit in fraction])
+
+def _to_ordinal(cardinal: str) -> str:
+    words = cardinal.split(" ")
+    parts = words[-1].split("-")
+    last = parts[-1].lower()
+    if last in _ORDINAL_WORDS:
+        last = _ORDINAL_WORDS[last]
+    else:
+        if last[-1] == "y":
+            last = last[:-1] + "ie"
+        last += "th"
+    parts[-1] = last
+    words[-1] = "-".join(parts)
+    return " ".join(words)
+
+def _to_year(value: int) -> Optional[str]:
+    suffix = None
+    if value < 0:
+        value = abs(value)
+        suffix = "BC"
+    high, low = divmod(value, 100)
+    if high == 0 or (high % 10 == 0 and low < 10) or high >= 100:
+        words = _integer_to_cardinal(value)
+    else:
+        if low == 0:
+            low_words = "hundred"
+        elif low < 10:
+            low_words = f"oh-{_LOW_WORDS[low]}"
+        else:
+            low_words = _split(low)[0]
+        words = f"{_split(high)[0]} {low_words}"
+    if words is None:
+        return None
+    return words if suffix is None else f"{words} {suffix}"
+
+def spell_number(number, to: str = "cardinal") -> Optional[str]:
+    """
+    Spell an int, float or Decimal in English the way `num2words(number, to=to)`
+    does. Returns None for anything it declines (other types, non-finite or
+    out-of-range values, invalid ordinals), which num2words then handles.
+    Non-integral Decimals are spelled from their exact digits, whereas
+    num2words converts them to float first, so the two differ only in the
+    digits a float cannot hold.
+    """
+    kind = type(number)
+    if to == "cardinal":
+        if kind is int:
+            return _integer_to_cardinal(number)
+        if kind is float:
+            return _float_to_cardinal(number)
+        if kind is Decimal:
+            return _decimal_to_cardinal(number)
+        return None
+    if kind is not int:
+        return None
+    if to == "ordinal":
+        if number < 0:
+            return None
+        cardinal = _integer_to_cardinal(number)
+        return None if cardinal is None else _to_ordinal(cardinal)
+    if to == "year":
+        return _to_year(number)
+    return None
+
+def spell_number_or_fallback(number, to: str = "cardinal") -> str:
+    """
+    Spell with the native engine, falling back to num2words.
+    """
+    words = spell_number(number, to)
+    if words is None:
+        words = num2words(number, to=to)
+    return words
+
+######################################################################
+
+class NumberWordsTable:
+    """
+    Number words for a contiguous range of integers. Entries are filled on
+    first use, or all at once by `fill`, and are never evicted.
+    """
+
+    def __init__(self, start: int, stop: int, to: str):
+        self.start = start
+        self.stop = stop
+        self.to = to
+        self._words: List[Optional[str]] = [None] * (stop - start)
+
+    def __contains__(self, number: int) -> bool:
+        return self.start <= number < self.stop
+
+    def get(self, number: int) -> str:
+        words = self._words[number - self.start]
+        if words is None:
+            words = spell_number_or_fallback(number, self.to)
+            self._words[number - self.start] = words
+        return words
+
+    def fill(self) -> None:
+        for number in range(self.start, self.stop):
+            self.get(number)
+
+    def words(self) -> List[str]:
+        """
+        Return the words of the whole range, filling the table first.
+        """
+        self.fill()
+        return list(self._words)
+
+    def load(self, words: List[str]) -> None:
+        """
+        Take the words of the whole range, e.g. from a bundle.
+        """
+        if len(words) != self.stop - self.start:
+            raise ValueError(f"expected {self.stop - self.start} entries, got {len(words)}")
+        self._words = list(words)
+
+# Hot domain: small cardinals (which also cover cents, minutes and hours),
+# ordinals and years.
+NUMBER_WORDS_TABLES: Dict[str, NumberWordsTable] = {
+    "cardinal": NumberWordsTable(0, 10000, "cardinal"),
+    "ordinal": NumberWordsTable(1, 1001, "ordinal"),
+    "year": NumberWordsTable(1000, 2101, "year"),
+}
+
+# Everything outside the tables, keyed by (to, type, value) since 5 == 5.0.
+# Decimals are keyed by their digits, since Decimal('1.10') == Decimal('1.1').
+NUMBER_WORDS_CACHE = LRUCache(maxsize=8192)
+
+def number_to_words(number, to: str = "cardinal") -> str:
+    """
+    Same output as `num2words(number, to=to)`, served from the precomputed
+    tables or the shared cache. Decimals are spelled from their exact digits
+    (see `spell_number`).
+    """
+    value = number
+    if type(value) is float and value.is_integer() and to == "cardinal":
+        value = int(value)
+    table = NUMBER_WORDS_TABLES.get(to)
+    if table is not None and type(value) is int and value in table:
+        return table.get(value)
+    key = str(number) if type(number) is Decimal else number
+    return NUMBER_WORDS_CACHE.get_or_compute(
+        (to, type(number), key), lambda key: spell_number_or_fallback(number, to)
+    )
+
+def precompute_number_words() -> None:
+    """
+    Fill all number-word tables up front.
+    """
+    for table in NUMBER_WORDS_TABLES.values():
+        table.fill()
@@ -0,0 +1,140 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+def pipeline_size(nlp) -> int:
+    """
+    Approximate memory held by a pipeline, in bytes: the parameters of its
+    components (disabled ones included) and its word vectors.
+    """
+    size = int(nlp.vocab.vectors.data.nbytes)
+    for _, pipe in nlp.components:
+        model = getattr(pipe, "model", None)
+        if model is None or not hasattr(model, "walk"):
+            continue
+        for node in model.walk():
+            for name in node.param_names:
+                if node.has_param(name):
+                    size += int(node.get_param(name).nbytes)
+    return size
+
+class PipelinePool:
+    """
+    Bounded, thread-safe pool of loaded spaCy pipelines by key, with
+    hit/miss/load/eviction counters. Past `max_pipelines` pipelines or, if
+    given, `max_bytes` (as estimated by `pipeline_size`), the least recently
+    used ones are dropped; the pipeline just requested is always kept. A
+    dropped pipeline is loaded again on its next use, and callers still
+    holding it can finish with it.
+    """
+
+    def __init__(self, max_pipelines: int = 4, max_bytes: Optional[int] = None):
+        if max_pipelines < 1:
+            raise ValueError("max_pipelines must be positive")
+        self.max_pipelines = max_pipelines
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.evictions = 0
+        self.load_seconds = 0.0
+        self._pipelines = OrderedDict()
+        self._loading: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """
+        Return the pipeline for `key`, calling `load()` on a miss. Concurrent
+        misses on the same key load it once.
+        """
+        with self._lock:
+            entry = self._pipelines.get(key)
+            if entry is not None:
+                self._pipelines.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            loading = self._loading.setdefault(key, threading.Lock())
+
+        with loading:
+            with self._lock:
+                entry = self._pipelines.get(key)
+                if entry is not None:
+                    self._pipelines.move_to_end(key)
+                    return entry[0]
+            started = time.perf_counter()
+            nlp = load()
+            size = pipeline_size(nlp)
+            with self._lock:
+                self.loads += 1
+                self.load_seconds += time.perf_counter() - started
+                self._pipelines[key] = (nlp, size)
+                self._loading.pop(key, None)
+                self._evict()
+        return nlp
+
+    def discard(self, key: Hashable) -> None:
+        """
+        Drop the pipeline for `key`, if loaded.
+        """
+        with self._lock:
+            self._pipelines.pop(key, None)
+
+    def resize(self, max_pipelines: int, max_bytes: Optional[int] = None) -> None:
+        """
+        Change the limits, evicting the least recently used pipelines if needed.
+        """
+        if max_pipelines < 1:
+            raise ValueError("max_pipelines must be positive")
+        with self._lock:
+            self.max_pipelines = max_pipelines
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        """
+        Drop all pipelines and reset the counters.
+        """
+        with self._lock:
+            self._pipelines.clear()
+            self.hits = self.misses = self.loads = self.evictions = 0
+            self.load_seconds = 0.0
+
+    def _bytes(self) -> int:
+        return sum(size for _, size in self._pipelines.values())
+
+    def _evict(self) -> None:
+        while len(self._pipelines) > 1 and (
+            len(self._pipelines) > self.max_pipelines
+            or (self.max_bytes is not None and self._bytes() > self.max_bytes)
+        ):
+            self._pipelines.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the counters, the loaded keys from least to most recently used,
+        their estimated size and the hit rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "load_seconds": self.load_seconds,
+                "pipelines": len(self._pipelines),
+                "max_pipelines": self.max_pipelines,
+                "bytes": self._bytes(),
+                "max_bytes": self.max_bytes,
+                "loaded": [list(key) if isinstance(key, tuple) else key for key in self._pipelines],
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._pipelines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._pipelines
@@ -0,0 +1,345 @@
+import json
+import os
+import re
+import threading
+import warnings
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+######################################################################
+# Built-in quantity engine. Number + unit strings whose units are all in
+# a precomputed table (plain and prefixed units, products, one '/', and
+# exponents written '^n', '**n' or as trailing digits) are parsed here,
+# without pint. The table records how `unit_parse` reads every unit
+# spelling it knows, so the result reads the same; everything else
+# returns None and is left to `unit_parse`.
+
+UNIT_TABLE_PATH = os.path.join(os.path.dirname(__file__), "unit_table.json")
+
+_NUMBER = r"\d+(?:\.\d+)?"
+_TERM = r"([^\W\d_]+)(?:(?:\^|\*\*)(-?\d+)|(\d+))?"
+_PRODUCT = rf"{_TERM}(?:[ *·]{_TERM})*"
+_QUANTITY = re.compile(rf"({_NUMBER})( ?)({_PRODUCT}(?:/{_TERM})?)")
+_TERMS = re.compile(_TERM)
+
+class Quantity:
+    """
+    A parsed quantity with the parts of a pint quantity that the quantity
+    rules use: `magnitude`, `units` (unit name -> exponent, in order of
+    appearance), truthiness and `dimensionless`.
+    """
+    __slots__ = ("magnitude", "units", "dimensions")
+
+    def __init__(self, magnitude: Union[int, float], units: Dict[str, int], dimensions: Dict[str, float]):
+        self.magnitude = magnitude
+        self.units = units
+        self.dimensions = dimensions
+
+    def __bool__(self) -> bool:
+        return bool(self.magnitude)
+
+    @property
+    def dimensionless(self) -> bool:
+        return not self.dimensions
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Quantity) and (self.magnitude, self.units) == (other.magnitude, other.units)
+
+    def __repr__(self) -> str:
+        return f"Quantity({self.magnitude!r}, {self.units!r})"
+
+class UnitEntry(NamedTuple):
+    """
+    How `unit_parse` reads a unit spelling. `spaced` and `joined` are for the
+    spelling alone after a number, with and without a space ('3 km', '3km'):
+    1 if it reads the unit, 0 if it drops it (e.g. '12 V' has no units) and
+    None if neither. `combines` tells whether products with '*' or '·',
+    ratios and powers of the spelling read as the unit.
+    """
+    name: str
+    dimensions: Dict[str, float]
+    spaced: Optional[int]
+    joined: Optional[int]
+    combines: bool
+
+class UnitTable:
+    """
+    Unit spellings (e.g. 'km', 'kilometers', 'μm') -> `UnitEntry`, plus the
+    names and prefixes of the unit index, as saved by `build_unit_table`.
+    """
+    def __init__(self, data: dict):
+        dimensions = [dict(pairs) for pairs in data["dimensions"]]
+        self.units: Dict[str, UnitEntry] = {
+            spelling: UnitEntry(name, dimensions[dimension], spaced, joined, bool(combines))
+            for spelling, (name, dimension, spaced, joined, combines) in data["units"].items()
+        }
+        self.index_units: List[str] = data["index"]["units"]
+        self.index_prefixes: List[str] = data["index"]["prefixes"]
+        self.versions: Dict[str, str] = data.get("versions", {})
+        # Set when the installed pint or unit_parse is not the one the table
+        # was built with; then nothing is parsed from the table.
+        self.stale = False
+
+    @classmethod
+    def load(cls, path: str = UNIT_TABLE_PATH) -> "UnitTable":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def version_mismatches(self) -> Dict[str, Tuple[str, str]]:
+        """
+        Return name -> (recorded, installed) for each package whose installed
+        version differs from the one the table was built with. Packages that
+        are not installed are skipped.
+        """
+        from mathspell.main import package_version
+
+        mismatches = {}
+        for name, recorded in self.versions.items():
+            installed = package_version(name)
+            if installed not in (recorded, "unknown"):
+                mismatches[name] = (recorded, installed)
+        return mismatches
+
+    def disable(self) -> None:
+        """
+        Stop parsing from the table, leaving every quantity to `unit_parse`.
+        """
+        self.units = {}
+        self.stale = True
+
+    def parse(self, string: str) -> Optional[Quantity]:
+        """
+        Parse a number followed by units, e.g. '9.8 m/s^2' or '3km'. Return
+        None if the string has another form or a unit not in the table.
+        """
+        match = _QUANTITY.fullmatch(string)
+        if match is None:
+            return None
+        number, space, expression = match.groups()[:3]
+        numerator, _, denominator = expression.partition("/")
+        terms = [(term, 1) for term in _TERMS.finditer(numerator)]
+        if denominator:
+            terms.append((_TERMS.fullmatch(denominator), -1))
+        # A single unit, read as `unit_parse` reads that spelling alone.
+        if len(terms) == 1 and not any(terms[0][0].groups()[1:]):
+            entry = self.units.get(terms[0][0].group(1))
+            reading = None if entry is None else entry.spaced if space else entry.joined
+            if reading is None:
+                return None
+            magnitude = float(number) if "." in number else int(number)
+            if reading == 0:
+                return Quantity(magnitude, {}, {})
+            return Quantity(magnitude, {entry.name: 1}, dict(entry.dimensions))
+
+        # `unit_parse` changes the case of all-capital strings (e.g. 'MPH/EK')
+        # before reading them, which is only known to work for single units.
+        if expression.isupper():
+            return None
+        # Units between spaces read as they read alone after a space.
+        spaces = " " in expression
+        units: Dict[str, int] = {}
+        dimensions: Dict[str, float] = {}
+        divides = bool(denominator)
+        for term, sign in terms:
+            spelling, power, digits = term.groups()
+            entry = self.units.get(spelling)
+            if entry is None or not entry.combines or (spaces and entry.spaced != 1):
+                return None
+            # `unit_parse` only reads trailing digits as an exponent after ASCII letters.
+            if digits and not spelling.isascii():
+                return None
+            exponent = sign * int(power or digits or 1)
+            # Repeated units would cancel or merge in pint; leave them to it.
+            if entry.name in units or exponent == 0:
+                return None
+            units[entry.name] = exponent
+            divides = divides or exponent < 0
+            for dimension, value in entry.dimensions.items():
+                dimensions[dimension] = dimensions.get(dimension, 0) + value * exponent
+        # pint divides by the units, which turns the magnitude into a float.
+        magnitude = float(number) if "." in number or divides else int(number)
+        return Quantity(magnitude, units, {key: value for key, value in dimensions.items() if value})
+
+_unit_table: Optional[UnitTable] = None
+_unit_table_lock = threading.Lock()
+
+def get_unit_table() -> UnitTable:
+    """
+    Return the precomputed unit table, loading it on first use. If it was
+    built with other versions of pint or unit_parse, this warns and returns
+    the table disabled, since those versions may read units differently.
+    """
+    global _unit_table
+    if _unit_table is None:
+        with _unit_table_lock:
+            if _unit_table is None:
+                table = UnitTable.load()
+                mismatches = table.version_mismatches()
+                if mismatches:
+                    found = ", ".join(
+                        f"{name} {installed} (built with {recorded})" for name, (recorded, installed) in mismatches.items()
+                    )
+                    warnings.warn(
+                        f"The unit table does not match the installed {found}; quantities are left to unit_parse. "
+                        "Rebuild it with `python -m mathspell.helpers.quantities`.",
+                        RuntimeWarning,
+                        stacklevel=2,
+                    )
+                    table.disable()
+                _unit_table = table
+    return _unit_table
+
+def parse_quantity(string: str) -> Optional[Quantity]:
+    """
+    Parse the string with the built-in engine; None means it is left to
+    `unit_parse`.
+    """
+    return get_unit_table().parse(string)
+
+######################################################################
+# Building the table from `unit_parse` (needs pint).
+
+# Units that take SI prefixes in the table, by name.
+PREFIXED_UNITS = (
+    "meter", "gram", "second", "ampere", "kelvin", "mole", "candela", "hertz", "newton",
+    "pascal", "joule", "watt", "coulomb", "volt", "farad", "ohm", "siemens", "weber", "tesla",
+    "henry", "liter", "electron_volt", "watt_hour", "bar", "calorie", "byte", "bit",
+    "becquerel", "gray", "sievert", "lumen", "lux", "tonne",
+)
+SI_PREFIXES = (
+    "atto", "femto", "pico", "nano", "micro", "milli", "centi", "deci",
+    "deca", "hecto", "kilo", "mega", "giga", "tera", "peta", "exa",
+)
+
+def _spellings(registry) -> Iterable[str]:
+    """
+    Every name, symbol and alias of the registry's units, with plurals, and
+    the SI-prefixed forms of `PREFIXED_UNITS`.
+    """
+    for name, definition in registry._units.items():
+        spellings = [name, *definition.aliases]
+        yield from spellings
+        yield from (spelling + "s" for spelling in spellings)
+        if definition.symbol:
+            yield definition.symbol
+    for name in PREFIXED_UNITS:
+        definition = registry._units.get(name)
+        if definition is None:
+            continue
+        # Aliases are names ('litre') or symbols ('L'); the probes drop the
+        # combinations that `unit_parse` does not read.
+        names = [name, *definition.aliases]
+        symbols = [symbol for symbol in (definition.symbol, *definition.aliases) if symbol]
+        for prefix_name in SI_PREFIXES:
+            prefix = registry._prefixes[prefix_name]
+            for unit in names:
+                yield prefix_name + unit
+                yield prefix_name + unit + "s"
+            for prefix_symbol in {prefix.symbol, *prefix.aliases}:
+                if prefix_symbol:
+                    yield from (prefix_symbol + symbol for symbol in symbols)
+
+def _reading(parser, spelling: str, name: str, space: str) -> Optional[int]:
+    """
+    Return 1 if `unit_parse` reads '1<space><spelling>' and '3<space><spelling>'
+    as that number of the unit `name`, 0 if as that number without units, and
+    None otherwise.
+    """
+    readings = set()
+    for magnitude in (1, 3):
+        try:
+            q = parser(f"{magnitude}{space}{spelling}")
+            units = dict(q.units._units)
+            if type(q.magnitude) is not int or q.magnitude != magnitude:
+                return None
+        except Exception:
+            return None
+        if units == {name: 1}:
+            readings.add(1)
+        elif not units:
+            readings.add(0)
+        else:
+            return None
+    return readings.pop() if len(readings) == 1 else None
+
+def _combines(parser, spelling: str, name: str) -> bool:
+    """
+    Check that `unit_parse` reads the spelling as the unit `name` in products
+    with '*' or '·', ratios and powers.
+    """
+    other, other_name = ("g", "gram") if name == "second" else ("s", "second")
+    cases = [
+        (f"3 {spelling}/{other}", {name: 1, other_name: -1}),
+        (f"3{spelling}/{other}", {name: 1, other_name: -1}),
+        (f"3 {other}/{spelling}", {other_name: 1, name: -1}),
+        (f"3 {spelling}^2", {name: 2}),
+        (f"3 {spelling}**-2", {name: -2}),
+        (f"3 {spelling}*{other}", {name: 1, other_name: 1}),
+        (f"3 {other}·{spelling}", {other_name: 1, name: 1}),
+    ]
+    if spelling.isascii():
+        cases.append((f"3 {spelling}3", {name: 3}))
+    for string, expected in cases:
+        try:
+            units = dict(parser(string).units._units)
+        except Exception:
+            return False
+        if list(units.items()) != list(expected.items()):
+            return False
+    return True
+
+def build_unit_table() -> dict:
+    """
+    Probe `unit_parse` with every spelling from `_spellings` of a
+    multiplicative unit and return the table data for those it reads in a
+    known way, with the unit index. This takes a minute or so.
+    """
+    from mathspell.helpers.units import UnitIndex, load_unit_parse
+    from mathspell.main import package_version
+
+    load_unit_parse()
+    from unit_parse import parser
+    from unit_parse.config import u
+
+    dimensions: List[Tuple[Tuple[str, float], ...]] = []
+    positions: Dict[Tuple[Tuple[str, float], ...], int] = {}
+    units = {}
+    for spelling in sorted(set(_spellings(u))):
+        if not _TERMS.fullmatch(spelling):
+            continue
+        try:
+            name = u.get_name(spelling)
+            if not u.Quantity(1, name)._is_multiplicative:
+                continue
+        except Exception:
+            continue
+        entry = (
+            _reading(parser, spelling, name, " "),
+            _reading(parser, spelling, name, ""),
+            int(_combines(parser, spelling, name)),
+        )
+        if entry == (None, None, 0):
+            continue
+        key = tuple(sorted(
+            (dimension, int(value) if value == int(value) else float(value))
+            for dimension, value in u.get_dimensionality(name).items()
+        ))
+        if key not in positions:
+            positions[key] = len(dimensions)
+            dimensions.append(key)
+        units[spelling] = [name, positions[key], *entry]
+
+    index = UnitIndex(u)
+    return {
+        "versions": {name: package_version(name) for name in ("pint", "unit_parse")},
+        "dimensions": [list(map(list, key)) for key in dimensions],
+        "units": units,
+        "index": {"units": sorted(index.units), "prefixes": sorted(index.prefixes)},
+    }
+
+def write_unit_table(path: str = UNIT_TABLE_PATH) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(build_unit_table(), f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+        f.write("\n")
+
+if __name__ == "__main__":
+    write_unit_table()
@@ -0,0 +1,77 @@
+from spacy.language import Language
+from spacy.tokens import Doc, Span
+
+YEAR_RANGE = (1000, 2100)
+
+def token_is_year_candidate(token) -> bool:
+    """
+    Check if a token is a number that `analyze_text` may read as a year,
+    i.e. one whose decision depends on the entity recognizer.
+    """
+    if not token.like_num:
+        return False
+    try:
+        value = float(token.text.replace(',', ''))
+    except ValueError:
+        return False
+    return YEAR_RANGE[0] <= value <= YEAR_RANGE[1]
+
+class SelectiveEntityRecognizer:
+    """
+    Run a (disabled) entity recognizer only over the sentences that contain a
+    year candidate. Tokens of all other sentences are marked as outside any entity.
+    """
+
+    def __init__(self, nlp: Language, ner_name: str):
+        self.nlp = nlp
+        self.ner_name = ner_name
+
+    def _components(self) -> list:
+        ner = self.nlp.get_pipe(self.ner_name)
+        # A recognizer listening to a shared tok2vec/transformer needs it to run first.
+        upstream = [
+            pipe for name, pipe in self.nlp.components
+            if self.ner_name in getattr(pipe, "listening_components", [])
+        ]
+        return upstream + [ner]
+
+    def __call__(self, doc: Doc) -> Doc:
+        sentences = doc.sents if doc.has_annotation("SENT_START") else [doc[:]]
+        entities = []
+        components = None
+        for sent in sentences:
+            if not any(token_is_year_candidate(token) for token in sent):
+                continue
+            if components is None:
+                components = self._components()
+            sent_doc = sent.as_doc()
+            for component in components:
+                sent_doc = component(sent_doc)
+            entities.extend(
+                Span(doc, sent.start + ent.start, sent.start + ent.end, label=ent.label)
+                for ent in sent_doc.ents
+            )
+        doc.set_ents(entities, default="outside")
+        return doc
+
+@Language.factory("mathspell_selective_ner", default_config={"ner_name": "ner"})
+def create_selective_entity_recognizer(nlp: Language, name: str, ner_name: str) -> SelectiveEntityRecognizer:
+    return SelectiveEntityRecognizer(nlp, ner_name)
+
+def enable_selective_ner(nlp: Language, ner_name: str = "ner") -> Language:
+    """
+    Replace the entity recognizer of `nlp` by its selective version. The
+    dependency parser, only needed for sentence boundaries, is swapped for the
+    cheaper sentence recognizer when the pipeline ships one. Entities are
+    then predicted without the context of neighbouring sentences, and may
+    differ from the full pipeline's where that context or a different
+    sentence boundary matters.
+    """
+    if ner_name not in nlp.pipe_names:
+        return nlp
+    if "parser" in nlp.pipe_names and "senter" in nlp.component_names:
+        nlp.disable_pipe("parser")
+        nlp.enable_pipe("senter")
+    nlp.add_pipe("mathspell_selective_ner", config={"ner_name": ner_name}, last=True)
+    nlp.disable_pipe(ner_name)
+    return nlp
@@ -17,6 +17,12 @@ def custom_tokenizer(nlp_model: spacy.language.Language) -> Tokenizer:
     if r"(\()|(\))|(\[)|(\])|(\{)|(\}|\*|%|\^|=|/|\+|-)" not in infix_patterns:
         infix_patterns.append(r"(\()|(\))|(\[)|(\])|(\{)|(\}|\*|%|\^|=|/|\+|-)")
 
+    # 3. a full stop after a number, which some languages (e.g. German) keep
+    #    attached as the mark of an ordinal ('am 3. Mai'); such ordinals are
+    #    not supported and read as a cardinal followed by the full stop
+    if nlp_model.lang != "en" and r"(?<=[0-9])\." not in suffix_patterns:
+        suffix_patterns.append(r"(?<=[0-9])\.")
+
     prefix_regex = spacy.util.compile_prefix_regex(prefix_patterns)
     infix_regex = spacy.util.compile_infix_regex(infix_patterns)
     suffix_regex = spacy.util.compile_suffix_regex(suffix_patterns)
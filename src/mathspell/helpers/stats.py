@@ -0,0 +1,23 @@
+from typing import Dict, Iterable, Sequence
+
+def percentile(values: Iterable[float], q: float) -> float:
+    """
+    Return the `q` quantile (0 <= q <= 1) of the values by the nearest-rank
+    method, or 0.0 when there are none.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def latency_summary(seconds: Sequence[float]) -> Dict[str, float]:
+    """
+    Summarize latencies given in seconds as milliseconds.
+    """
+    return {
+        "mean_ms": 1000 * sum(seconds) / len(seconds) if seconds else 0.0,
+        "p50_ms": 1000 * percentile(seconds, 0.5),
+        "p95_ms": 1000 * percentile(seconds, 0.95),
+        "p99_ms": 1000 * percentile(seconds, 0.99),
+        "max_ms": 1000 * max(seconds, default=0.0),
+    }
@@ -0,0 +1,65 @@
+import random
+from decimal import Decimal
+import pytest
+from num2words import num2words
+from .number_words import MAX_CARDINAL, number_to_words, spell_number
+
+def assert_parity(numbers, to="cardinal"):
+    mismatches = []
+    for number in numbers:
+        native, reference = spell_number(number, to), num2words(number, to=to)
+        if native != reference:
+            mismatches.append((number, native, reference))
+    assert mismatches == []
+
+
+def test_cardinal_parity_for_integers():
+    rng = random.Random(0)
+    numbers = list(range(-1000, 100001))
+    numbers += [sign * 10 ** k + delta for k in range(5, 306, 3) for delta in (-1, 0, 7) for sign in (1, -1)]
+    numbers += [rng.randrange(10 ** rng.randrange(5, 40)) for _ in range(2000)]
+    assert_parity([n for n in numbers if abs(n) < MAX_CARDINAL])
+
+
+def test_cardinal_parity_for_floats():
+    rng = random.Random(1)
+    numbers = [k / 100 for k in range(-20000, 20000)]
+    numbers += [k / 1000 for k in range(0, 100000, 7)]
+    numbers += [float(k) for k in range(-5000, 5000)]
+    numbers += [round(rng.uniform(-1e6, 1e6), rng.randrange(1, 12)) for _ in range(3000)]
+    numbers += [rng.uniform(0, 1) for _ in range(2000)]
+    numbers += [1e-05, 1.5e-07, 2.5e15, -0.0, 2.0 ** 52]
+    assert_parity(numbers)
+
+
+def test_ordinal_and_year_parity():
+    assert_parity(list(range(0, 20001)) + [10 ** k for k in range(5, 60)], to="ordinal")
+    assert_parity(list(range(-3000, 15001)), to="year")
+
+
+def test_declined_values_fall_back_to_num2words():
+    assert spell_number(-1, to="ordinal") is None
+    assert spell_number(2.5, to="ordinal") is None
+    assert spell_number(float("inf")) is None
+    assert spell_number(2.0 ** 60) is None
+    assert spell_number(MAX_CARDINAL) is None
+    assert number_to_words(2.0 ** 60) == num2words(2.0 ** 60)
+    assert number_to_words(True) == num2words(True)
+    with pytest.raises(OverflowError):
+        number_to_words(MAX_CARDINAL)
+
+
+def test_decimals_are_spelled_from_their_digits():
+    assert spell_number(Decimal("3.14159265358979323846")) == (
+        "three point one four one five nine two six five three five eight nine seven nine three two three eight four six"
+    )
+    assert spell_number(Decimal(10 ** 40 + 1)) == num2words(10 ** 40 + 1)
+    for text in ("1.10", "2.50", "-0.5", "0.05", "12.3400"):
+        assert spell_number(Decimal(text)) == num2words(Decimal(text))
+
+def test_decimals_are_cached_by_their_digits():
+    assert number_to_words(Decimal("1.10")) == number_to_words(Decimal("1.1")) == "one point one"
+    assert number_to_words(Decimal("0.12345678901234567891")) == (
+        "zero point one two three four five six seven eight nine zero one two three four five six seven eight nine one"
+    )
+    assert number_to_words(Decimal("0.1234567890123456789")).endswith("eight nine")
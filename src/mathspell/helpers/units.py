@@ -0,0 +1,106 @@
+import re
+import threading
+from typing import Iterable, Optional
+
+# Strings made only of these characters are decided by the unit index alone;
+# anything else (symbols, '/', '^', '_', non-ASCII letters) is left to `unit_parse`.
+_PLAIN = re.compile(r"[A-Za-z0-9\s.,+\-]*")
+_WORD = re.compile(r"([A-Za-z]+)[A-Za-z0-9]*")
+_DIGIT = re.compile(r"\d")
+# Numbers, spaces and arithmetic; a string made only of these is no quantity.
+_NUMERIC = re.compile(r"[\d\s.,+\-*/^()\[\]{}=<>×÷−]+")
+# Unit symbols that are not letters.
+_UNIT_SYMBOLS = set("°%‰′″'\"")
+
+class UnitIndex:
+    """
+    Lower-cased unit names, symbols and aliases (singular and plural) and unit
+    prefixes of a pint registry. Lookups are case-insensitive so that they
+    accept everything `unit_parse` accepts after its own case handling.
+    """
+
+    def __init__(self, registry):
+        suffixes = [suffix.lower() for suffix in registry._suffixes]
+        self.units = frozenset(
+            name.lower() + suffix for name in registry._units for suffix in suffixes
+        )
+        self.prefixes = frozenset(prefix.lower() for prefix in registry._prefixes)
+        self.prefix_lengths = sorted({len(prefix) for prefix in self.prefixes})
+
+    @classmethod
+    def from_names(cls, units: Iterable[str], prefixes: Iterable[str]) -> "UnitIndex":
+        """
+        Rebuild an index from its `units` and `prefixes`, e.g. as saved in
+        the unit table or a bundle, without the registry.
+        """
+        index = cls.__new__(cls)
+        index.units = frozenset(units)
+        index.prefixes = frozenset(prefixes)
+        index.prefix_lengths = sorted({len(prefix) for prefix in index.prefixes})
+        return index
+
+    def is_unit(self, word: str) -> bool:
+        """
+        Check if a word is a unit, optionally prefixed (e.g. 'km', 'kilometers').
+        """
+        word = word.lower()
+        for length in self.prefix_lengths:
+            if length >= len(word):
+                break
+            if word[:length] in self.prefixes and word[length:] in self.units:
+                return True
+        return False
+
+    def could_be_quantity(self, string: str) -> bool:
+        """
+        Cheap test run before `unit_parse`: False means the string cannot parse
+        into a measurable quantity, True means the parser has to decide.
+        """
+        if not _DIGIT.search(string):
+            return False
+        if not _PLAIN.fullmatch(string):
+            rest = _NUMERIC.sub("", string)
+            return any(char.isalpha() or char in _UNIT_SYMBOLS for char in rest)
+        # Try both whole words ('cmH2O', 'ln10') and their leading letters ('m2' -> 'm').
+        return any(
+            self.is_unit(match.group(0)) or self.is_unit(match.group(1))
+            for match in _WORD.finditer(string)
+        )
+
+_unit_index: Optional[UnitIndex] = None
+_unit_index_lock = threading.Lock()
+
+def load_unit_parse() -> None:
+    """
+    Import `unit_parse`, which builds its pint registry on import.
+    """
+    import unit_parse
+
+def set_unit_index(index: UnitIndex) -> None:
+    """
+    Use a prebuilt index unless one has been built already.
+    """
+    global _unit_index
+    with _unit_index_lock:
+        if _unit_index is None:
+            _unit_index = index
+
+def get_unit_index() -> UnitIndex:
+    """
+    Return the index of the unit registry used by `unit_parse`, as saved in
+    the precomputed unit table, loading it on first use. If the table does
+    not match the installed pint, the index is built from the registry.
+    """
+    global _unit_index
+    if _unit_index is None:
+        with _unit_index_lock:
+            if _unit_index is None:
+                from mathspell.helpers.quantities import get_unit_table
+                table = get_unit_table()
+                if table.stale:
+                    load_unit_parse()
+                    from unit_parse.config import u
+                    _unit_index = UnitIndex(u)
+                else:
+                    _unit_index = UnitIndex.from_names(table.index_units, table.index_prefixes)
+    return _unit_index
@@ -0,0 +1,113 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from mathspell.helpers.chunking import split_segments
+from mathspell.main import Normalizer, TokenJoiner, get_default_normalizer, preprocess_text, transform_tokens
+
+class SegmentResult(NamedTuple):
+    """
+    Transformation of one segment, joined but not stripped, and whether its
+    last piece is whitespace (then the next segment follows without a space).
+    """
+    text: str
+    ends_with_space: bool
+
+def segment_doc(doc, start: int, end: int):
+    """
+    The tokens of `doc` that start within characters [start, end), as a `Doc`
+    keeping their annotations.
+    """
+    first = next((token.i for token in doc if token.idx >= start), len(doc))
+    last = next((token.i for token in doc[first:] if token.idx >= end), len(doc))
+    return doc[first:last].as_doc()
+
+def transform_segment(doc) -> SegmentResult:
+    pieces = transform_tokens(doc)
+    joiner = TokenJoiner(strip=False)
+    text = joiner.feed(pieces) + joiner.close()
+    return SegmentResult(text, bool(pieces) and pieces[-1].isspace())
+
+def join_segments(results: List[SegmentResult]) -> str:
+    """
+    Join segment transformations into the output `analyze_text` gives for
+    the whole text. Segments start with a letter, so the only thing decided
+    across a boundary is the space in front of the next segment.
+    """
+    parts = []
+    for k, result in enumerate(results):
+        if k and not results[k - 1].ends_with_space:
+            parts.append(" ")
+        parts.append(result.text)
+    return "".join(parts).strip()
+
+class IncrementalDocument:
+    """
+    A document that is normalized again after every edit, redoing only the
+    sentences that changed and their neighbours.
+
+    The text is split at the paragraph and sentence boundaries that no rule
+    reads across (see `helpers.chunking`). Each segment is parsed together
+    with the segments before and after it, so that the model sees it in
+    context, and only its own tokens are transformed. Results are kept for
+    the segments of the current text, keyed by the segment and its
+    neighbours; an update parses only the segments whose window changed, in
+    one batch, and joins the rest from the cache. The output is the same as
+    `analyze_text` on the whole text as long as the model decides each
+    sentence from that window, which always holds for `engine="rules"`.
+    """
+    def __init__(self, text: str = "", normalizer: Optional[Normalizer] = None, batch_size: int = 64):
+        self.normalizer = normalizer
+        self.batch_size = batch_size
+        self.text = ""
+        self.output = ""
+        self.reused = 0
+        self.computed = 0
+        self._results: Dict[Tuple[str, str, str], SegmentResult] = {}
+        self.update(text)
+
+    def update(self, text: str) -> str:
+        """
+        Replace the whole text and return the new output.
+        """
+        segments = split_segments(text)
+        windows = [
+            (segments[k - 1] if k else "", segment, segments[k + 1] if k + 1 < len(segments) else "")
+            for k, segment in enumerate(segments)
+        ]
+        results = {}
+        missing = []
+        for window in windows:
+            if window in results:
+                continue
+            cached = self._results.get(window)
+            if cached is None:
+                results[window] = None
+                missing.append(window)
+            else:
+                results[window] = cached
+
+        # Segments are preprocessed on their own: no date or time pattern
+        # crosses a segment boundary.
+        preprocessed = {}
+        for window in missing:
+            for segment in window:
+                if segment not in preprocessed:
+                    preprocessed[segment] = preprocess_text(segment)
+        normalizer = self.normalizer or get_default_normalizer()
+        contexts = ["".join(preprocessed[segment] for segment in window) for window in missing]
+        docs = normalizer.parse_texts(contexts, self.batch_size)
+        for window, doc in zip(missing, docs):
+            before, segment, _ = window
+            start = len(preprocessed[before])
+            results[window] = transform_segment(segment_doc(doc, start, start + len(preprocessed[segment])))
+
+        self._results = results
+        self.reused = len(windows) - len(missing)
+        self.computed = len(missing)
+        self.text = text
+        self.output = join_segments([results[window] for window in windows])
+        return self.output
+
+    def edit(self, start: int, end: int, replacement: str) -> str:
+        """
+        Replace `text[start:end]` with `replacement` and return the new output.
+        """
+        return self.update(self.text[:start] + replacement + self.text[end:])
@@ -0,0 +1,295 @@
+import functools
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from mathspell import incremental, main
+from mathspell.helpers import cases
+from mathspell.helpers.cache import ResultCache
+from mathspell.helpers.number_words import NUMBER_WORDS_CACHE
+
+class CallStats:
+    """
+    What one call (`analyze_text`, a batch of `analyze_texts`, `analyze_edits`,
+    `analyze_stream` or an `IncrementalDocument` update) did: how often each
+    rule fired, and the calls and seconds spent per stage and per helper.
+    """
+    def __init__(self, name: str, texts: int = 1):
+        self.name = name
+        self.texts = texts
+        self.seconds = 0.0
+        self.rules = Counter()
+        self.stages: Dict[str, List[float]] = {}
+        self.helpers: Dict[str, List[float]] = {}
+
+    def as_dict(self) -> dict:
+        return {
+            "call": self.name,
+            "texts": self.texts,
+            "seconds": self.seconds,
+            "rules": dict(self.rules),
+            "stages": _timings(self.stages),
+            "helpers": _timings(self.helpers),
+        }
+
+def _timings(table: Dict[str, List[float]]) -> Dict[str, dict]:
+    return {name: {"calls": int(calls), "seconds": seconds} for name, (calls, seconds) in table.items()}
+
+def _add(table: Dict[str, List[float]], name: str, calls: float, seconds: float) -> None:
+    entry = table.get(name)
+    if entry is None:
+        table[name] = [calls, seconds]
+    else:
+        entry[0] += calls
+        entry[1] += seconds
+
+# Stages of the pipeline, timed where mathspell hands over to them.
+_STAGES = [
+    ("preprocess", main, "preprocess_text"),
+    ("preprocess", main, "time_pattern_edits"),
+    ("rules", main, "transform_tokens"),
+    ("rules", incremental, "transform_tokens"),
+    ("join", main.TokenJoiner, "feed"),
+    ("join", main.TokenJoiner, "close"),
+    ("result_cache", ResultCache, "get_many"),
+    ("result_cache", ResultCache, "put_many"),
+]
+# Libraries behind the rules: the built-in quantity engine, the unit_parse
+# fallback and the number speller (which falls back to num2words).
+_LIBRARIES = [
+    ("quantity_engine", cases, "parse_quantity"),
+    ("unit_parse", cases, "unit_parse_quantity"),
+    ("number_to_words", cases, "number_to_words"),
+]
+# Public entry points, each recorded as one call, with the number of texts.
+_CALLS = [
+    ("analyze_text", main.Normalizer, "analyze_text", lambda args: 1),
+    ("analyze_texts", main.Normalizer, "_analyze_batch", lambda args: len(args[1])),
+    ("analyze_edits", main.Normalizer, "analyze_edits", lambda args: 1),
+    ("incremental_update", incremental.IncrementalDocument, "update", lambda args: 1),
+]
+
+class Instrumentation:
+    """
+    Counters and timers for the calls made while recording: calls and texts
+    per entry point, how often each rule of `transform_token` fired, the
+    time spent per stage (preprocessing regexes, spaCy, rules, reassembly,
+    result cache) and in each helper of `helpers/cases.py` the rules call
+    (inclusive of the helpers it calls in turn), and the hit rates of the
+    quantity and number-word caches since recording started.
+
+    Each call is gathered in a `CallStats` of its own thread and merged when
+    it ends; `callback`, if given, then receives it. Calls in other
+    processes, e.g. `analyze_parallel` workers, are not recorded.
+    """
+    def __init__(self, callback: Optional[Callable[[CallStats], None]] = None):
+        self.callback = callback
+        self.calls = Counter()
+        self.texts = 0
+        self.seconds = 0.0
+        self.rules = Counter()
+        self.stages: Dict[str, List[float]] = {}
+        self.helpers: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._caches = {"quantities": cases.QUANTITY_CACHE, "number_words": NUMBER_WORDS_CACHE}
+        self._baseline = self._cache_counters()
+        self._patches: List[Tuple[object, str, object]] = []
+
+    def rule_counts(self) -> Counter:
+        """
+        The rule counters of the current call on this thread.
+        """
+        return self._current().rules
+
+    @contextmanager
+    def call(self, name: str, texts: int = 1) -> Iterator[None]:
+        """
+        Record everything done inside as one call, unless it is part of an
+        enclosing call.
+        """
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if depth == 0:
+            local.call = CallStats(name, texts)
+        local.depth = depth + 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            local.depth = depth
+            if depth == 0:
+                call, local.call = local.call, None
+                call.seconds = time.perf_counter() - started
+                self._finish(call)
+
+    def snapshot(self) -> dict:
+        """
+        Return the aggregated counters and timings, with seconds per stage
+        and helper, as plain data.
+        """
+        counters = self._cache_counters()
+        caches = {}
+        for name, (hits, misses) in counters.items():
+            hits -= self._baseline[name][0]
+            misses -= self._baseline[name][1]
+            caches[name] = {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses) if hits + misses else 0.0}
+        cache = main.get_default_normalizer().cache
+        if cache is not None:
+            stats = cache.stats()
+            caches["results"] = {name: stats[name] for name in ("hits", "misses", "hit_rate")}
+        with self._lock:
+            return {
+                "calls": dict(self.calls),
+                "texts": self.texts,
+                "seconds": self.seconds,
+                "rules": dict(self.rules.most_common()),
+                "stages": _timings(self.stages),
+                "helpers": _timings(self.helpers),
+                "caches": caches,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.texts = 0
+            self.seconds = 0.0
+            self.rules.clear()
+            self.stages.clear()
+            self.helpers.clear()
+            self._baseline = self._cache_counters()
+
+    def _current(self) -> CallStats:
+        # Work outside the public entry points goes to a record that is dropped.
+        return getattr(self._local, "call", None) or CallStats("")
+
+    def _finish(self, call: CallStats) -> None:
+        with self._lock:
+            self.calls[call.name] += 1
+            self.texts += call.texts
+            self.seconds += call.seconds
+            self.rules.update(call.rules)
+            for name, (calls, seconds) in call.stages.items():
+                _add(self.stages, name, calls, seconds)
+            for name, (calls, seconds) in call.helpers.items():
+                _add(self.helpers, name, calls, seconds)
+        if self.callback is not None:
+            self.callback(call)
+
+    def _cache_counters(self) -> Dict[str, Tuple[int, int]]:
+        return {name: (cache.hits, cache.misses) for name, cache in self._caches.items()}
+
+    def _timed(self, kind: str, name: str, function: Callable) -> Callable:
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                _add(getattr(self._current(), kind), name, 1, time.perf_counter() - started)
+        return timed
+
+    def _timed_parse(self, method: Callable) -> Callable:
+        # `parse_texts` is lazy, so the time is spent while taking each doc.
+        @functools.wraps(method)
+        def parse_texts(*args, **kwargs):
+            docs = iter(method(*args, **kwargs))
+            while True:
+                started = time.perf_counter()
+                doc = next(docs, None)
+                _add(self._current().stages, "parse", 1 if doc is not None else 0, time.perf_counter() - started)
+                if doc is None:
+                    return
+                yield doc
+        return parse_texts
+
+    def _recorded(self, name: str, method: Callable, texts: Callable) -> Callable:
+        @functools.wraps(method)
+        def recorded(*args, **kwargs):
+            with self.call(name, texts(args)):
+                return method(*args, **kwargs)
+        return recorded
+
+    def _recorded_stream(self, method: Callable) -> Callable:
+        @functools.wraps(method)
+        def analyze_stream(*args, **kwargs):
+            with self.call("analyze_stream"):
+                yield from method(*args, **kwargs)
+        return analyze_stream
+
+    def _install(self) -> None:
+        patches = []
+        for name, owner, attribute, texts in _CALLS:
+            patches.append((owner, attribute, self._recorded(name, getattr(owner, attribute), texts)))
+        patches.append((main.Normalizer, "analyze_stream", self._recorded_stream(main.Normalizer.analyze_stream)))
+        patches.append((main.Normalizer, "parse_texts", self._timed_parse(main.Normalizer.parse_texts)))
+        for name, owner, attribute in _STAGES:
+            patches.append((owner, attribute, self._timed("stages", name, getattr(owner, attribute))))
+        for name, owner, attribute in _LIBRARIES:
+            patches.append((owner, attribute, self._timed("helpers", name, getattr(owner, attribute))))
+        stages = {attribute for _, owner, attribute in _STAGES if owner is main}
+        for attribute, function in vars(main).items():
+            if callable(function) and getattr(function, "__module__", None) == cases.__name__ and attribute not in stages:
+                patches.append((main, attribute, self._timed("helpers", attribute, function)))
+
+        for owner, attribute, wrapper in patches:
+            self._patches.append((owner, attribute, vars(owner)[attribute]))
+            setattr(owner, attribute, wrapper)
+        main._recorder = self
+
+    def _uninstall(self) -> None:
+        main._recorder = None
+        for owner, attribute, original in reversed(self._patches):
+            setattr(owner, attribute, original)
+        self._patches = []
+
+_active: Optional[Instrumentation] = None
+_active_lock = threading.Lock()
+
+def enable(callback: Optional[Callable[[CallStats], None]] = None) -> Instrumentation:
+    """
+    Start recording, replacing any recording in progress, and return the
+    `Instrumentation` that collects the stats. Until then, and after
+    `disable`, nothing is wrapped or counted.
+    """
+    global _active
+    with _active_lock:
+        if _active is not None:
+            _active._uninstall()
+        _active = Instrumentation(callback)
+        _active._install()
+        return _active
+
+def disable() -> Optional[Instrumentation]:
+    """
+    Stop recording and return the finished `Instrumentation`, if any.
+    """
+    global _active
+    with _active_lock:
+        instrumentation, _active = _active, None
+        if instrumentation is not None:
+            instrumentation._uninstall()
+        return instrumentation
+
+def get_instrumentation() -> Optional[Instrumentation]:
+    return _active
+
+@contextmanager
+def instrument(callback: Optional[Callable[[CallStats], None]] = None) -> Iterator[Instrumentation]:
+    """
+    Record the calls made inside the block:
+
+        with instrument() as stats:
+            analyze_texts(texts)
+        print(stats.snapshot())
+    """
+    global _active
+    instrumentation = enable(callback)
+    try:
+        yield instrumentation
+    finally:
+        with _active_lock:
+            if _active is instrumentation:
+                _active = None
+                instrumentation._uninstall()
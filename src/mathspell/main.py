@@ -1,10 +1,482 @@
-import spacy
+import json
+import os
+import re
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from mathspell.helpers import constants as c 
-from mathspell.helpers.spacy_tokenizer import custom_tokenizer
-from mathspell.helpers.cases import * # TODO: change this, this is a bad practice
+from mathspell.helpers.cases import (
+    convert_exponential_notation_string,
+    convert_number_to_words,
+    convert_ordinal_string,
+    handle_percentage,
+    interpret_currency,
+    interpret_large_scale,
+    is_illion_scale,
+    looks_like_year_context,
+    measurable_quantity,
+    operator_quantity_to_words,
+    process_time_patterns_ahead_of_tokenization,
+    time_pattern_edits,
+    quantity_to_words,
+    token_has_exponential_notation,
+    token_is_compound_number_hyphen,
+    token_is_currency,
+    token_is_ordinal,
+    token_looks_like_fraction,
+)
+from mathspell.helpers.cache import ResultCache
+from mathspell.helpers.chunking import Source, iter_chunks
+from mathspell.helpers.edits import Edit, Normalization, alignment_map, apply_edits, compose_edits, space_edits
+from mathspell.helpers.languages import (
+    current_language,
+    current_table,
+    currency_words,
+    foreign_language,
+    get_language_table,
+    number_value,
+    use_language,
+)
+from mathspell.helpers.number_words import precompute_number_words
+from mathspell.helpers.pool import PipelinePool
+from mathspell.helpers.quantities import get_unit_table
+from mathspell.helpers.units import get_unit_index
 
-nlp = spacy.load("en_core_web_sm")
-nlp.tokenizer = custom_tokenizer(nlp)
+DEFAULT_MODEL = "en_core_web_sm"
+ENGINES = ("model", "rules")
+
+def load_pipeline(model: str = DEFAULT_MODEL, disable: Iterable[str] = (), selective_ner: bool = False):
+    """
+    Load a spaCy pipeline by package name or path and attach the custom tokenizer.
+    `disable` lists pipeline components that should not be run. With
+    `selective_ner`, the entity recognizer only runs over sentences holding a
+    number that could be read as a year. A bundle directory (see
+    `mathspell.bundle`) is loaded as built, with its tables.
+    """
+    import spacy
+    from mathspell.bundle import is_bundle, load_bundle
+    from mathspell.helpers.spacy_tokenizer import custom_tokenizer
+
+    if is_bundle(model):
+        return load_bundle(model, disable, selective_ner)
+
+    nlp = spacy.load(model, disable=list(disable))
+    nlp.tokenizer = custom_tokenizer(nlp)
+    if selective_ner:
+        from mathspell.helpers.selective_ner import enable_selective_ner
+        enable_selective_ner(nlp)
+    return nlp
+
+def package_version(name: str) -> str:
+    """
+    Return the installed version of a distribution, or "unknown".
+    """
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version(name)
+    except (PackageNotFoundError, ValueError):
+        return "unknown"
+
+_rules_fingerprint: Optional[str] = None
+
+def rules_fingerprint() -> str:
+    """
+    Return a hash of the sources and tables of mathspell's rules. Unlike the
+    package version, it changes with every edit to the rules, including in a
+    development checkout, where the version is "unknown".
+    """
+    global _rules_fingerprint
+    if _rules_fingerprint is None:
+        import hashlib
+
+        root = os.path.dirname(os.path.abspath(__file__))
+        digest = hashlib.blake2b(digest_size=8)
+        for folder in (root, os.path.join(root, "helpers")):
+            for name in sorted(os.listdir(folder)):
+                if name.startswith("test_") or not name.endswith((".py", ".json")):
+                    continue
+                digest.update(name.encode("utf-8") + b"\0")
+                with open(os.path.join(folder, name), "rb") as f:
+                    digest.update(f.read())
+        _rules_fingerprint = digest.hexdigest()
+    return _rules_fingerprint
+
+def model_version(model: str) -> str:
+    """
+    Return the version of a spaCy model given by package name or path, without
+    loading it.
+    """
+    from mathspell.bundle import is_bundle, read_bundle_meta
+
+    if is_bundle(model):
+        meta = read_bundle_meta(model)
+        return f"bundle:{meta['model']}-{meta['model_version']}"
+    meta = os.path.join(model, "meta.json")
+    if os.path.isfile(meta):
+        with open(meta, encoding="utf-8") as f:
+            data = json.load(f)
+        return f"{data.get('name', '')}-{data.get('version', 'unknown')}"
+    return package_version(model)
+
+class Normalizer:
+    """
+    Converts text to its spoken form with its own spaCy pipeline and options:
+    the model (name or path), disabled components, NER mode and whether the
+    fast path only sends the sentences holding numbers through the
+    statistical components. Several normalizers with different options can
+    live side by side.
+
+    With `engine="rules"`, no model is loaded: a blank pipeline with the
+    custom tokenizer sets the few annotations the rules read (possessive
+    tags, scale and currency lemmas, years) by heuristics, see
+    `mathspell.helpers.heuristics`. It is much faster and may decide those
+    cases differently from the model; `model`, `disable`, `selective_ner`
+    and `fast_path` only apply to the model engine.
+
+    Numbers, currencies, percentages and operators are spoken in the
+    language of the pipeline (see `mathspell.helpers.languages`).
+    `language` picks the default model of a supported language when
+    `model` is not given, and the blank pipeline of the rules engine.
+
+    The pipeline is loaded on first use (or by `warmup`) and dropped by
+    `close`, or when leaving a `with` block. With a `pool` (a
+    `PipelinePool`), the pipeline is kept there instead and may be
+    evicted, and loaded again, when the pool is full.
+
+    With a `cache` (a `ResultCache` or the path of its SQLite file), results
+    are looked up before parsing and stored after, under the versions of
+    mathspell, spaCy, num2words and the model and the options above; texts that all hit
+    never load the pipeline.
+
+    A normalizer can be shared by threads, e.g. from a `ThreadPoolExecutor`:
+    the pipeline is loaded once under a lock, every call works on its own
+    `Doc`, spaCy only reads the model weights during inference and updates
+    its vocabulary and tokenizer cache while holding the GIL, and the caches
+    of parsed quantities and number words are lock-protected and keyed by
+    their input alone, so they are shared by all normalizers. Concurrent
+    calls return the same results as serial ones.
+    """
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        disable: Iterable[str] = (),
+        selective_ner: bool = False,
+        fast_path: bool = False,
+        nlp=None,
+        cache: Union[ResultCache, str, None] = None,
+        engine: str = "model",
+        language: str = "en",
+        pool: Optional[PipelinePool] = None,
+    ):
+        if engine not in ENGINES:
+            raise ValueError(f"unknown engine {engine!r}, expected one of: {', '.join(ENGINES)}")
+        self.model = get_language_table(language).model if model is None else model
+        self.language = language
+        self.pool = pool
+        self.disable = tuple(disable)
+        self.selective_ner = selective_ner
+        self.fast_path = fast_path
+        self.engine = engine
+        self.cache = ResultCache(cache) if isinstance(cache, (str, os.PathLike)) else cache
+        self._nlp = nlp
+        self._lock = threading.Lock()
+        self._namespace = None
+
+    @property
+    def config(self) -> dict:
+        """
+        The options of this normalizer, as keyword arguments.
+        """
+        return {
+            "model": self.model,
+            "disable": self.disable,
+            "selective_ner": self.selective_ner,
+            "fast_path": self.fast_path,
+            "cache": self.cache,
+            "engine": self.engine,
+            "language": self.language,
+        }
+
+    @property
+    def cache_namespace(self) -> str:
+        """
+        What cached results depend on besides the text: the rules (see
+        `rules_fingerprint`), library and model versions (num2words spells the
+        numbers) and the options of this normalizer.
+        """
+        if self._namespace is None and self.engine == "rules":
+            self._namespace = "|".join([
+                f"mathspell-{package_version('mathspell')}-{rules_fingerprint()}",
+                f"spacy-{package_version('spacy')}",
+                f"num2words-{package_version('num2words')}",
+                "engine=rules",
+                f"language={self.language}",
+            ])
+        if self._namespace is None:
+            self._namespace = "|".join([
+                f"mathspell-{package_version('mathspell')}-{rules_fingerprint()}",
+                f"spacy-{package_version('spacy')}",
+                f"num2words-{package_version('num2words')}",
+                f"{self.model}-{model_version(self.model)}",
+                f"language={self.language}",
+                ",".join(sorted(self.disable)),
+                f"selective_ner={self.selective_ner}",
+                f"fast_path={self.fast_path}",
+            ])
+        return self._namespace
+
+    @property
+    def pipeline_key(self) -> tuple:
+        """
+        What the pipeline depends on, its key in a `PipelinePool`.
+        """
+        if self.engine == "rules":
+            return ("rules", self.language)
+        return ("model", self.model, self.disable, self.selective_ner)
+
+    def load_pipeline(self):
+        """
+        Load a new pipeline for this normalizer's options.
+        """
+        if self.engine == "rules":
+            from mathspell.helpers.heuristics import load_rules_pipeline
+            return load_rules_pipeline(self.language)
+        return load_pipeline(self.model, self.disable, self.selective_ner)
+
+    @property
+    def nlp(self):
+        """
+        The pipeline, loaded on first use.
+        """
+        if self._nlp is None and self.pool is not None:
+            return self.pool.get(self.pipeline_key, self.load_pipeline)
+        if self._nlp is None:
+            with self._lock:
+                if self._nlp is None:
+                    self._nlp = self.load_pipeline()
+        return self._nlp
+
+    def warmup(self) -> None:
+        """
+        Load the pipeline, the unit table and index and the number-word
+        tables ahead of the first call. `unit_parse` (and pint) are only
+        loaded once a quantity needs them.
+        """
+        self.nlp
+        get_unit_table()
+        get_unit_index()
+        precompute_number_words()
+
+    def close(self) -> None:
+        """
+        Drop the pipeline; it is loaded again if the normalizer is used later.
+        """
+        with self._lock:
+            self._nlp = None
+        if self.pool is not None:
+            self.pool.discard(self.pipeline_key)
+
+    def __enter__(self) -> "Normalizer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def parse_texts(self, texts: Iterable[str], batch_size: int = 256) -> Iterator:
+        """
+        Run preprocessed texts through the pipeline, yielding one `Doc` per text.
+        With the fast path, the statistical components only see the sentences
+        that `analyze_text` needs them for. The rules engine is cheap enough
+        to run over every token.
+        """
+        if self.fast_path and self.engine == "model":
+            from mathspell.helpers.fast_path import parse_selectively
+            return parse_selectively(self.nlp, texts, batch_size)
+        return self.nlp.pipe(texts, batch_size=batch_size)
+
+    def analyze_text(self, text: str) -> str:
+        """
+        Parse the text with SpaCy, interpret tokens (numbers, dates, currencies,
+        units, etc.), and output a 'spoken' transformation.
+        """
+        if self.cache is not None:
+            return self._analyze_batch([text], 1)[0]
+        return transform_doc(next(self.parse_texts([preprocess_text(text)], batch_size=1)))
+
+    def analyze_texts(self, texts: Iterable[str], batch_size: int = 256) -> Iterator[str]:
+        """
+        Batch version of `analyze_text`: stream texts through `nlp.pipe` and
+        yield their transformations in input order.
+        """
+        batch = []
+        for text in texts:
+            batch.append(text)
+            if len(batch) >= batch_size:
+                yield from self._analyze_batch(batch, batch_size)
+                batch = []
+        if batch:
+            yield from self._analyze_batch(batch, batch_size)
+
+    def _analyze_batch(self, texts: List[str], batch_size: int) -> List[str]:
+        """
+        Analyze each distinct text of a batch once, shortest first so that
+        `nlp.pipe` groups texts of similar length, and map results back.
+        Only texts missing from the cache, if any, are parsed.
+        """
+        unique = sorted(dict.fromkeys(texts), key=len)
+        results = {}
+        if self.cache is not None:
+            results = self.cache.get_many(self.cache_namespace, unique)
+            unique = [text for text in unique if text not in results]
+        if unique:
+            docs = self.parse_texts([preprocess_text(text) for text in unique], batch_size)
+            computed = {text: transform_doc(doc) for text, doc in zip(unique, docs)}
+            if self.cache is not None:
+                self.cache.put_many(self.cache_namespace, computed)
+            results.update(computed)
+        return [results[text] for text in texts]
+
+    def analyze_stream(self, source: Source, chunk_size: int = 100_000) -> Iterator[str]:
+        """
+        Analyze a long document held in a string, a file-like object or an
+        iterable of strings (e.g. an open file), yielding the transformation
+        piece by piece. The input is cut into chunks of about `chunk_size`
+        characters at paragraph and sentence boundaries, so memory stays
+        bounded and the joined pieces equal `analyze_text` of the whole document.
+        """
+        joiner = TokenJoiner()
+        for chunk in iter_chunks(source, chunk_size):
+            doc = next(self.parse_texts([preprocess_text(chunk)], batch_size=1))
+            text = joiner.feed(transform_tokens(doc))
+            if text:
+                yield text
+        text = joiner.close()
+        if text:
+            yield text
+
+    def analyze_edits(self, text: str, alignment: bool = False) -> Normalization:
+        """
+        Offset-preserving version of `analyze_text`: return the spoken form
+        built by replacing only the spans that change and copying the rest of
+        the input (whitespace included) as is, the edits as (start, end,
+        replacement) spans of the input and, with `alignment`, the input
+        offset of every output character.
+        """
+        time_edits = time_pattern_edits(text)
+        preprocessed = apply_edits(text, time_edits)
+        doc = next(self.parse_texts([preprocessed], batch_size=1))
+        token_edits = transform_edits(doc)
+        output = apply_edits(preprocessed, token_edits)
+        edits = compose_edits(text, time_edits, token_edits, output)
+        return Normalization(output, edits, alignment_map(edits, len(text)) if alignment else None)
+
+# Pipelines of the module-level functions, for all languages and engines.
+_pool = PipelinePool(max_pipelines=4)
+_default = Normalizer(pool=_pool)
+_default_lock = threading.Lock()
+# Normalizers with the default's options and another engine or language,
+# for per-call `engine` and `language`.
+_other_normalizers: Dict[Tuple[str, str], Normalizer] = {}
+
+def get_default_normalizer(engine: Optional[str] = None, language: Optional[str] = None) -> Normalizer:
+    """
+    Return the normalizer behind the module-level functions or, given an
+    `engine` or `language` other than its own, one with the same options
+    and those. Another language uses its default model.
+    """
+    default = _default
+    key = (engine or default.engine, language or default.language)
+    if key == (default.engine, default.language):
+        return default
+    normalizer = _other_normalizers.get(key)
+    if normalizer is None:
+        with _default_lock:
+            normalizer = _other_normalizers.get(key)
+            if normalizer is None:
+                engine, language = key
+                model = default.model if language == default.language else None
+                config = {**default.config, "model": model, "engine": engine, "language": language}
+                normalizer = Normalizer(**config, pool=_pool)
+                _other_normalizers[key] = normalizer
+    return normalizer
+
+def get_pipeline_pool() -> PipelinePool:
+    """
+    Return the pool holding the pipelines of the module-level functions;
+    its `stats()` counts hits, misses, loads and evictions.
+    """
+    return _pool
+
+def configure_pipeline_pool(max_pipelines: int = 4, max_bytes: Optional[int] = None) -> None:
+    """
+    Limit how many pipelines the module-level functions keep loaded and,
+    optionally, their estimated memory; the least recently used ones are
+    evicted past either limit.
+    """
+    _pool.resize(max_pipelines, max_bytes)
+
+def configure(
+    model: Optional[str] = None,
+    disable: Iterable[str] = (),
+    selective_ner: bool = False,
+    fast_path: bool = False,
+    cache: Union[ResultCache, str, None] = None,
+    engine: str = "model",
+    language: str = "en",
+) -> None:
+    """
+    Choose the model (name or path), disabled components and NER mode used by
+    `analyze_text`. With `fast_path`, only the sentences holding numbers go
+    through the statistical components; faster, but the model then tags
+    them without the surrounding sentences, so a year or possessive may be
+    decided differently than over the whole text. With `cache` (a `ResultCache` or a
+    file path), results persist across runs and processes. With
+    `selective_ner`, the recognizer sees each sentence holding a year
+    candidate on its own and sentences come from the sentence recognizer
+    instead of the parser, so with some models a year may be found or missed
+    where the full pipeline decides otherwise. `engine="rules"`
+    replaces the model by heuristics (see `Normalizer`). `language` picks
+    the default model when `model` is not given. The default normalizer is
+    replaced and its pipeline loaded lazily on next use; pipelines already
+    loaded stay in the pool until evicted.
+    """
+    global _default
+    with _default_lock:
+        _default = Normalizer(
+            model, disable, selective_ner, fast_path, cache=cache, engine=engine, language=language, pool=_pool
+        )
+        _other_normalizers.clear()
+
+def get_config() -> dict:
+    """
+    Return the settings last passed to `configure`, as keyword arguments.
+    """
+    return _default.config
+
+def get_nlp():
+    """
+    Return the pipeline of the default normalizer, loading it on first use.
+    """
+    return _default.nlp
+
+def warmup(model: Optional[str] = None, disable: Optional[Iterable[str]] = None) -> None:
+    """
+    Load the pipeline, the unit table and index and the number-word tables
+    ahead of the first call, so that serving processes can pay the
+    start-up cost when it suits them.
+    """
+    if model is not None or disable is not None:
+        config = get_config()
+        configure(
+            model or config["model"],
+            config["disable"] if disable is None else disable,
+            config["selective_ner"],
+            config["fast_path"],
+            config["cache"],
+            config["engine"],
+            config["language"],
+        )
+    _default.warmup()
 
 def preprocess_text(text: str) -> str:
     """
@@ -12,209 +484,415 @@ def preprocess_text(text: str) -> str:
     """
     return process_time_patterns_ahead_of_tokenization(text)
 
-def analyze_text(text: str) -> str:
+def analyze_text(text: str, engine: Optional[str] = None, language: Optional[str] = None) -> str:
     """
     Main function to parse the text with SpaCy, interpret tokens (numbers, dates,
-    currencies, units, etc.), and output a 'spoken' transformation.
+    currencies, units, etc.), and output a 'spoken' transformation. `engine`
+    ("model" or "rules") and `language` (e.g. "de", with its default model)
+    override the configured ones for this call.
     """
-    doc = nlp(preprocess_text(text))
-    transformed_tokens = []
-    i = 0
+    return get_default_normalizer(engine, language).analyze_text(text)
 
-    while i < len(doc):
-        token = doc[i]
-        prev_token = doc[i - 1] if i - 1 >= 0 else None
-        prev_prev_token = doc[i - 2] if i - 2 >= 0 else None
-        next_token = doc[i + 1] if i + 1 < len(doc) else None
-        next_next_token = doc[i + 2] if i + 2 < len(doc) else None
+def analyze_texts(
+    texts: Iterable[str], batch_size: int = 256, engine: Optional[str] = None, language: Optional[str] = None
+) -> Iterator[str]:
+    """
+    Batch version of `analyze_text`: stream texts through `nlp.pipe` and yield
+    their transformations in input order.
+    """
+    return get_default_normalizer(engine, language).analyze_texts(texts, batch_size)
 
-        if token.is_space:
-            transformed_tokens.append(token.text)
-            i += 1
-            continue
+def analyze_edits(
+    text: str, alignment: bool = False, engine: Optional[str] = None, language: Optional[str] = None
+) -> Normalization:
+    """
+    Offset-preserving version of `analyze_text`; see `Normalizer.analyze_edits`.
+    """
+    return get_default_normalizer(engine, language).analyze_edits(text, alignment)
 
-        # Handle possessive "'s"
-        if token.text == "'s" and prev_token and prev_token.tag_ in ['PRP', 'NNP', 'PRON']:
-            # Append "'s" directly to the previous token text
-            transformed_text = transformed_tokens.pop()
-            transformed_tokens.append(f"{transformed_text}'s")
-            i += 1
-            continue
+def analyze_stream(
+    source: Source, chunk_size: int = 100_000, engine: Optional[str] = None, language: Optional[str] = None
+) -> Iterator[str]:
+    """
+    Stream a long document through `analyze_text` in bounded chunks; see
+    `Normalizer.analyze_stream`.
+    """
+    return get_default_normalizer(engine, language).analyze_stream(source, chunk_size)
 
-        if token.is_punct:
-            if token.text in c.OPERATOR_MAP:
-                # Check if slash is part of a quantity expression
-                if operator_is_part_of_quantity(token, prev_token, prev_prev_token, next_token):
-                    transformed_tokens.pop()
-                    converted = convert_operator_part_of_quantity(prev_token, prev_prev_token, next_token)
-                    transformed_tokens.append(converted)
-                    i += 2
-                    continue
-                else:
-                    transformed_tokens.append(c.OPERATOR_MAP[token.text])
+# Set by `mathspell.instrumentation` while it records; None costs nothing.
+_recorder = None
+
+def transform_doc(doc) -> str:
+    """
+    Interpret the tokens of a parsed (preprocessed) text and reassemble the
+    'spoken' transformation.
+    """
+    joiner = TokenJoiner()
+    return joiner.feed(transform_tokens(doc)) + joiner.close()
+
+def transform_tokens(doc, groups: Optional[List[List[int]]] = None) -> List[str]:
+    """
+    Interpret the tokens of a parsed (preprocessed) text, returning the spoken
+    pieces in order. Token attributes are read once for the whole doc, and
+    only the positions some rule can apply to go through `transform_token`;
+    runs of other tokens are copied as they are. If `groups` is given, it
+    receives [first token, end token, first piece, end piece] for each run of
+    tokens that rules turned into pieces. Numbers are spelled in the language
+    of the pipeline that parsed the doc. In languages other than English,
+    copied tokens not separated by whitespace stay one piece, so that
+    elisions ("l'argent") come out as written.
+    """
+    if doc.lang_ != current_language():
+        with use_language(doc.lang_):
+            return _transform_tokens(doc, groups)
+    return _transform_tokens(doc, groups)
+
+def _transform_tokens(doc, groups: Optional[List[List[int]]]) -> List[str]:
+    transformed_tokens = [] if groups is None else _TrackedPieces()
+    rules = _recorder.rule_counts() if _recorder is not None else None
+    strings = doc.vocab.strings
+    attributes = doc.to_array(["ORTH", "LIKE_NUM"]).tolist()
+    orths = [orth for orth, _ in attributes]
+    spaces = doc.to_array("SPACY").tolist() if foreign_language() is not None else None
+
+    def copy(start: int, end: int) -> None:
+        if spaces is None:
+            transformed_tokens.extend([strings[orth] for orth in orths[start:end]])
+            return
+        for j in range(start, end):
+            text = strings[orths[j]]
+            if j > start and not spaces[j - 1] and not text.isspace() and not transformed_tokens[-1].isspace():
+                transformed_tokens[-1] += text
             else:
-                transformed_tokens.append(token.text)
-            i += 1
-            continue
+                transformed_tokens.append(text)
 
-        if token_has_exponential_notation(token):
-            transformed_tokens.append(convert_exponential_notation_string(token.text))
-            i += 1
-            # If the next token is a unit, convert that as well
-            if next_token and tokens_are_a_quantity(f"1 {next_token.text}"):
-                units = convert_tokens_to_quantity(f"1 {next_token.text}", magnitude_is_exp=True)
-                transformed_tokens.append(units)
-                i += 1
+    i = 0
+    for position in candidate_positions(attributes, strings):
+        if position < i:
             continue
-
-        if token.like_num and next_token and token_is_ordinal(token.text, next_token.text):
-            transformed_tokens.append(convert_ordinal_string(token.text, next_token.text))
-            i += 2
+        copy(i, position)
+        if groups is None:
+            i, rule = transform_token(doc, position, transformed_tokens)
+            if rules is not None:
+                rules[rule] += 1
             continue
 
-        if token_is_a_quantity(token.text):
-            transformed_tokens.append(convert_token_to_quantity(token.text))
-            i += 1
-            continue
+        pops = transformed_tokens.pops
+        first_token, first_piece = position, len(transformed_tokens)
+        i, rule = transform_token(doc, position, transformed_tokens)
+        if rules is not None:
+            rules[rule] += 1
+        if transformed_tokens.pops > pops:
+            # The rule rewrote the previous piece, e.g. "$" or "John" before "'s".
+            if groups and groups[-1][3] == first_piece:
+                first_token, _, first_piece, _ = groups.pop()
+            else:
+                first_token, first_piece = position - 1, first_piece - 1
+        groups.append([first_token, i, first_piece, len(transformed_tokens)])
+    copy(i, len(orths))
+    return transformed_tokens
 
-        if token.like_num and next_token and tokens_are_a_quantity(f"{token.text} {next_token.text}"):
-            combined = f"{token.text} {next_token.text}"
-            transformed_tokens.append(convert_tokens_to_quantity(combined))
-            i += 2
-            continue
+class _TrackedPieces(list):
+    """
+    List of transformed tokens that counts how often a rule took back the last piece.
+    """
+    pops = 0
 
-        if token_looks_like_fraction(token, next_token, next_next_token):
-            try:
-                numerator = float(token.text.replace(',', ''))
-                denominator = float(next_next_token.text.replace(',', ''))
-                # Convert to words (e.g., "three over four")
-                numerator_word = (
-                    convert_number_to_words(int(numerator)) if numerator.is_integer() 
-                    else convert_number_to_words(numerator)
-                )
-                denominator_word = (
-                    convert_number_to_words(int(denominator)) if denominator.is_integer() 
-                    else convert_number_to_words(denominator)
-                )
-                fraction = f"{numerator_word} over {denominator_word}"
-                transformed_tokens.append(fraction)
-                i += 3  # skip the three tokens
-                continue
-            except ValueError:
-                pass
-
-        if token.like_num:
-            try:
-                numeric_val = float(token.text.replace(',', ''))
-            except ValueError:
-                # Handle malformed numeric strings with multiple dots
-                if token.text.count('.') > 1:
-                    parts = token.text.split('.')
-                    # e.g. "192.168.0.1" -> "one ninety-two point one sixty-eight point zero point one" (?)
-                    transformed_text = " point ".join(map(lambda x: convert_number_to_words(int(x)), parts))
-                    transformed_tokens.append(transformed_text)
-                else:
-                    transformed_tokens.append(token.text)
-                i += 1
-                continue
+    def pop(self, *args):
+        self.pops += 1
+        return super().pop(*args)
 
-            if next_token and next_token.text == "%":
-                converted = handle_percentage(numeric_val)
-                transformed_tokens.append(converted)
-                i += 2
-                continue
-
-            # Handle year context (e.g., "2023" -> "twenty twenty-three")
-            if looks_like_year_context(token) and 1000 <= numeric_val <= 2100:
-                # Avoid conflict with tokens like "ID" after a year
-                if not (next_token and next_token.text.lower() in {"points", "point", "id", "ids"}):
-                    transformed_tokens.append(convert_number_to_words(numeric_val, to_year=True))
-                    i += 1
-                    continue
+def transform_edits(doc) -> List[Edit]:
+    """
+    Return the changes `transform_doc` makes as edits of the doc's text:
+    every run of tokens a rule rewrote is replaced by its spoken form, and
+    everything else, whitespace included, is kept.
+    """
+    groups = []
+    pieces = transform_tokens(doc, groups)
+    text = doc.text
+    edits = []
+    for first_token, end_token, first_piece, end_piece in groups:
+        start = doc[first_token].idx
+        last = doc[end_token - 1]
+        end = last.idx + len(last.text)
+        joiner = TokenJoiner()
+        replacement = joiner.feed(pieces[first_piece:end_piece]) + joiner.close()
+        if replacement != text[start:end]:
+            edits.append(Edit(start, end, replacement))
+    return space_edits(text, edits)
+
+# Whether any rule can apply to a token text, by orth id. Only `like_num`,
+# the characters of the text and a few exact texts decide it: tokens without
+# a digit, that are not number-like words, operators, currency symbols or the
+# possessive "'s", always come out unchanged.
+_CANDIDATE_ORTHS: Dict[int, bool] = {}
+_CANDIDATE_ORTHS_LIMIT = 1_000_000
+_DIGIT = re.compile(r"\d")
+
+def text_is_candidate(text: str) -> bool:
+    return (
+        text == "'s"
+        or text in c.OPERATOR_MAP
+        or text in c.CURRENCY_MAP
+        or _DIGIT.search(text) is not None
+    )
 
-            # Handle currency
-            if prev_token and token_is_currency(prev_token.text):
+def candidate_positions(attributes: List[List[int]], strings) -> List[int]:
+    """
+    Return the positions of the tokens, given as (ORTH, LIKE_NUM) rows, that
+    `transform_token` has to look at.
+    """
+    flags = _CANDIDATE_ORTHS
+    if len(flags) > _CANDIDATE_ORTHS_LIMIT:
+        flags.clear()
+    positions = []
+    for i, (orth, like_num) in enumerate(attributes):
+        flag = flags.get(orth)
+        if flag is None:
+            flag = flags[orth] = text_is_candidate(strings[orth])
+        if flag or like_num:
+            positions.append(i)
+    return positions
+
+def transform_token(doc, i: int, transformed_tokens: List[str]) -> Tuple[int, str]:
+    """
+    Apply the first matching rule to the token at position `i`, appending its
+    spoken form to `transformed_tokens` (and possibly rewriting the last
+    piece), and return the position of the next token to look at and the
+    name of the rule.
+    """
+    token = doc[i]
+    prev_token = doc[i - 1] if i - 1 >= 0 else None
+    prev_prev_token = doc[i - 2] if i - 2 >= 0 else None
+    next_token = doc[i + 1] if i + 1 < len(doc) else None
+    next_next_token = doc[i + 2] if i + 2 < len(doc) else None
+
+    if token.is_space:
+        transformed_tokens.append(token.text)
+        return i + 1, "space"
+
+    # Handle possessive "'s"
+    if token.text == "'s" and prev_token and prev_token.tag_ in ['PRP', 'NNP', 'PRON']:
+        # Append "'s" directly to the previous token text
+        transformed_text = transformed_tokens.pop()
+        transformed_tokens.append(f"{transformed_text}'s")
+        return i + 1, "possessive"
+
+    if token_is_compound_number_hyphen(token, prev_token, next_token):
+        transformed_tokens.append(f"{transformed_tokens.pop()}-{next_token.text}")
+        return i + 2, "compound_number"
+
+    if token.is_punct:
+        if token.text in c.OPERATOR_MAP:
+            # Check if slash is part of a quantity expression
+            converted = operator_quantity_to_words(token, prev_token, prev_prev_token, next_token)
+            if converted is not None:
                 transformed_tokens.pop()
+                transformed_tokens.append(converted)
+                return i + 2, "unit_ratio"
+            else:
+                transformed_tokens.append(current_table().operators[token.text])
+                return i + 1, "operator"
+        else:
+            transformed_tokens.append(token.text)
+        return i + 1, "punctuation"
 
-                # If next token is a scale (million, etc.)
-                if next_token and is_illion_scale(next_token):
-                    scale_word = next_token.text.lower()
-                    converted = interpret_large_scale(numeric_val, scale_word)
+    if token_has_exponential_notation(token):
+        transformed_tokens.append(convert_exponential_notation_string(token.text))
+        i += 1
+        # If the next token is a unit, convert that as well
+        quantity = measurable_quantity(f"1 {next_token.text}") if next_token else None
+        if quantity is not None:
+            transformed_tokens.append(quantity_to_words(quantity, magnitude_is_exp=True))
+            i += 1
+        return i, "exponential"
 
-                    if next_next_token:
-                        if next_next_token.lemma_.lower() in c.ALTERNATIVE_CURRENCIES:
-                            converted += f" {next_next_token.text}"
-                            i += 3
-                        else:
-                            currency_name = c.CURRENCY_MAP[prev_token.text]
-                            converted += f" {currency_name}s"
-                            i += 2
-                    else:
-                        i += 2
+    if token.like_num and next_token and token_is_ordinal(token.text, next_token.text):
+        transformed_tokens.append(convert_ordinal_string(token.text, next_token.text))
+        return i + 2, "ordinal"
 
-                    transformed_tokens.append(converted)
-                    continue
+    quantity = measurable_quantity(token.text)
+    if quantity is not None:
+        transformed_tokens.append(quantity_to_words(quantity))
+        return i + 1, "quantity"
 
-                else:
-                    currency_name = c.CURRENCY_MAP.get(prev_token.text, 'dollar')
-                    minor_currency_name = c.MINOR_CURRENCY_MAP.get(currency_name, 'cent')
-                    converted = interpret_currency(numeric_val, currency_name, minor_currency_name)
-                    transformed_tokens.append(converted)
-                    i += 1
-                    continue
+    quantity = measurable_quantity(f"{token.text} {next_token.text}") if token.like_num and next_token else None
+    if quantity is not None:
+        transformed_tokens.append(quantity_to_words(quantity))
+        return i + 2, "quantity"
+
+    if token_looks_like_fraction(token, next_token, next_next_token):
+        try:
+            numerator = number_value(token.text)
+            denominator = number_value(next_next_token.text)
+            # Convert to words (e.g., "three over four")
+            numerator_word = (
+                convert_number_to_words(int(numerator)) if numerator.is_integer() 
+                else convert_number_to_words(numerator)
+            )
+            denominator_word = (
+                convert_number_to_words(int(denominator)) if denominator.is_integer() 
+                else convert_number_to_words(denominator)
+            )
+            fraction = f"{numerator_word} {current_table().over} {denominator_word}"
+            transformed_tokens.append(fraction)
+            i += 3  # skip the three tokens
+            return i, "fraction"
+        except ValueError:
+            pass
+
+    if token.like_num:
+        try:
+            numeric_val = number_value(token.text)
+        except ValueError:
+            # Handle malformed numeric strings with multiple dots
+            if token.text.count('.') > 1:
+                parts = token.text.split('.')
+                # e.g. "192.168.0.1" -> "one ninety-two point one sixty-eight point zero point one" (?)
+                transformed_text = " point ".join(map(lambda x: convert_number_to_words(int(x)), parts))
+                transformed_tokens.append(transformed_text)
+            else:
+                transformed_tokens.append(token.text)
+            return i + 1, "malformed_number"
 
+        if next_token and next_token.text == "%":
+            converted = handle_percentage(numeric_val)
+            transformed_tokens.append(converted)
+            return i + 2, "percentage"
+
+        # Handle year context (e.g., "2023" -> "twenty twenty-three")
+        if looks_like_year_context(token) and 1000 <= numeric_val <= 2100:
+            # Avoid conflict with tokens like "ID" after a year
+            if not (next_token and next_token.text.lower() in {"points", "point", "id", "ids"}):
+                transformed_tokens.append(convert_number_to_words(numeric_val, to_year=True))
+                return i + 1, "year"
+
+        # Handle currency
+        if prev_token and token_is_currency(prev_token.text):
+            transformed_tokens.pop()
+
+            # If next token is a scale (million, etc.)
             if next_token and is_illion_scale(next_token):
-                scale_word = next_token.text.lower()
+                scale_word = next_token.text if foreign_language() else next_token.text.lower()
                 converted = interpret_large_scale(numeric_val, scale_word)
+
                 if next_next_token:
                     if next_next_token.lemma_.lower() in c.ALTERNATIVE_CURRENCIES:
                         converted += f" {next_next_token.text}"
                         i += 3
                     else:
+                        currency_name = c.CURRENCY_MAP[prev_token.text]
+                        language = foreign_language()
+                        if language is not None:
+                            converted += f" {currency_words(language, currency_name, 2)}"
+                        else:
+                            converted += f" {currency_name}s"
                         i += 2
                 else:
                     i += 2
 
                 transformed_tokens.append(converted)
-                continue
+                return i, "currency_scale"
+
+            else:
+                currency_name = c.CURRENCY_MAP.get(prev_token.text, 'dollar')
+                minor_currency_name = c.MINOR_CURRENCY_MAP.get(currency_name, 'cent')
+                converted = interpret_currency(numeric_val, currency_name, minor_currency_name)
+                transformed_tokens.append(converted)
+                return i + 1, "currency"
+
+        if next_token and is_illion_scale(next_token):
+            scale_word = next_token.text if foreign_language() else next_token.text.lower()
+            converted = interpret_large_scale(numeric_val, scale_word)
+            if next_next_token:
+                if next_next_token.lemma_.lower() in c.ALTERNATIVE_CURRENCIES:
+                    converted += f" {next_next_token.text}"
+                    i += 3
+                else:
+                    i += 2
+            else:
+                i += 2
 
-            converted = convert_number_to_words(numeric_val)
             transformed_tokens.append(converted)
-            i += 1
-            continue
+            return i, "scale"
 
-        if token.text in c.OPERATOR_MAP:
-            operator_word = c.OPERATOR_MAP[token.text]
-            transformed_tokens.append(operator_word)
-            i += 1
-            continue
+        converted = convert_number_to_words(numeric_val)
+        transformed_tokens.append(converted)
+        return i + 1, "number"
 
-        if token.text in c.CURRENCY_MAP:
-            currency_name = c.CURRENCY_MAP[token.text]
-            transformed_tokens.append(currency_name)
-            i += 1
-            continue
+    if token.text in c.OPERATOR_MAP:
+        operator_word = current_table().operators[token.text]
+        transformed_tokens.append(operator_word)
+        return i + 1, "operator"
 
-        transformed_tokens.append(token.text)
-        i += 1
+    if token.text in c.CURRENCY_MAP:
+        currency_name = c.CURRENCY_MAP[token.text]
+        language = foreign_language()
+        if language is not None:
+            # Many languages put the symbol after the amount ('5 €').
+            count = 1
+            if prev_token is not None and prev_token.like_num:
+                try:
+                    count = 1 if number_value(prev_token.text) == 1 else 2
+                except ValueError:
+                    pass
+            currency_name = currency_words(language, currency_name, count)
+        transformed_tokens.append(currency_name)
+        return i + 1, "currency_symbol"
 
-    final_output = []
-    try:
-        for tok in transformed_tokens:
-            if re.fullmatch(r"[.,!?;:]+", tok):
-                if final_output:
-                    final_output[-1] = final_output[-1].rstrip() + tok
-                else:
-                    final_output.append(tok)
-            else:
-                if final_output and re.search(r"[.,!?;:]$", final_output[-1].rstrip()):
-                    final_output.append(" " + tok)
-                else:
-                    if final_output and not final_output[-1].isspace():
-                        final_output.append(" " + tok)
-                    else:
-                        final_output.append(tok)
-    except TypeError as e:
-        raise TypeError(f"Error with token '{tok}'\n {e}")
+    transformed_tokens.append(token.text)
+    return i + 1, "unchanged"
+
+_PUNCT_TOKEN = re.compile(r"[.,!?;:]+")
+_ENDS_WITH_PUNCT = re.compile(r"[.,!?;:]$")
+
+class TokenJoiner:
+    """
+    Join transformed tokens into the output text incrementally: punctuation
+    sticks to the preceding piece, other pieces are separated by a space. Text
+    is released as soon as no later token can change it, so that joining a
+    document token list by token list gives the same output as joining it at
+    once, with the leading and trailing whitespace stripped unless `strip` is
+    false.
+    """
+    def __init__(self, strip: bool = True):
+        self._strip = strip
+        self._last = None
+        self._held = ""
+        self._started = not strip
+
+    def feed(self, tokens: Iterable[str]) -> str:
+        ready = []
+        try:
+            for tok in tokens:
+                if _PUNCT_TOKEN.fullmatch(tok):
+                    self._last = tok if self._last is None else self._last.rstrip() + tok
+                    continue
+                if self._last is not None:
+                    ready.append(self._last)
+                    if _ENDS_WITH_PUNCT.search(self._last.rstrip()) or not self._last.isspace():
+                        tok = " " + tok
+                self._last = tok
+        except TypeError as e:
+            raise TypeError(f"Error with token '{tok}'\n {e}")
+        return self._release("".join(ready))
+
+    def close(self) -> str:
+        last, self._last = self._last, None
+        if not self._strip:
+            text, self._held = self._held + (last or ""), ""
+            return text
+        text = self._release(last or "")
+        self._held = ""
+        return text
 
-    return "".join(final_output).strip()
+    def _release(self, text: str) -> str:
+        # Trailing whitespace is held back until more text follows it.
+        text = self._held + text
+        if not self._started:
+            text = text.lstrip()
+        body = text.rstrip()
+        self._held = text[len(body):]
+        self._started = self._started or bool(body)
+        return body
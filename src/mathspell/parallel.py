@@ -0,0 +1,96 @@
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+from mathspell.main import analyze_texts, configure, get_config, warmup
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+class ParallelStats:
+    """
+    Per-worker counters filled in by `analyze_parallel`, keyed by process id.
+    """
+    def __init__(self):
+        self.workers: Dict[int, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, pid: int, texts: int, seconds: float) -> None:
+        with self._lock:
+            worker = self.workers.setdefault(pid, {"chunks": 0, "texts": 0, "seconds": 0.0})
+            worker["chunks"] += 1
+            worker["texts"] += texts
+            worker["seconds"] += seconds
+
+    def throughput(self) -> Dict[int, float]:
+        """
+        Texts per second of busy time for each worker.
+        """
+        with self._lock:
+            return {
+                pid: worker["texts"] / worker["seconds"] if worker["seconds"] else 0.0
+                for pid, worker in self.workers.items()
+            }
+
+def _init_worker(config: dict) -> None:
+    # Forked workers inherit the parent's loaded pipeline; others load their own.
+    if get_config() != config:
+        configure(**config)
+    warmup()
+
+def imap_ordered(function: Callable[[T], R], tasks: Iterable[T], workers: int, max_pending: Optional[int] = None) -> Iterator[R]:
+    """
+    Apply `function` to each task in a pool of `workers` processes, yielding
+    results in task order. Workers use the settings passed to `configure` and
+    load the pipeline once; with the fork start method it is loaded here first
+    and shared copy-on-write. At most `max_pending` tasks (two per worker by
+    default) are in flight, so slow consumers hold back the input.
+    """
+    config = get_config()
+    context = multiprocessing.get_context()
+    if context.get_start_method() == "fork":
+        warmup()
+    max_pending = max_pending or 2 * workers
+
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker, initargs=(config,)) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(function, task))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def _analyze_chunk(task: Tuple[List[str], int]) -> Tuple[List[str], int, float]:
+    texts, batch_size = task
+    started = time.perf_counter()
+    results = list(analyze_texts(texts, batch_size))
+    return results, os.getpid(), time.perf_counter() - started
+
+def analyze_parallel(
+    texts: Iterable[str],
+    workers: Optional[int] = None,
+    chunksize: int = 256,
+    batch_size: int = 256,
+    stats: Optional[ParallelStats] = None,
+) -> Iterator[str]:
+    """
+    Multi-process version of `analyze_texts`: send chunks of `chunksize` texts
+    to `workers` processes (one per core by default) and yield the
+    transformations in input order. Pass a `ParallelStats` to collect
+    per-worker throughput.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be positive")
+    workers = workers or os.cpu_count() or 1
+    iterator = iter(texts)
+    chunks = iter(lambda: (list(islice(iterator, chunksize)), batch_size), ([], batch_size))
+
+    for results, pid, seconds in imap_ordered(_analyze_chunk, chunks, workers):
+        if stats is not None:
+            stats.record(pid, len(results), seconds)
+        yield from results
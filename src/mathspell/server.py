@@ -0,0 +1,178 @@
+import argparse
+import asyncio
+import json
+from typing import Optional, Sequence, Tuple
+from mathspell.aio import MicroBatcher
+from mathspell.helpers.languages import LANGUAGES
+from mathspell.main import configure, configure_pipeline_pool, get_pipeline_pool, warmup
+
+MAX_BODY_SIZE = 1024 * 1024
+READ_TIMEOUT = 30.0
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+class NormalizationServer:
+    """
+    Minimal HTTP/1.1 service over a `MicroBatcher`:
+
+    - ``POST /analyze`` with ``{"text": ...}`` or ``{"texts": [...]}``, and
+      optionally ``"language"``, returns the same keys with the transformations;
+    - ``GET /metrics`` returns the batcher's counters and latency percentiles,
+      and the pipeline pool's under ``"pipelines"``;
+    - ``GET /health`` returns ``{"status": "ok"}``.
+
+    Connections are kept alive between requests unless the client asks
+    otherwise, and closed when a request line, its headers or its body take
+    longer than `read_timeout` seconds to arrive.
+    """
+    def __init__(
+        self,
+        batcher: Optional[MicroBatcher] = None,
+        max_body_size: int = MAX_BODY_SIZE,
+        read_timeout: Optional[float] = READ_TIMEOUT,
+    ):
+        self.batcher = batcher or MicroBatcher()
+        self.max_body_size = max_body_size
+        self.read_timeout = read_timeout
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def read_headers(self, reader: asyncio.StreamReader) -> dict:
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if not line.strip():
+                return headers
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        timeout = self.read_timeout
+        try:
+            while True:
+                request_line = await asyncio.wait_for(reader.readline(), timeout)
+                if not request_line.strip():
+                    break
+                headers = await asyncio.wait_for(self.read_headers(reader), timeout)
+
+                parts = request_line.decode("latin-1").split()
+                length = headers.get("content-length", "0") or "0"
+                if len(parts) != 3:
+                    status, payload, keep_alive = 400, {"error": "malformed request line"}, False
+                elif not (length.isascii() and length.isdigit()):
+                    status, payload, keep_alive = 400, {"error": "invalid Content-Length"}, False
+                elif int(length) > self.max_body_size:
+                    status, payload, keep_alive = 413, {"error": "request body too large"}, False
+                else:
+                    method, path, version = parts
+                    length = int(length)
+                    body = await asyncio.wait_for(reader.readexactly(length), timeout) if length else b""
+                    status, payload = await self.dispatch(method, path, body)
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, dict]:
+        path = path.split("?", 1)[0]
+        if path == "/health":
+            return (200, {"status": "ok"}) if method == "GET" else (405, {"error": "use GET"})
+        if path == "/metrics":
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            return 200, {**self.batcher.metrics(), "pipelines": get_pipeline_pool().stats()}
+        if path != "/analyze":
+            return 404, {"error": f"no route for {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+
+        try:
+            request = json.loads(body)
+        except ValueError:
+            return 400, {"error": "body is not valid JSON"}
+        if isinstance(request, dict) and isinstance(request.get("text"), str):
+            texts, key = [request["text"]], "text"
+        elif (
+            isinstance(request, dict)
+            and isinstance(request.get("texts"), list)
+            and all(isinstance(text, str) for text in request["texts"])
+        ):
+            texts, key = request["texts"], "texts"
+        else:
+            return 400, {"error": 'expected {"text": str} or {"texts": [str, ...]}'}
+        language = request.get("language")
+        if language is not None and (not isinstance(language, str) or language not in LANGUAGES):
+            return 400, {"error": f"unsupported language {language!r}, expected one of: {', '.join(LANGUAGES)}"}
+
+        try:
+            results = await asyncio.gather(*(self.batcher.analyze(text, language) for text in texts))
+        except Exception as e:
+            return 500, {"error": str(e)}
+        return 200, {key: results[0] if key == "text" else results}
+
+async def serve(
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    max_batch_size: int = 64,
+    max_wait: float = 0.005,
+    read_timeout: Optional[float] = READ_TIMEOUT,
+) -> None:
+    """
+    Run the HTTP service until cancelled.
+    """
+    server = NormalizationServer(MicroBatcher(max_batch_size, max_wait), read_timeout=read_timeout)
+    async with await server.start(host, port) as listener:
+        await listener.serve_forever()
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="mathspell-server",
+        description="Serve mathspell over HTTP, batching concurrent requests through nlp.pipe.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="port to bind (default: 8080)")
+    parser.add_argument("--max-batch-size", type=int, default=64, help="texts per batch (default: 64)")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0,
+                        help="how long a batch waits for more texts (default: 5)")
+    parser.add_argument("--read-timeout", type=float, default=READ_TIMEOUT,
+                        help=f"seconds to wait for a request before closing the connection (default: {READ_TIMEOUT:g})")
+    parser.add_argument("--model", help="spaCy model name or path (default: the language's model)")
+    parser.add_argument("--disable", default="", help="comma-separated pipeline components to disable")
+    parser.add_argument("--language", choices=list(LANGUAGES), default="en",
+                        help="language of requests that do not give one (default: en)")
+    parser.add_argument("--max-pipelines", type=int, default=4,
+                        help="pipelines of different languages kept loaded (default: 4)")
+    parser.add_argument("--max-pipeline-mb", type=float,
+                        help="estimated memory of the loaded pipelines in MB (default: no limit)")
+    args = parser.parse_args(argv)
+
+    configure(args.model, [name for name in args.disable.split(",") if name], language=args.language)
+    configure_pipeline_pool(
+        args.max_pipelines, None if args.max_pipeline_mb is None else int(args.max_pipeline_mb * 1024 * 1024)
+    )
+    warmup()
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_batch_size, args.max_wait_ms / 1000, args.read_timeout))
+    except KeyboardInterrupt:
+        pass
+    return 0
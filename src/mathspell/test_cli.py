@@ -0,0 +1,38 @@
+import json
+from . import analyze_text
+from .cli import file_shards, main as cli_main
+
+TEXTS = [
+    "I have $5 and €10.",
+    "",
+    "We took the 7th seat.",
+    "Hello, world! This text has no numbers.",
+    "The speed of light is approximately 3.00e8 m/s.",
+] * 4
+
+def test_file_shards_end_on_newlines(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("\n".join(TEXTS) + "\n", encoding="utf-8")
+    shards = list(file_shards(str(path), shard_size=16))
+    data = path.read_bytes()
+    assert shards[0][2] == 0 and shards[-1][3] == len(data)
+    assert all(prev[3] == shard[2] for prev, shard in zip(shards, shards[1:]))
+    assert all(data[end - 1:end] == b"\n" for _, _, _, end in shards)
+
+
+def test_cli_converts_text_lines_in_order(tmp_path, capsys):
+    source, target = tmp_path / "input.txt", tmp_path / "output.txt"
+    source.write_text("\n".join(TEXTS), encoding="utf-8")
+    assert cli_main([str(source), "-o", str(target), "--shard-size", "40"]) == 0
+    assert target.read_text(encoding="utf-8").split("\n")[:-1] == [analyze_text(text) for text in TEXTS]
+    assert f"{len(TEXTS)} records" in capsys.readouterr().err
+
+
+def test_cli_converts_jsonl_field_with_workers(tmp_path):
+    source, target = tmp_path / "input.jsonl", tmp_path / "output.jsonl"
+    records = [{"id": i, "body": text} for i, text in enumerate(TEXTS)] + [{"id": -1}]
+    source.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+    args = [str(source), "-o", str(target), "-f", "jsonl", "--field", "body", "-j", "2", "--shard-size", "64", "-q"]
+    assert cli_main(args) == 0
+    output = [json.loads(line) for line in target.read_text(encoding="utf-8").splitlines()]
+    assert output == [{"id": i, "body": analyze_text(text)} for i, text in enumerate(TEXTS)] + [{"id": -1}]
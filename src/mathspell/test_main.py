@@ -1,5 +1,22 @@
+import io
+import json
+import os
+import pickle
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
 import pytest
-from . import analyze_text
+from num2words import num2words
+from . import IncrementalDocument, Normalizer, instrument, ParallelStats, analyze_edits, analyze_parallel, analyze_stream, analyze_text, analyze_texts, spell_numbers, warmup
+from . import main
+from .helpers import cases, chunking
+from .helpers.cache import LRUCache, ResultCache
+from .helpers.pool import PipelinePool
+from .helpers.edits import Edit, apply_edits
+from .helpers.number_words import NUMBER_WORDS_CACHE, number_to_words
+from .helpers import quantities
+from .helpers.quantities import parse_quantity
+from .helpers.units import get_unit_index
 
 # --------------------- Tests for Currency and Large Numbers ---------------------
 
@@ -122,6 +139,21 @@ def test_ordinal_and_year_combination():
     expected = "This is the first time I earned five million dollars in twenty twenty."
     assert analyze_text(text) == expected
 
+
+def test_time_preprocessing():
+    preprocess = cases.process_time_patterns_ahead_of_tokenization
+    assert preprocess("Meet me on 12/25/2023 at 3:45 PM please.") == "Meet me on 12 25 2023 at three forty-five PM please."
+    assert preprocess("We meet at 9AM and 4:30pm.") == "We meet at nine AM and four thirty PM."
+    assert preprocess("Dates: 1/2/23 and 01/02/2023.") == "Dates: 1 2 23 and 01 02 2023."
+    assert preprocess("It starts at 13:00 PM.") == "It starts at 13:00 PM."
+    text = "Hello, world! This text has no numbers."
+    assert preprocess(text) is text
+
+def test_time_reads_minutes_as_one_number():
+    assert analyze_text("Meet me at 3:45 PM.") == "Meet me at three forty-five PM."
+    assert analyze_text("Leave at 10:21 AM, not 7:59 PM.") == "Leave at ten twenty-one AM, not seven fifty-nine PM."
+    assert analyze_text("It is 45 - 5 and forty - five.") == "It is forty-five minus five and forty minus five."
+
 # --------------------- Tests for Edge Cases ---------------------
 
 def test_negative_numbers():
@@ -177,3 +209,447 @@ def test_text_with_no_numbers():
     text = "Hello, world! This text has no numbers."
     expected = "Hello, world! This text has no numbers."
     assert analyze_text(text) == expected
+
+# --------------------- Tests for Batch Processing ---------------------
+
+def test_analyze_texts_matches_analyze_text():
+    texts = [
+        "I have $5 and €10.",
+        "We took the 7th seat.",
+        "I have $5 and €10.",
+        "",
+        "The speed of light is approximately 3.00e8 m/s.",
+        "Hello, world! This text has no numbers.",
+        "We took the 7th seat.",
+    ]
+    expected = [analyze_text(text) for text in texts]
+    assert list(analyze_texts(texts, batch_size=3)) == expected
+    assert list(analyze_texts(iter(texts))) == expected
+
+def test_analyze_parallel_matches_analyze_text():
+    texts = [
+        "I have $5 and €10.",
+        "We took the 7th seat.",
+        "",
+        "The speed of light is approximately 3.00e8 m/s.",
+        "Hello, world! This text has no numbers.",
+    ] * 3
+    stats = ParallelStats()
+    results = list(analyze_parallel(iter(texts), workers=2, chunksize=2, stats=stats))
+    assert results == [analyze_text(text) for text in texts]
+    assert sum(worker["texts"] for worker in stats.workers.values()) == len(texts)
+    assert sum(worker["chunks"] for worker in stats.workers.values()) == 8
+    assert all(rate > 0 for rate in stats.throughput().values())
+
+def test_analyze_stream_matches_analyze_text():
+    text = (
+        "I earned $5 million dollars in 2020. The ratio was 3/4 of the total.\n\n"
+        "The speed of light is approximately 3.00e8 m/s. She's 5'7\" tall!\n"
+        "Hello, world!  This text has no numbers.\tWe took the 7th seat, twice. "
+    ) * 5
+    expected = analyze_text(text)
+    chunks = list(chunking.iter_chunks(text, chunk_size=40))
+    assert len(chunks) > 10 and "".join(chunks) == text
+    assert "".join(analyze_stream(text, chunk_size=40)) == expected
+    assert "".join(analyze_stream(io.StringIO(text), chunk_size=40)) == expected
+    assert "".join(analyze_stream(text.splitlines(keepends=True), chunk_size=40)) == expected
+
+    # A date and a time on either side of a line break are read together.
+    text = "It closes on 12/25/2023\nat 15:45 sharp. " * 40
+    expected = analyze_text(text)
+    assert "at fifteen forty-five" in expected
+    for chunk_size in (10, 37, 64, 199):
+        assert "".join(analyze_stream(text, chunk_size=chunk_size)) == expected
+    assert list(chunking.read_pieces(["x" * 25], 10)) == ["x" * 10, "x" * 10, "x" * 5]
+
+def test_only_rule_candidates_are_dispatched():
+    doc = main.get_nlp()("I have $5 and ten cats, 3/4 of them. It's John's.")
+    positions = main.candidate_positions(doc.to_array(["ORTH", "LIKE_NUM"]).tolist(), doc.vocab.strings)
+    assert [doc[i].text for i in positions] == ["$", "5", "ten", "3", "/", "4", "'s", "'s"]
+
+# --------------------- Tests for Offset-Preserving Output ---------------------
+
+def test_analyze_edits_keeps_unchanged_text_and_maps_offsets():
+    text = "I have $5  and €10.\n\nMeet me at 3:45 PM, not 5+3."
+    result = analyze_edits(text, alignment=True)
+    assert result.text == "I have five dollars  and ten euros.\n\nMeet me at three forty-five PM, not five plus three."
+    assert result.edits[:3] == [Edit(7, 9, "five dollars"), Edit(15, 18, "ten euros"), Edit(32, 36, "three forty-five")]
+    assert apply_edits(text, result.edits) == result.text
+    assert len(result.alignment) == len(result.text) + 1 and result.alignment[-1] == len(text)
+    for start, end, replacement in result.edits:
+        assert text[start:end] != replacement
+    assert text[result.alignment[result.text.index("euros")]:][:3] == "€10"
+    assert result.alignment[result.text.index("Meet")] == text.index("Meet")
+    assert text[result.alignment[result.text.index("forty-five")]:][:4] == "3:45"
+    assert analyze_edits("Hello, world!") == ("Hello, world!", [], None)
+
+# --------------------- Tests for Pipeline Loading ---------------------
+
+def test_import_does_not_load_pipeline():
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = (
+        "import sys, mathspell; "
+        "assert 'spacy' not in sys.modules and 'unit_parse' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, env={**os.environ, "PYTHONPATH": src_dir})
+
+
+def fixture_texts():
+    """
+    The texts of benchmarks/fixtures.py, or skip when the tests run outside the repository.
+    """
+    import importlib.util
+
+    path = os.path.join(os.path.dirname(__file__), "..", "..", "benchmarks", "fixtures.py")
+    if not os.path.isfile(path):
+        pytest.skip("benchmarks/fixtures.py not found")
+    spec = importlib.util.spec_from_file_location("fixtures", path)
+    fixtures = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(fixtures)
+    return [text for texts in fixtures.FIXTURES.values() for text in texts]
+
+def test_selective_ner_matches_full_pipeline_on_fixtures():
+    full = main.load_pipeline(main.DEFAULT_MODEL)
+    selective = main.load_pipeline(main.DEFAULT_MODEL, selective_ner=True)
+    for text in fixture_texts():
+        preprocessed = main.preprocess_text(text)
+        assert main.transform_doc(selective(preprocessed)) == main.transform_doc(full(preprocessed)), text
+
+def test_selective_ner_matches_full_pipeline():
+    texts = [
+        "I was born in 1995. I have 3 apples.",
+        "The meeting is on 12/25/2025.",
+        "Room 1234 is on floor 3. The year 2100 and 999 and 2101.",
+        "This is the 1st time I earned $5 million dollars in 2020.",
+        "Hello, world! This text has no numbers.",
+    ]
+    full = main.load_pipeline(main.DEFAULT_MODEL)
+    selective = main.load_pipeline(main.DEFAULT_MODEL, selective_ner=True)
+    for text in texts:
+        preprocessed = main.preprocess_text(text)
+        assert main.transform_doc(selective(preprocessed)) == main.transform_doc(full(preprocessed))
+
+
+def test_fast_path_matches_full_pipeline():
+    from .helpers.fast_path import model_windows, parse_selectively
+
+    nlp = main.get_nlp()
+    texts = [
+        "Hello, world! This text has no numbers. It's John's idea.",
+        "The meeting went well. I have $5 and €10. Nothing else happened.",
+        "We took the 7th seat. Then we left.  The speed of light is approximately 3.00e8 m/s.",
+    ]
+    for text in texts:
+        assert main.transform_doc(next(parse_selectively(nlp, [text]))) == main.transform_doc(nlp(text))
+    assert model_windows(nlp.make_doc(texts[0][:39])) == []
+
+
+def test_fast_path_matches_full_pipeline_on_fixtures():
+    nlp = main.get_nlp()
+    full, fast = Normalizer(nlp=nlp), Normalizer(fast_path=True, nlp=nlp)
+    assert not main.get_default_normalizer().fast_path
+    texts = fixture_texts()
+    assert list(fast.analyze_texts(texts)) == list(full.analyze_texts(texts))
+
+
+def test_rules_engine_matches_model_without_loading_it():
+    texts = [
+        "This is the 1st time I earned $5 million dollars in 2020.",
+        "Hello, world! It's John's idea, not Mary's.",
+        "She earned £3.5 million and 2 billion euros. The meeting is on 12/25/2025.",
+        "I was born in 1995 and have 3 apples.",
+    ]
+    rules = Normalizer(engine="rules")
+    assert [rules.analyze_text(text) for text in texts] == [analyze_text(text) for text in texts]
+    assert analyze_text(texts[0], engine="rules") == rules.analyze_text(texts[0])
+    assert rules.nlp.pipe_names == ["mathspell_rules"]
+    assert rules.cache_namespace != main.get_default_normalizer().cache_namespace
+
+
+def test_languages_share_a_bounded_pipeline_pool():
+    pool = PipelinePool(max_pipelines=2)
+    german, french, spanish = (Normalizer(engine="rules", language=lang, pool=pool) for lang in ("de", "fr", "es"))
+    assert german.analyze_text("Er zahlte 5 € und 2,5 % im Jahr 1995.") == (
+        "Er zahlte fünf Euro und zwei Komma fünf Prozent im Jahr neunzehnhundertfünfundneunzig."
+    )
+    assert french.analyze_text("3 + 4 = 7") == "trois plus quatre égal à sept"
+    assert german.nlp is german.nlp
+    assert spanish.analyze_text("Pagó $3 millones.") == "Pagó tres millones dólares."
+    stats = pool.stats()
+    assert (stats["loads"], stats["evictions"], stats["loaded"]) == (3, 1, [["rules", "de"], ["rules", "es"]])
+    assert analyze_text("3 + 4", engine="rules", language="fr") == "trois plus quatre"
+    with pytest.raises(ValueError):
+        Normalizer(language="xx")
+
+
+def test_elisions_keep_their_spacing():
+    assert analyze_text("J'ai l'argent.", engine="rules", language="fr") == "J'ai l'argent."
+    assert analyze_text("Aujourd'hui l'eau coûte 2 €.", engine="rules", language="fr") == (
+        "Aujourd'hui l'eau coûte deux euros."
+    )
+    assert analyze_text("L'anno 1995.", engine="rules", language="it") == "L'anno millenovecentonovantacinque."
+    assert analyze_edits("Dell'anno 2020, ho 3 euro.", engine="rules", language="it").text == (
+        "Dell'anno duemilaventi, ho tre euro."
+    )
+
+
+def test_written_ordinals_of_other_languages_read_as_cardinals():
+    # Unsupported: the mark of the ordinal is kept after the cardinal.
+    assert analyze_text("am 3. Mai 1995", engine="rules", language="de") == "am drei. Mai neunzehnhundertfünfundneunzig"
+    assert analyze_text("el 3er lugar", engine="rules", language="es") == "el tres er lugar"
+
+
+def test_warmup_loads_pipeline_once():
+    warmup()
+    nlp = main.get_nlp()
+    warmup()
+    assert main.get_nlp() is nlp
+
+# --------------------- Tests for Thread Safety ---------------------
+
+def test_normalizers_match_serial_runs_under_threads():
+    texts = [
+        "I have $5 and €10.",
+        "She earned £3.5 million and $2 million.",
+        "We took the 7th seat. The meeting is on 12/25/2025.",
+        "The speed of light is approximately 3.00e8 m/s.",
+        "This is the 1st time I earned $5 million dollars in 2020. It's John's 3/4 share.",
+        "Hello, world! This text has no numbers.",
+        "Meet me at 3:45 PM. I ran 5km today and 45% of 123456789012 people agreed.",
+    ]
+    fast = Normalizer(fast_path=True, nlp=main.get_nlp())
+    expected = [analyze_text(text) for text in texts]
+    assert [fast.analyze_text(text) for text in texts] == expected
+
+    jobs = [(normalizer, text) for _ in range(30) for normalizer in (main.get_default_normalizer(), fast) for text in texts]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda job: job[0].analyze_text(job[1]), jobs))
+    assert results == [expected[i % len(texts)] for i in range(len(jobs))]
+
+# --------------------- Tests for Caches ---------------------
+
+def test_lru_cache_counters_and_eviction():
+    cache = LRUCache(maxsize=2)
+    calls = []
+    compute = lambda key: calls.append(key) or key.upper()
+    assert cache.get_or_compute("a", compute) == "A"
+    assert cache.get_or_compute("a", compute) == "A"
+    cache.get_or_compute("b", compute)
+    cache.get_or_compute("c", compute)
+    assert calls == ["a", "b", "c"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (1, 3, 1, 2)
+    cache.resize(0)
+    assert len(cache) == 0
+
+
+def test_quantity_is_parsed_once_per_string():
+    cases.QUANTITY_CACHE.clear()
+    analyze_text("He weighs 70 kg and 70 kg.")
+    stats = cases.QUANTITY_CACHE.stats()
+    assert stats["misses"] == len(cases.QUANTITY_CACHE)
+    assert stats["hits"] > 0
+
+
+def test_unit_index_rejects_words_that_are_not_units():
+    index = get_unit_index()
+    for string in ["5 km", "3 kilometers", "2 m/s", "1 cmH2O", "10 m2", "70 KG"]:
+        assert index.could_be_quantity(string)
+    for string in ["3 people", "5 times", "2 of", "people", "1,000", "km", "6 *", "1 /", "2 ^", "(3 + 2) * 4"]:
+        assert not index.could_be_quantity(string)
+    for string in ["25°C", "3 µm", "5 Ω"]:
+        assert index.could_be_quantity(string)
+
+    cases.QUANTITY_CACHE.clear()
+    assert analyze_text("The elevator can hold 5 people.") == "The elevator can hold five people."
+    assert len(cases.QUANTITY_CACHE) == 0
+
+
+def test_math_only_text_does_not_load_pint():
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = (
+        "import sys, mathspell; "
+        "[mathspell.analyze_text(t, engine='rules') for t in ('6 * 4', '1/2', '(3 + 2) * 4', '2^3', '5+-3*2/4')]; "
+        "assert 'pint' not in sys.modules and 'unit_parse' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, env={**os.environ, "PYTHONPATH": src_dir})
+
+
+def test_quantity_engine_reads_quantities_like_unit_parse():
+    strings = [
+        "3 km", "5kg", "12.5 mL", "9.8 m/s^2", "60 km/h", "3 kg/m^3", "1 m2", "2 m^-1",
+        "20 kg m/s^2", "3 N/m^2", "12 V", "5MHz", "0 km", "3 μm", "2 hours",
+    ]
+    for string in strings:
+        q, expected = parse_quantity(string), cases.unit_parse_quantity(string)
+        assert q is not None
+        assert (q.magnitude, type(q.magnitude), q.units, bool(q), q.dimensionless) == (
+            expected.magnitude, type(expected.magnitude), dict(expected.units._units), bool(expected), expected.dimensionless
+        )
+    # Offset units, all-capital compounds, cancelling units and unknown words go to unit_parse.
+    for string in ["25 °C", "3 GF/KPH", "3 m/m", "3 apples"]:
+        assert parse_quantity(string) is None
+
+
+def test_unit_table_built_with_other_versions_is_not_used(monkeypatch):
+    table = quantities.UnitTable.load()
+    assert table.version_mismatches() == {}
+    table.versions = {**table.versions, "pint": "0.1"}
+    monkeypatch.setattr(quantities.UnitTable, "load", classmethod(lambda cls: table))
+    monkeypatch.setattr(quantities, "_unit_table", None)
+    with pytest.warns(RuntimeWarning, match="built with 0.1"):
+        assert parse_quantity("3 km") is None
+    assert table.stale
+
+
+def test_spell_numbers_matches_text_path():
+    values = [12, 5.5, 12, 1, 0.25]
+    templates = {
+        "cardinal": ("I have {}.", "I have {}."),
+        "currency": ("It cost ${}.", "It cost {}."),
+        "percent": ("It rose {}%.", "It rose {}."),
+    }
+    for kind, (text, expected) in templates.items():
+        spelled = spell_numbers(values, kind=kind)
+        assert spelled.shape == (5,)
+        for value, words in zip(values, spelled):
+            assert analyze_text(text.format(value)) == expected.format(words)
+    assert spell_numbers([2 ** 60 + 1])[0] == num2words(2 ** 60 + 1)
+    assert list(spell_numbers([[1, 2], [3, 2]], kind="ordinal").ravel()) == ["first", "second", "third", "second"]
+    assert list(spell_numbers([2.5, -1, 1e30, 3.0], kind="ordinal")) == [None, None, None, "third"]
+    assert list(spell_numbers([2021.0, float("nan")], kind="year")) == ["twenty twenty-one", None]
+    assert spell_numbers([5], kind="currency", currency="€")[0] == "five euros"
+    with pytest.raises(ValueError):
+        spell_numbers([1], kind="roman")
+
+
+def test_incremental_document_reanalyzes_changed_sentences_only():
+    # No cut after "$5.": a sentence ending in a number may continue.
+    text = "I have $5. We took the 7th seat.\n\nIt is 25°C today. The 3 boxes weigh 15 kg."
+    document = IncrementalDocument(text)
+    assert document.output == analyze_text(text)
+    assert document.computed == 3
+
+    # A segment is parsed with its neighbours, so they are redone with it.
+    document.edit(8, 9, "6")
+    assert document.output == analyze_text(document.text)
+    assert document.computed == 2 and document.reused == 1
+
+    document.update(document.text + " Call me at 5:30 pm.")
+    assert document.output == analyze_text(document.text)
+    assert document.computed == 3 and document.reused == 1
+
+
+def test_incremental_document_matches_analyze_text_on_multiline_text():
+    text = (
+        "It closes on 12/25/2023\nat 15:45 sharp. John's share is 3/4.\n\n"
+        "She earned $5 million in 2020! Room 1234 is on floor 3.\n"
+        "Hello, world.  We took the 7th seat, twice. It is 25°C today.\n"
+    )
+    for normalizer in (None, Normalizer(engine="rules")):
+        document = IncrementalDocument(text, normalizer=normalizer)
+        analyze = normalizer.analyze_text if normalizer else analyze_text
+        assert document.output == analyze(text)
+        for start, end, replacement in [(13, 15, "11"), (70, 71, "7"), (len(text) - 1, len(text), " Bye.")]:
+            document.edit(start, end, replacement)
+            assert document.output == analyze(document.text)
+
+
+def test_result_cache_persists_results_across_normalizers(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    texts = ["I have $5.", "We took the 7th seat.", "I have $5.", "It is 25°C today."]
+    expected = list(analyze_texts(texts))
+
+    assert list(Normalizer(cache=path).analyze_texts(texts)) == expected
+    normalizer = Normalizer(cache=pickle.loads(pickle.dumps(ResultCache(path))))
+    assert list(normalizer.analyze_texts(texts)) == expected
+    assert normalizer.analyze_text("We took the 7th seat.") == expected[1]
+    assert normalizer._nlp is None
+    stats = normalizer.cache.stats()
+    assert stats["hits"] == 4 and stats["misses"] == 0 and stats["entries"] == 3
+
+    other = Normalizer(selective_ner=True, cache=path)
+    assert other.cache_namespace != normalizer.cache_namespace
+    assert "num2words-" in normalizer.cache_namespace
+    # Tied to the rules themselves, not only to a version a checkout may lack.
+    assert f"-{main.rules_fingerprint()}|" in normalizer.cache_namespace
+    assert Normalizer(model="en_core_web_sm", language="de").cache_namespace != normalizer.cache_namespace
+    other.analyze_text("I have $5.")
+    assert other.cache.stats()["misses"] == 1
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path / "results.sqlite"), max_bytes=1000)
+    for i in range(10):
+        cache.put_many("ns", {f"text {i}": "x" * 100})
+    stats = cache.stats()
+    assert stats["evictions"] > 0 and stats["bytes"] <= 1000
+    assert cache.get_many("ns", ["text 9"]) == {"text 9": "x" * 100}
+    assert cache.get_many("ns", ["text 0"]) == {}
+
+
+def test_result_cache_treats_a_corrupt_database_as_empty(tmp_path):
+    path = tmp_path / "results.sqlite"
+    path.write_bytes(b"not a database" * 100)
+    cache = ResultCache(str(path))
+    assert cache.get_many("ns", ["text"]) == {}
+    cache.put_many("ns", {"text": "x"})
+    cache.clear()
+    stats = cache.stats()
+    assert stats["entries"] == stats["bytes"] == 0 and stats["errors"] == 2
+
+
+def test_instrumentation_counts_rules_and_restores_functions():
+    transform_tokens = main.transform_tokens
+    calls = []
+    with instrument(callback=calls.append) as stats:
+        assert analyze_text("I have $5 and €10.") == "I have five dollars and ten euros."
+        list(analyze_texts(["We took the 7th seat.", "5 + 3"]))
+    snapshot = stats.snapshot()
+
+    assert [call.name for call in calls] == ["analyze_text", "analyze_texts"]
+    assert calls[0].rules == {"currency": 2, "currency_symbol": 2}
+    assert snapshot["calls"] == {"analyze_text": 1, "analyze_texts": 1} and snapshot["texts"] == 3
+    assert snapshot["rules"]["ordinal"] == 1 and snapshot["rules"]["operator"] == 1
+    assert {"preprocess", "parse", "rules", "join"} <= set(snapshot["stages"])
+    assert snapshot["helpers"]["interpret_currency"]["calls"] == 2
+    assert main.transform_tokens is transform_tokens and main._recorder is None
+
+
+def test_bundle_restores_pipeline_and_tables(tmp_path):
+    from .bundle import build_bundle, is_bundle
+
+    path = str(tmp_path / "bundle")
+    meta = build_bundle(path)
+    assert is_bundle(path) and meta["model"] == "en_core_web_sm"
+    with open(os.path.join(path, "tables.json"), encoding="utf-8") as f:
+        tables = json.load(f)
+    assert "m" in tables["units"] and "k" in tables["prefixes"]
+
+    texts = ["I have $5 and €10.", "I ran 5km today.", "2^3", "The meeting is on 12/25/2025.", "We took the 7th seat."]
+    normalizer = Normalizer(model=path)
+    assert [normalizer.analyze_text(text) for text in texts] == [analyze_text(text) for text in texts]
+    assert normalizer.cache_namespace != Normalizer().cache_namespace
+
+    from .bundle import BUNDLE_META, install_tables
+    assert install_tables(path)
+    with open(os.path.join(path, BUNDLE_META), "w", encoding="utf-8") as f:
+        json.dump({**meta, "num2words": "0.0"}, f)
+    assert not install_tables(path)
+
+
+def test_number_words_match_num2words():
+    from num2words import num2words
+
+    for number in [0, 7, 21, 99, 100, 1995, 9999, 10000, 123456789, 0.5, 3.8, 15.0, 1e16]:
+        assert number_to_words(number) == num2words(number)
+    assert number_to_words(5.0) == number_to_words(5) == "five"
+    assert number_to_words(1000, to="ordinal") == num2words(1000, to="ordinal")
+    assert number_to_words(2100, to="year") == num2words(2100, to="year")
+    assert cases.convert_number_to_words(-5.0) == "minus five"
+    assert cases.convert_number_to_words(-0.5) == "minus zero point five"
+
+    NUMBER_WORDS_CACHE.clear()
+    number_to_words(123456789)
+    number_to_words(123456789)
+    assert NUMBER_WORDS_CACHE.stats()["hits"] == 1
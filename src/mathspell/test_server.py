@@ -0,0 +1,91 @@
+import asyncio
+import json
+from . import analyze_text
+from .aio import MicroBatcher, analyze_text_async
+from .server import NormalizationServer
+
+TEXTS = [
+    "I have $5 and €10.",
+    "We took the 7th seat.",
+    "",
+    "The speed of light is approximately 3.00e8 m/s.",
+    "Hello, world! This text has no numbers.",
+] * 4
+
+def test_analyze_text_async():
+    async def run():
+        return await asyncio.gather(*(analyze_text_async(text) for text in TEXTS))
+
+    assert asyncio.run(run()) == [analyze_text(text) for text in TEXTS]
+
+
+def test_micro_batcher_coalesces_concurrent_requests():
+    batcher = MicroBatcher(max_batch_size=8, max_wait=0.05)
+
+    async def run():
+        results = await asyncio.gather(*(batcher.analyze(text) for text in TEXTS))
+        await batcher.close()
+        return results
+
+    assert asyncio.run(run()) == [analyze_text(text) for text in TEXTS]
+    metrics = batcher.metrics()
+    assert metrics["requests"] == len(TEXTS) and metrics["batches"] == 3
+    assert metrics["p99_ms"] >= metrics["p50_ms"] > 0
+
+
+def test_http_service_round_trip():
+    async def request(reader, writer, method, path, payload=None):
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while (line := (await reader.readline()).strip()):
+            name, _, value = line.decode().partition(":")
+            headers[name.lower()] = value.strip()
+        return status, json.loads(await reader.readexactly(int(headers["content-length"])))
+
+    async def run():
+        service = NormalizationServer(MicroBatcher(max_batch_size=16, max_wait=0.01))
+        async with await service.start("127.0.0.1", 0) as listener:
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            responses = [
+                await request(reader, writer, "POST", "/analyze", {"text": TEXTS[0]}),
+                await request(reader, writer, "POST", "/analyze", {"texts": TEXTS}),
+                await request(reader, writer, "POST", "/analyze", {"txt": 1}),
+                await request(reader, writer, "POST", "/analyze", {"text": TEXTS[0], "language": ["de"]}),
+                await request(reader, writer, "POST", "/analyze", {"text": TEXTS[0], "language": "xx"}),
+                await request(reader, writer, "GET", "/metrics"),
+            ]
+            writer.close()
+            await service.batcher.close()
+            return responses
+
+    single, batch, invalid, unhashable, unknown, metrics = asyncio.run(run())
+    assert single == (200, {"text": analyze_text(TEXTS[0])})
+    assert batch == (200, {"texts": [analyze_text(text) for text in TEXTS]})
+    assert invalid[0] == 400
+    assert unhashable[0] == unknown[0] == 400 and "unsupported language" in unhashable[1]["error"]
+    assert metrics[0] == 200 and metrics[1]["requests"] == len(TEXTS) + 1
+
+
+def test_http_service_rejects_bad_length_and_closes_idle_connections():
+    async def run():
+        service = NormalizationServer(MicroBatcher(), read_timeout=0.05)
+        async with await service.start("127.0.0.1", 0) as listener:
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"POST /analyze HTTP/1.1\r\nContent-Length: -1\r\n\r\n")
+            invalid = await asyncio.wait_for(reader.read(), 1)
+            writer.close()
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"POST /analyze HTTP/1.1\r\n")
+            idle = await asyncio.wait_for(reader.read(), 1)
+            writer.close()
+            await service.batcher.close()
+            return invalid, idle
+
+    invalid, idle = asyncio.run(run())
+    assert invalid.startswith(b"HTTP/1.1 400 ") and b"Content-Length" in invalid
+    assert idle == b""